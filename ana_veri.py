@@ -0,0 +1,68 @@
+"""Süreç genelinde paylaşılan ana veri önbelleği (kullanıcılar, operatörler, hata ve iş kodları).
+
+Her liste bir kez okunur ve deponun ana veri damgasıyla (JSON'da dosyanın
+inode/mtime/boyutu, SQLite'ta sürüm sayacı) birlikte saklanır; sonraki
+yeniden çalıştırmalar ve diğer oturumlar yalnızca damgayı kontrol eder.
+Admin paneli değişiklikleri önbelleği yerinde günceller. Dönen nesneler
+oturumlar arasında paylaşıldığından yerinde değiştirilmemelidir.
+"""
+import threading
+
+import depo
+
+_kilit = threading.Lock()
+_onbellek = {}
+
+
+def _sakla(dosya, damga, veri):
+    with _kilit:
+        _onbellek[dosya] = {"damga": damga, "veri": veri, "secenekler": None}
+
+
+def oku(dosya, varsayilan):
+    damga = depo.ana_veri_damgasi(dosya)
+    with _kilit:
+        kayit = _onbellek.get(dosya)
+        if kayit is not None and damga is not None and kayit["damga"] == damga:
+            return kayit["veri"]
+    with depo.ana_veri_kilidi(dosya):
+        veri = depo.ana_veri_oku(dosya, varsayilan)
+        damga = depo.ana_veri_damgasi(dosya)
+    _sakla(dosya, damga, veri)
+    return veri
+
+
+def secenekler(dosya, varsayilan):
+    """Tablo düzenleyicideki seçim kutuları için [""] + liste; liste değişene kadar aynı nesne döner."""
+    veri = oku(dosya, varsayilan)
+    with _kilit:
+        kayit = _onbellek.get(dosya)
+        if kayit is None or kayit["veri"] is not veri:
+            return [""] + list(veri)
+        if kayit["secenekler"] is None:
+            kayit["secenekler"] = [""] + list(veri)
+        return kayit["secenekler"]
+
+
+def yaz(dosya, veri):
+    with depo.ana_veri_kilidi(dosya):
+        depo.ana_veri_yaz(dosya, veri)
+        damga = depo.ana_veri_damgasi(dosya)
+    _sakla(dosya, damga, veri)
+
+
+def guncelle(dosya, varsayilan, degistir):
+    """`depo.ana_veri_guncelle` ile aynı; sonuç diske yazıldıktan sonra önbelleğe de konur."""
+    with depo.ana_veri_kilidi(dosya):
+        veri, degisti = depo.ana_veri_guncelle(dosya, varsayilan, degistir)
+        damga = depo.ana_veri_damgasi(dosya)
+    _sakla(dosya, damga, veri)
+    return veri, degisti
+
+
+def gecersiz_kil(dosya=None):
+    with _kilit:
+        if dosya is None:
+            _onbellek.clear()
+        else:
+            _onbellek.pop(dosya, None)
@@ -0,0 +1,104 @@
+"""Olgu tablosunun sütunlu disk anlık görüntüsü (Arrow IPC), hızlı soğuk başlangıç için.
+
+Sunucu açıldığında ya da önbellek boşaldığında geçmişin tamamını JSON'dan
+ayrıştırıp düzleştirmek yerine, tablonun son hali `raporlar.jsonl.arrow`
+dosyasından belleğe eşlenerek (memory-map) okunur. Dosya sıkıştırmasızdır;
+sayı sütunları diskten kopyalanmadan kullanılır. Kategori sütunları (Vardiya,
+Makine, İş Kodu, Operatör, Kod) sözlük kodlamalı yazılır ve doğrudan
+`category` olarak geri gelir.
+
+Görüntü, yazıldığı andaki depo damgasını ve içerdiği vardiya sayısı ile son
+vardiyanın id'sini taşır. Görüntü depo dosyasına değil bu kayıt kimliğine
+bağlıdır: depoda ilk `kayit` vardiya hâlâ aynıysa görüntü kullanılır, yalnızca
+ekleme yapılmışsa üzerine sadece yeni vardiyalar eklenir (bkz. tablo).
+`pyarrow` kurulu değilse görüntü kullanılmaz ve tablo eskisi gibi depodan kurulur.
+"""
+import json
+import os
+import threading
+
+import depo
+import izleme
+
+SURUM = 3
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+
+def kullanilabilir():
+    return pa is not None
+
+
+def yol(dosya=depo.RAPOR_DOSYA):
+    return dosya + ".arrow"
+
+
+def yaz(df, damga, kayit, son_id, dosya=depo.RAPOR_DOSYA):
+    """Tabloyu geçici dosya + atomik yeniden adlandırma ile yazar.
+
+    `damga` tablonun ait olduğu depo damgası, `kayit` içerdiği vardiya sayısı,
+    `son_id` depo sırasıyla son vardiyanın id'sidir.
+
+    Görüntü yalnızca bir hızlandırmadır: yazılamazsa (disk, izin, Windows'ta
+    eşlenmiş dosya) sessizce vazgeçilir. Yazıldıysa True döner.
+    """
+    if pa is None or damga is None:
+        return False
+    tablo = pa.Table.from_pandas(df, preserve_index=False)
+    tablo = tablo.replace_schema_metadata({"tds": json.dumps({
+        "arka_uc": depo.ARKA_UC, "surum": SURUM,
+        "damga": damga, "kayit": kayit, "son_id": son_id,
+    })})
+    hedef = yol(dosya)
+    gecici = f"{hedef}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with pa.OSFile(gecici, "wb") as f, pa.ipc.new_file(f, tablo.schema) as yazici:
+            yazici.write_table(tablo)
+        os.replace(gecici, hedef)
+    except OSError:
+        try:
+            os.remove(gecici)
+        except OSError:
+            pass
+        return False
+    izleme.say("anlik.yazma")
+    return True
+
+
+def oku(dosya=depo.RAPOR_DOSYA):
+    """{"damga", "kayit", "son_id", "tablo"} ya da görüntü yoksa/okunamıyorsa None.
+
+    Görüntünün depoya göre geçerliliğini (kayıt kimliği, damga) çağıran denetler.
+    """
+    if pa is None:
+        return None
+    try:
+        with pa.memory_map(yol(dosya), "r") as kaynak:
+            tablo = pa.ipc.open_file(kaynak).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    try:
+        bilgi = json.loads(tablo.schema.metadata[b"tds"])
+    except (TypeError, KeyError, ValueError):
+        return None
+    if (bilgi.get("arka_uc"), bilgi.get("surum")) != (depo.ARKA_UC, SURUM):
+        return None
+    izleme.say("anlik.okuma")
+    return {
+        "damga": tuple(bilgi["damga"]) if bilgi.get("damga") is not None else None,
+        "kayit": bilgi.get("kayit", 0),
+        "son_id": bilgi.get("son_id"),
+        # split_blocks: sütunlar tek bir 2B bloğa kopyalanmaz, eşlenmiş tampondan okunur
+        "tablo": tablo.to_pandas(split_blocks=True),
+    }
+
+
+def sil(dosya=depo.RAPOR_DOSYA):
+    try:
+        os.remove(yol(dosya))
+    except FileNotFoundError:
+        pass
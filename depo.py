@@ -0,0 +1,14 @@
+"""Rapor ve ana veri deposu: seçili arka ucu (backend) dışa açar.
+
+`TDS_DEPO=sqlite` ortam değişkeniyle SQLite veritabanı (depo_sqlite), aksi halde
+JSON dosyaları (depo_json) kullanılır. İki arka uç da aynı işlevleri sunar;
+`SQL` doğruysa toplama ve filtre sorguları da veritabanında çalıştırılır.
+"""
+import os
+
+ARKA_UC = os.environ.get("TDS_DEPO", "json").strip().lower()
+
+if ARKA_UC == "sqlite":
+    from depo_sqlite import *  # noqa: F401,F403
+else:
+    from depo_json import *  # noqa: F401,F403
@@ -0,0 +1,690 @@
+"""JSON arka ucu (varsayılan): raporlar JSONL günlüğünde, ana veriler JSON dosyalarında.
+
+Vardiya raporları `raporlar.jsonl` dosyasında yalnızca-ekleme (append-only)
+bir günlük olarak tutulur: her satır bir vardiya kaydıdır
+({id, tarih, vardiya, zaman, satirlar}). Silme işlemi günlüğe bir silme
+işareti ({"sil": id}) ekler; işaretler birikince günlük sıkıştırılır ve
+geçici dosya + fsync + atomik yeniden adlandırma ile baştan yazılır.
+
+Eski vardiyalar (`ARSIV_GUN` günden eski) `arsivle` ile aylık arşiv
+bölümlerine taşınır: `raporlar.jsonl.arsiv/2024-03.jsonl` gibi, her biri aynı
+biçimde bir günlüktür. Sıcak günlük böylece küçük kalır. Bölümler yalnızca
+`arsivle` (ve `kaydet`/`tumunu_sil`) tarafından, her zaman sıcak günlük yeniden
+yazılmadan önce değiştirilir; bu yüzden deponun damgası sıcak günlüğün
+damgasıdır. Arşivdeki bir vardiyanın silinmesi de sıcak günlüğe silme işareti
+olarak yazılır; işaret bir sonraki `arsivle`de bölüme uygulanır. Dizin bütün
+dosyaları kapsar; `getir` yalnızca istenen kayıtların bulunduğu dosyaları,
+`bolumler`/`yukle_aralik` yalnızca tarih aralığıyla örtüşen bölümleri açar.
+
+Gece bakımı için:
+
+    python depo_json.py [--gun 365]
+
+Tüm değişiklikler `kilit()` altında yapılır: aynı süreçteki iş parçacıkları ve
+aynı dosyayı kullanan diğer süreçler (ör. birden çok Streamlit sunucusu) yazma
+sırasında birbirini bekler; okuyucular kilit almaz.
+"""
+import argparse
+import contextlib
+import glob
+import json
+import os
+import threading
+import uuid
+from datetime import date, datetime, timedelta
+
+import izleme
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+__all__ = [
+    "SQL", "RAPOR_DOSYA", "yeni_id", "yukle", "ekle", "sil", "kaydet", "sikistir", "tumunu_sil",
+    "damga", "gunler", "kayit_idleri", "kayit_sayisi", "getir", "ana_veri_oku", "ana_veri_yaz",
+    "ana_veri_guncelle", "ana_veri_damgasi", "ana_veri_kilidi", "kilit", "toplu_ekle",
+    "ARSIV_GUN", "arsivle", "bolumler", "bolum_oku", "yukle_aralik",
+]
+
+# Toplama ve filtre sorguları bu arka uçta yoktur; ozet/sorgu bellekteki tabloyu kullanır
+SQL = False
+RAPOR_DOSYA = "raporlar.jsonl"
+
+_dizin_kilit = threading.Lock()
+_dizinler = {}
+_kilitler_kilit = threading.Lock()
+_kilitler = {}
+
+# Bu kadar ölü satır (silinen kayıt / silme işareti / bozuk satır) birikince sıkıştır
+SIKISTIRMA_ESIGI = 50
+# Bundan eski vardiyalar arşive taşınır
+ARSIV_GUN = int(os.environ.get("TDS_ARSIV_GUN", "365"))
+
+
+def _dizini_senkronla(dosya):
+    # Yeniden adlandırmanın kalıcı olması için dizin girdisini de diske yaz (POSIX)
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(dosya)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _dosyayi_kilitle(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            # LK_LOCK ~10 sn bekleyip vazgeçer; kilit bırakılana kadar tekrar dene
+            continue
+
+
+def _dosya_kilidini_ac(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def kilit(dosya=RAPOR_DOSYA):
+    """`dosya` için özel yazma kilidi (`dosya`.lock üzerinde).
+
+    Aynı iş parçacığında iç içe alınabilir; süreçler arası kilit yalnızca en dıştaki
+    girişte alınır.
+    """
+    with _kilitler_kilit:
+        k = _kilitler.get(dosya)
+        if k is None:
+            k = _kilitler[dosya] = {"rlock": threading.RLock(), "derinlik": 0, "dosya": None}
+    with k["rlock"]:
+        if k["derinlik"] == 0:
+            f = open(dosya + ".lock", "a+b")
+            try:
+                _dosyayi_kilitle(f)
+            except BaseException:
+                f.close()
+                raise
+            k["dosya"] = f
+        k["derinlik"] += 1
+        try:
+            yield
+        finally:
+            k["derinlik"] -= 1
+            if k["derinlik"] == 0:
+                f, k["dosya"] = k["dosya"], None
+                try:
+                    _dosya_kilidini_ac(f)
+                finally:
+                    f.close()
+
+
+def _satir(kayit):
+    return json.dumps(kayit, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _atomik_yaz(dosya, raporlar):
+    izleme.say("depo.yazma")
+    gecici = f"{dosya}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(gecici, "w", encoding="utf-8") as f:
+        for rapor in raporlar:
+            f.write(_satir(rapor))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(gecici, dosya)
+    _dizini_senkronla(dosya)
+
+
+def yeni_id():
+    return uuid.uuid4().hex
+
+
+def _eski_dosya(dosya):
+    # raporlar.jsonl -> raporlar.json
+    return os.path.splitext(dosya)[0] + ".json"
+
+
+def goc_et(dosya=RAPOR_DOSYA):
+    """Eski `raporlar.json` (tek JSON listesi) dosyasını günlüğe bir kez taşır.
+
+    Günlük zaten varsa hiçbir şey yapmaz. Eski dosyaya dokunulmaz (depoda izlenen
+    örnek veri olabilir); taşındığının işareti günlüğün varlığıdır.
+    """
+    eski_dosya = _eski_dosya(dosya)
+    if os.path.exists(dosya) or not os.path.exists(eski_dosya):
+        return False
+    with kilit(dosya):
+        # Başka bir süreç/iş parçacığı kilidi beklerken taşımayı bitirmiş olabilir
+        if os.path.exists(dosya) or not os.path.exists(eski_dosya):
+            return False
+        with open(eski_dosya, "r", encoding="utf-8") as f:
+            raporlar = json.load(f)
+        for rapor in raporlar:
+            rapor.setdefault("id", yeni_id())
+        _atomik_yaz(dosya, raporlar)
+    return True
+
+
+def _kimlik(kayit, konum):
+    # id'si olmayan (elle eklenmiş) satıra günlükteki bayt konumundan kimlik verilir ve kayda
+    # yazılır; oynatma, dizin ve getir aynı kimliği üretir, sıkıştırma onu satıra kalıcı yazar
+    if not kayit.get("id"):
+        kayit["id"] = f"satir-{konum}"
+    return kayit["id"]
+
+
+def _oynat(dosya):
+    # Günlüğü baştan sona oynatır; (canlı kayıtlar {id: kayıt}, silme işaretlerinin id'leri,
+    # ölü satır sayısı) döner. İşaretler arşivdeki kopyaları da siler; arşiv varken
+    # sıkıştırmada korunur (bkz. arsivle).
+    izleme.say("depo.okuma")
+    raporlar = {}
+    silinen = set()
+    olu = 0
+    with open(dosya, "rb") as f:
+        konum = 0
+        for satir in f:
+            baslangic, konum = konum, konum + len(satir)
+            if not satir.strip():
+                continue
+            try:
+                kayit = json.loads(satir)
+            except ValueError:
+                kayit = None
+            if not isinstance(kayit, dict):
+                # Yarım kalmış yazma (ör. çökme sırasında) ya da nesne olmayan satır - atla
+                olu += 1
+                continue
+            if "sil" in kayit:
+                silinen.add(kayit["sil"])
+                if raporlar.pop(kayit["sil"], None) is not None:
+                    olu += 2
+            else:
+                rapor_id = _kimlik(kayit, baslangic)
+                if rapor_id in raporlar:
+                    olu += 1
+                raporlar[rapor_id] = kayit
+    return raporlar, silinen, olu
+
+
+def yukle(dosya=RAPOR_DOSYA):
+    goc_et(dosya)
+    if not os.path.exists(dosya):
+        return []
+    raporlar, _, olu = _oynat(dosya)
+    if olu >= SIKISTIRMA_ESIGI:
+        # Okumadan sonra eklenen kayıtlar kaybolmasın diye kilit altında yeniden okunur
+        raporlar = sikistir(dosya)
+    else:
+        raporlar = list(raporlar.values())
+    if _bolum_yollari(dosya):
+        # Arşiv varsa bölümler de okunur (dizin sırasıyla: önce bölümler, sonra sıcak günlük)
+        return yukle_aralik(dosya=dosya)
+    return raporlar
+
+
+def _ekle_satirlar(dosya, kayitlar):
+    goc_et(dosya)
+    izleme.say("depo.yazma")
+    veri = "".join(_satir(kayit) for kayit in kayitlar).encode("utf-8")
+    with kilit(dosya), open(dosya, "ab") as f:
+        # Önceki bir yazma yarım kaldıysa yeni kaydı bozuk satıra yapıştırma
+        if f.tell() > 0:
+            with open(dosya, "rb") as r:
+                r.seek(-1, os.SEEK_END)
+                if r.read(1) != b"\n":
+                    f.write(b"\n")
+        f.write(veri)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _ekle_satir(dosya, kayit):
+    _ekle_satirlar(dosya, [kayit])
+
+
+def ekle(rapor, dosya=RAPOR_DOSYA):
+    """Tek bir vardiya raporunu günlüğün sonuna ekler; maliyeti geçmişin boyutundan bağımsızdır."""
+    rapor = dict(rapor)
+    rapor.setdefault("id", yeni_id())
+    _ekle_satir(dosya, rapor)
+    return rapor["id"]
+
+
+def toplu_ekle(raporlar, dosya=RAPOR_DOSYA):
+    """Birçok vardiyayı tek yazma ve tek fsync ile günlüğün sonuna ekler; id listesini döndürür."""
+    raporlar = [dict(rapor) for rapor in raporlar]
+    for rapor in raporlar:
+        rapor.setdefault("id", yeni_id())
+    if raporlar:
+        _ekle_satirlar(dosya, raporlar)
+    return [rapor["id"] for rapor in raporlar]
+
+
+def sil(rapor_id, dosya=RAPOR_DOSYA):
+    """Kaydı id'siyle siler; kayıt zaten silinmişse (ör. başka bir terminalden) False döner."""
+    with kilit(dosya):
+        with _dizin_kilit:
+            dz = _dizin(dosya)
+            if dz is None or rapor_id not in dz["kayit"]:
+                return False
+        _ekle_satir(dosya, {"sil": rapor_id})
+    return True
+
+
+def kaydet(raporlar, dosya=RAPOR_DOSYA):
+    """Tüm rapor listesini atomik olarak yeniden yazar (sıkıştırma ile aynı yol)."""
+    raporlar = list(raporlar)
+    for rapor in raporlar:
+        rapor.setdefault("id", yeni_id())
+    with kilit(dosya):
+        _atomik_yaz(dosya, raporlar)
+        _bolumleri_sil(dosya)
+
+
+def sikistir(dosya=RAPOR_DOSYA):
+    """Sıcak günlüğü ölü satırlarından arındırıp yeniden yazar; canlı kayıtlarını döndürür.
+
+    Arşiv varsa silme işaretleri korunur; arşivdeki kopyalara `arsivle` uygular.
+    """
+    goc_et(dosya)
+    with kilit(dosya):
+        if not os.path.exists(dosya):
+            return []
+        raporlar, silinen, _ = _oynat(dosya)
+        # Günlükte yeniden eklenmiş id'lerin işaretleri sona yazılırsa onları silerdi
+        isaretler = [{"sil": i} for i in silinen if i not in raporlar] if _bolum_yollari(dosya) else []
+        _atomik_yaz(dosya, [*raporlar.values(), *isaretler])
+    return list(raporlar.values())
+
+
+def tumunu_sil(dosya=RAPOR_DOSYA):
+    # Günlük silinmez, boşaltılır: yoksa eski raporlar.json bir sonraki yüklemede yeniden taşınırdı
+    with kilit(dosya):
+        _bolumleri_sil(dosya)
+        _atomik_yaz(dosya, [])
+
+
+def damga(dosya=RAPOR_DOSYA):
+    """Deponun değişim damgası; dosya her yazıldığında değişir (önbellek anahtarı olarak kullanılır).
+
+    Atomik yeniden yazma yeni bir inode ürettiği için inode da damgaya dahildir.
+    """
+    try:
+        st = os.stat(dosya)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _dizine_oku(dosya, dizin, baslangic, bolum=None):
+    # Günlüğü (ya da `bolum` arşiv dosyasını) `baslangic` bayt konumundan itibaren okuyup
+    # dizine işler; girdiler (tarih, bayt konumu, dosya yolu) biçimindedir
+    izleme.say("depo.dizin_okuma")
+    kaynak = bolum or dosya
+    with open(kaynak, "rb") as f:
+        f.seek(baslangic)
+        konum = baslangic
+        for satir in f:
+            if not satir.endswith(b"\n"):
+                # Yazımı süren / yarım kalmış son satır: bir sonraki seferde tekrar okunur
+                break
+            try:
+                kayit = json.loads(satir)
+            except ValueError:
+                kayit = None
+            if not isinstance(kayit, dict):
+                # Yarım kalmış ya da nesne olmayan satır: dizine girmez
+                pass
+            elif "sil" in kayit:
+                dizin["kayit"].pop(kayit["sil"], None)
+            else:
+                rapor_id = _kimlik(kayit, konum)
+                dizin["kayit"].pop(rapor_id, None)
+                dizin["kayit"][rapor_id] = (kayit.get("tarih", ""), konum, kaynak)
+            if bolum is None:
+                dizin["son_satir"] = (konum, satir)
+            konum += len(satir)
+    if bolum is None:
+        dizin["boyut"] = konum
+    dizin["gun"] = None
+    dizin["dosyalar"] = None
+
+
+def _son_satir_ayni(dosya, dz):
+    # Sıkıştırma yeni dosya yazar ama dosya sistemi eski inode numarasını yeniden verebilir;
+    # dizinin okuduğu son satır hâlâ aynı konumdaysa önceki baytlar değişmemiştir
+    if dz["son_satir"] is None:
+        return dz["boyut"] == 0
+    konum, satir = dz["son_satir"]
+    with open(dosya, "rb") as f:
+        f.seek(konum)
+        return f.read(len(satir)) == satir
+
+
+def _dizini_kur(dosya):
+    # Önce arşiv bölümleri (ay sırasıyla), sonra sıcak günlük okunur. arsivle bölümleri
+    # günlükten önce yazdığından, okuma sırasında günlük yeniden yazıldıysa baştan kurulur.
+    while True:
+        st = os.stat(dosya)
+        dz = {"inode": (st.st_dev, st.st_ino), "boyut": 0, "kayit": {}, "gun": None, "dosyalar": None,
+              "son_satir": None}
+        for bolum in _bolum_yollari(dosya):
+            try:
+                _dizine_oku(dosya, dz, 0, bolum)
+            except FileNotFoundError:
+                # kaydet bölümleri siliyor; günlük zaten yeniden yazıldı, döngü baştan kurar
+                pass
+        _dizine_oku(dosya, dz, 0)
+        st = os.stat(dosya)
+        if (st.st_dev, st.st_ino) == dz["inode"]:
+            return dz
+
+
+def _dizin(dosya):
+    # Canlı kayıtların dizini: kayıt sırasıyla {id: (tarih, bayt konumu, dosya)}. Süreç içinde
+    # saklanır; günlüğe yalnızca ekleme yapıldıysa sadece yeni baytlar okunur, dosya
+    # yeniden yazıldıysa (sıkıştırma, kaydet, arsivle) baştan kurulur. Çağıran _dizin_kilit'i tutmalı.
+    goc_et(dosya)
+    try:
+        st = os.stat(dosya)
+    except FileNotFoundError:
+        _dizinler.pop(dosya, None)
+        return None
+    dz = _dizinler.get(dosya)
+    if dz is None or dz["inode"] != (st.st_dev, st.st_ino) or dz["boyut"] > st.st_size or (
+        dz["mtime"] != st.st_mtime_ns and not _son_satir_ayni(dosya, dz)
+    ):
+        dz = _dizinler[dosya] = _dizini_kur(dosya)
+    dz["mtime"] = st.st_mtime_ns
+    if dz["boyut"] < st.st_size:
+        _dizine_oku(dosya, dz, dz["boyut"])
+    return dz
+
+
+def kayit_sayisi(dosya=RAPOR_DOSYA):
+    with _dizin_kilit:
+        dz = _dizin(dosya)
+        return len(dz["kayit"]) if dz is not None else 0
+
+
+def gunler(dosya=RAPOR_DOSYA):
+    """tarih -> o tarihteki kayıtların id listesi (kayıt sırasıyla). Dönen sözlük değiştirilmemelidir."""
+    with _dizin_kilit:
+        dz = _dizin(dosya)
+        if dz is None:
+            return {}
+        if dz["gun"] is None:
+            gun = {}
+            for rapor_id, (tarih, _, _) in dz["kayit"].items():
+                gun.setdefault(tarih, []).append(rapor_id)
+            dz["gun"] = gun
+        return dz["gun"]
+
+
+def kayit_idleri(tarih=None, dosya=RAPOR_DOSYA):
+    """Canlı kayıtların id'leri, kayıt sırasıyla (isteğe bağlı olarak tek bir tarihe göre)."""
+    if tarih is not None:
+        return list(gunler(dosya).get(tarih, []))
+    with _dizin_kilit:
+        dz = _dizin(dosya)
+        return list(dz["kayit"]) if dz is not None else []
+
+
+def getir(idler, dosya=RAPOR_DOSYA):
+    """Verilen id'lerdeki kayıtları dizin üzerinden yalnızca kendi satırlarını okuyarak döndürür.
+
+    Yalnızca bu kayıtların bulunduğu dosyalar (sıcak günlük ya da arşiv bölümleri) açılır.
+    """
+    sonuc = []
+    for _ in range(2):
+        with _dizin_kilit:
+            dz = _dizin(dosya)
+            konumlar = [(i, dz["kayit"].get(i)) for i in idler] if dz is not None else []
+        sonuc = []
+        tutarli = True
+        izleme.say("depo.kayit_okuma", len(konumlar))
+        acik = {}
+        try:
+            for rapor_id, girdi in konumlar:
+                if girdi is None:
+                    continue
+                _, konum, yol = girdi
+                f = acik.get(yol)
+                if f is None:
+                    f = acik[yol] = open(yol, "rb")
+                f.seek(konum)
+                try:
+                    kayit = json.loads(f.readline())
+                except ValueError:
+                    kayit = None
+                if not isinstance(kayit, dict) or _kimlik(kayit, konum) != rapor_id:
+                    tutarli = False
+                    break
+                sonuc.append(kayit)
+        except FileNotFoundError as e:
+            if e.filename == dosya:
+                return []
+            # Arşiv bölümü okuma sırasında değişmiş
+            tutarli = False
+        finally:
+            for f in acik.values():
+                f.close()
+        if tutarli:
+            return sonuc
+        # Dosya okuma sırasında yeniden yazılmış; dizini baştan kur
+        with _dizin_kilit:
+            _dizinler.pop(dosya, None)
+    return sonuc
+
+
+# --- Arşiv bölümleri ---
+
+def arsiv_dizini(dosya=RAPOR_DOSYA):
+    return dosya + ".arsiv"
+
+
+def _bolum_yollari(dosya):
+    # Ay sırasıyla (dosya adı YYYY-AA.jsonl)
+    return sorted(glob.glob(os.path.join(glob.escape(arsiv_dizini(dosya)), "*.jsonl")))
+
+
+def _bolum_adi(yol):
+    return os.path.splitext(os.path.basename(yol))[0]
+
+
+def _tarih(metin):
+    try:
+        return datetime.strptime(metin, "%d-%m-%Y")
+    except (TypeError, ValueError):
+        return None
+
+
+def _gun(t):
+    # date / datetime / pandas Timestamp -> gün başı datetime
+    return None if t is None else datetime(t.year, t.month, t.day)
+
+
+def _bolumleri_sil(dosya):
+    # Çağıran kilidi tutmalı
+    yollar = _bolum_yollari(dosya)
+    for yol in yollar:
+        os.remove(yol)
+    if yollar:
+        _dizini_senkronla(yollar[0])
+    try:
+        os.rmdir(arsiv_dizini(dosya))
+    except OSError:
+        pass
+
+
+def bolumler(tarih_bas=None, tarih_bit=None, dosya=RAPOR_DOSYA):
+    """Tarih aralığıyla örtüşen dosyalar, dizin sırasıyla: [{"ad", "yol", "idler"}].
+
+    Arşiv bölümlerinin adı ayıdır ("2024-03"); sıcak günlüğün adı None'dır ve her zaman
+    dahildir. `idler` o dosyadaki canlı kayıtların id'leridir (bkz. `bolum_oku`).
+    """
+    bas = None if tarih_bas is None else f"{tarih_bas:%Y-%m}"
+    bit = None if tarih_bit is None else f"{tarih_bit:%Y-%m}"
+    with _dizin_kilit:
+        dz = _dizin(dosya)
+        if dz is None:
+            return []
+        if dz["dosyalar"] is None:
+            dosyalar = {}
+            for rapor_id, (_, _, yol) in dz["kayit"].items():
+                dosyalar.setdefault(yol, []).append(rapor_id)
+            dz["dosyalar"] = dosyalar
+        dosyalar = dz["dosyalar"]
+    sonuc = []
+    for yol, idler in dosyalar.items():
+        ad = None if yol == dosya else _bolum_adi(yol)
+        if ad is not None and ((bas is not None and ad < bas) or (bit is not None and ad > bit)):
+            continue
+        sonuc.append({"ad": ad, "yol": yol, "idler": list(idler)})
+    return sonuc
+
+
+def bolum_oku(yol, idler):
+    """`yol` günlüğündeki `idler` kayıtlarını verilen sırayla döndürür; dosya bir kez baştan okunur.
+
+    Modül düzeyinde ve yalnızca argümanlarına bağlı olduğundan süreç havuzunda da çalışır.
+    """
+    raporlar, _, _ = _oynat(yol)
+    return [raporlar[i] for i in idler if i in raporlar]
+
+
+def yukle_aralik(tarih_bas=None, tarih_bit=None, dosya=RAPOR_DOSYA):
+    """Tarihi [`tarih_bas`, `tarih_bit`] içindeki vardiyalar; yalnızca örtüşen arşiv bölümleri okunur.
+
+    Sınır verilmeyen yönde tüm kayıtlar alınır. Tarih sınırı varken tarihi okunamayan
+    vardiyalar atlanır.
+    """
+    goc_et(dosya)
+    bas, bit = _gun(tarih_bas), _gun(tarih_bit)
+    raporlar = []
+    for _ in range(2):
+        secili = bolumler(bas, bit, dosya)
+        raporlar = [r for b in secili for r in bolum_oku(b["yol"], b["idler"])]
+        if len(raporlar) == sum(len(b["idler"]) for b in secili):
+            break
+        # Dosyalar okuma sırasında yeniden yazılmış; dizini baştan kur
+        with _dizin_kilit:
+            _dizinler.pop(dosya, None)
+    if bas is None and bit is None:
+        return raporlar
+    sonuc = []
+    for rapor in raporlar:
+        t = _tarih(rapor.get("tarih"))
+        if t is not None and (bas is None or t >= bas) and (bit is None or t <= bit):
+            sonuc.append(rapor)
+    return sonuc
+
+
+def arsivle(gun=ARSIV_GUN, bugun=None, dosya=RAPOR_DOSYA):
+    """`gun` günden eski vardiyaları sıcak günlükten aylık arşiv bölümlerine taşır; taşınan sayısını döndürür.
+
+    Sıcak günlükteki, arşivdeki vardiyalara ait silme işaretleri de bölümlere uygulanır.
+    Önce bölümler, sonra sıcak günlük atomik olarak yazılır: arada kesilirse bir vardiya
+    iki dosyada birden bulunabilir ama kaybolmaz (dizin günlüktekini kullanır, sonraki
+    `arsivle` çiftleri temizler). Tarihi okunamayan vardiyalar sıcak günlükte kalır.
+    """
+    sinir = _gun(bugun or date.today()) - timedelta(days=gun)
+    goc_et(dosya)
+    with kilit(dosya):
+        if not os.path.exists(dosya):
+            return 0
+        raporlar, silinen, _ = _oynat(dosya)
+        tasinan, kalan = {}, []
+        for rapor_id, rapor in raporlar.items():
+            t = _tarih(rapor.get("tarih"))
+            if t is not None and t < sinir:
+                tasinan.setdefault(f"{t:%Y-%m}", []).append(dict(rapor, id=rapor_id))
+            else:
+                kalan.append(rapor)
+        if not tasinan and not silinen:
+            return 0
+        mevcut = {_bolum_adi(yol): yol for yol in _bolum_yollari(dosya)}
+        # Silme işaretleri hangi bölüme ait bilinmediğinden işaret varsa tüm bölümler okunur
+        eskiler = {ad: _oynat(yol)[0] for ad, yol in mevcut.items()} if silinen else {}
+        os.makedirs(arsiv_dizini(dosya), exist_ok=True)
+        for ad in sorted(set(tasinan) | set(eskiler)):
+            yol = mevcut.get(ad) or os.path.join(arsiv_dizini(dosya), ad + ".jsonl")
+            eski = eskiler[ad] if ad in eskiler else _oynat(yol)[0] if ad in mevcut else {}
+            yeni = {i: r for i, r in eski.items() if i not in silinen}
+            yeni.update((r["id"], r) for r in tasinan.get(ad, []))
+            if ad in tasinan or yeni.keys() != eski.keys():
+                _atomik_yaz(yol, yeni.values())
+        # Bölümlere uygulanan (ya da karşılığı kalmamış) silme işaretleri günlükten düşer
+        _atomik_yaz(dosya, kalan)
+    return sum(len(v) for v in tasinan.values())
+
+
+def ana_veri_oku(dosya, varsayilan):
+    """Ana veri dosyasını (kullanıcılar, operatörler, kodlar) okur; yoksa varsayılanla oluşturur."""
+    if not os.path.exists(dosya):
+        ana_veri_yaz(dosya, varsayilan)
+        return varsayilan.copy() if isinstance(varsayilan, list) else dict(varsayilan)
+    izleme.say("ana_veri.okuma")
+    with open(dosya, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ana_veri_yaz(dosya, veri):
+    gecici = f"{dosya}.{os.getpid()}.{threading.get_ident()}.tmp"
+    izleme.say("ana_veri.yazma")
+    with kilit(dosya):
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(veri, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(gecici, dosya)
+        _dizini_senkronla(dosya)
+
+
+def ana_veri_damgasi(dosya):
+    return damga(dosya)
+
+
+def ana_veri_kilidi(dosya):
+    return kilit(dosya)
+
+
+def ana_veri_guncelle(dosya, varsayilan, degistir):
+    """Oku-değiştir-yaz işlemini tek kilit altında yapar; paralel güncellemeler kaybolmaz.
+
+    `degistir(veri)` veriyi yerinde değiştirip değişiklik olup olmadığını döndürür;
+    değişiklik yoksa dosya yazılmaz. (güncel veri, değişti mi) döner.
+    """
+    with kilit(dosya):
+        veri = ana_veri_oku(dosya, varsayilan)
+        degisti = bool(degistir(veri))
+        if degisti:
+            ana_veri_yaz(dosya, veri)
+    return veri, degisti
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Eski vardiyaları aylık arşiv bölümlerine taşı")
+    ap.add_argument("--gun", type=int, default=ARSIV_GUN, help="bundan eski vardiyalar taşınır")
+    ap.add_argument("--dosya", default=RAPOR_DOSYA)
+    args = ap.parse_args(argv)
+    print(f"{arsivle(args.gun, dosya=args.dosya)} vardiya {arsiv_dizini(args.dosya)} altına taşındı.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,496 @@
+"""SQLite arka ucu: raporlar, satırlar ve ana veriler tek bir veritabanında.
+
+Şema normalleştirilmiştir (rapor = vardiya kaydı, satir = makine satırı); tarih,
+makine, operatör ve iş kodu sütunları dizinlidir ve veritabanı WAL kipinde
+açılır. Toplamlar ve filtreler SQL'de hesaplanır, böylece sekmeler geçmişin
+tamamını belleğe almadan yalnızca ihtiyaç duydukları dilimi sorgular.
+
+Mevcut JSON dosyalarını aktarmak için:
+
+    python depo_sqlite.py [veritabani.db]
+"""
+import contextlib
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+import izleme
+
+__all__ = [
+    "SQL", "RAPOR_DOSYA", "yeni_id", "yukle", "ekle", "sil", "kaydet", "sikistir", "tumunu_sil",
+    "damga", "gunler", "kayit_idleri", "kayit_sayisi", "getir", "ana_veri_oku", "ana_veri_yaz",
+    "ana_veri_guncelle", "ana_veri_damgasi", "ana_veri_kilidi", "kilit", "grup", "toplamlar", "filtrele", "tarih_araligi", "secenekler",
+    "ice_aktar", "toplu_ekle", "ARSIV_GUN", "arsivle", "yukle_aralik",
+]
+
+SQL = True
+RAPOR_DOSYA = os.environ.get("TDS_DB", "tds.db")
+ARSIV_GUN = int(os.environ.get("TDS_ARSIV_GUN", "365"))
+
+# Rapor satırı anahtarı -> satir tablosu sütunu
+SATIR_SUTUNLARI = {
+    "Makine": "makine",
+    "İş Kodu": "is_kodu",
+    "Operatör": "operator",
+    "Başlama Saati": "baslama",
+    "Bitiş Saati": "bitis",
+    "Üretim": "uretim",
+    "Hurda": "hurda",
+    "Kod": "kod",
+    "Açıklama": "aciklama",
+    "Hedef": "hedef",
+}
+SAYI_SUTUNLARI = {"uretim", "hurda", "hedef"}
+# Eski kayıtlarda bulunmayabilen alanlar; boşsa rapora geri yazılmaz
+ISTEGE_BAGLI = {"baslama", "bitis"}
+
+# Toplama/filtre boyutu -> SQL ifadesi
+BOYUT_SQL = {
+    "Tarih": "r.tarih",
+    "Vardiya": "r.vardiya",
+    "Makine": "s.makine",
+    "Operatör": "s.operator",
+    "İş Kodu": "s.is_kodu",
+    "Kod": "s.kod",
+}
+
+SEMA = """
+CREATE TABLE IF NOT EXISTS rapor (
+    no INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    tarih TEXT NOT NULL DEFAULT '',
+    tarih_iso TEXT,
+    vardiya TEXT NOT NULL DEFAULT '',
+    zaman TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS satir (
+    rapor_no INTEGER NOT NULL REFERENCES rapor(no) ON DELETE CASCADE,
+    sira INTEGER NOT NULL,
+    makine TEXT NOT NULL DEFAULT '',
+    is_kodu TEXT NOT NULL DEFAULT '',
+    operator TEXT NOT NULL DEFAULT '',
+    baslama TEXT,
+    bitis TEXT,
+    uretim INTEGER NOT NULL DEFAULT 0,
+    hurda INTEGER NOT NULL DEFAULT 0,
+    kod TEXT NOT NULL DEFAULT '',
+    aciklama TEXT NOT NULL DEFAULT '',
+    hedef INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (rapor_no, sira)
+);
+CREATE INDEX IF NOT EXISTS ix_rapor_tarih_iso ON rapor(tarih_iso);
+CREATE INDEX IF NOT EXISTS ix_rapor_tarih ON rapor(tarih);
+CREATE INDEX IF NOT EXISTS ix_satir_makine ON satir(makine);
+CREATE INDEX IF NOT EXISTS ix_satir_operator ON satir(operator);
+CREATE INDEX IF NOT EXISTS ix_satir_is_kodu ON satir(is_kodu);
+CREATE TABLE IF NOT EXISTS kullanici (
+    ad TEXT PRIMARY KEY,
+    sifre TEXT NOT NULL,
+    sira INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS liste_ogesi (
+    liste TEXT NOT NULL,
+    sira INTEGER NOT NULL,
+    deger TEXT NOT NULL,
+    PRIMARY KEY (liste, sira)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    anahtar TEXT PRIMARY KEY,
+    deger INTEGER NOT NULL
+);
+"""
+
+_yerel = threading.local()
+
+
+def _baglanti(dosya):
+    # sqlite3 bağlantıları iş parçacıkları arasında paylaşılmaz; her iş parçacığına ayrı bağlantı
+    baglantilar = getattr(_yerel, "baglantilar", None)
+    if baglantilar is None:
+        baglantilar = _yerel.baglantilar = {}
+    con = baglantilar.get(dosya)
+    if con is None:
+        con = sqlite3.connect(dosya, timeout=30, isolation_level=None)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute("PRAGMA foreign_keys=ON")
+        con.executescript(SEMA)
+        baglantilar[dosya] = con
+    return con
+
+
+@contextlib.contextmanager
+def _islem(dosya, sayac="surum"):
+    # BEGIN IMMEDIATE ... COMMIT; yazan işlemler `sayac` sürüm sayacını da artırır (bkz. damga).
+    # Açık bir işlemin içinde çağrılırsa dıştaki işleme katılır.
+    con = _baglanti(dosya)
+    dis = not con.in_transaction
+    if dis:
+        con.execute("BEGIN IMMEDIATE")
+    try:
+        yield con
+        if sayac:
+            con.execute(
+                "INSERT INTO meta (anahtar, deger) VALUES (?, 1) "
+                "ON CONFLICT(anahtar) DO UPDATE SET deger = deger + 1",
+                (sayac,),
+            )
+    except BaseException:
+        if dis:
+            con.execute("ROLLBACK")
+        raise
+    if dis:
+        con.execute("COMMIT")
+
+
+def kilit(dosya=RAPOR_DOSYA):
+    """Veritabanı yazma kilidi (BEGIN IMMEDIATE); içindeki tüm yazmalar tek işlemde yapılır."""
+    return _islem(dosya, sayac=None)
+
+
+def yeni_id():
+    return uuid.uuid4().hex
+
+
+def _metin(v):
+    return "" if v is None or v != v else str(v)
+
+
+def _sayi(v):
+    # tablo.tip_ata ile aynı dönüşüm: "3.7" -> 3, okunamayan ya da NaN -> 0
+    try:
+        return int(float(v))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def _iso(tarih):
+    try:
+        return datetime.strptime(tarih, "%d-%m-%Y").strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+
+
+def _ekle(con, rapor):
+    rapor_id = rapor.get("id") or yeni_id()
+    tarih = _metin(rapor.get("tarih", ""))
+    imlec = con.execute(
+        "INSERT INTO rapor (id, tarih, tarih_iso, vardiya, zaman) VALUES (?, ?, ?, ?, ?)",
+        (rapor_id, tarih, _iso(tarih), _metin(rapor.get("vardiya", "")), _metin(rapor.get("zaman", ""))),
+    )
+    no = imlec.lastrowid
+    sutunlar = list(SATIR_SUTUNLARI.values())
+    satirlar = []
+    for sira, satir in enumerate(rapor.get("satirlar", [])):
+        degerler = []
+        for anahtar, sutun in SATIR_SUTUNLARI.items():
+            v = satir.get(anahtar)
+            if sutun in SAYI_SUTUNLARI:
+                degerler.append(_sayi(v))
+            elif sutun in ISTEGE_BAGLI:
+                degerler.append(None if anahtar not in satir else _metin(v))
+            else:
+                degerler.append(_metin(v))
+        satirlar.append((no, sira, *degerler))
+    con.executemany(
+        f"INSERT INTO satir (rapor_no, sira, {', '.join(sutunlar)}) "
+        f"VALUES ({', '.join('?' * (len(sutunlar) + 2))})",
+        satirlar,
+    )
+    return rapor_id
+
+
+def _raporlar(con, kosul="", parametreler=()):
+    # rapor + satir birleşiminden JSON arka ucuyla aynı biçimde rapor sözlükleri kurar
+    izleme.say("depo.okuma")
+    raporlar = {}
+    for no, rapor_id, tarih, vardiya, zaman in con.execute(
+        f"SELECT no, id, tarih, vardiya, zaman FROM rapor r {kosul} ORDER BY no", parametreler
+    ):
+        raporlar[no] = {"id": rapor_id, "tarih": tarih, "vardiya": vardiya, "zaman": zaman, "satirlar": []}
+    if not raporlar:
+        return []
+    sutunlar = list(SATIR_SUTUNLARI.values())
+    anahtarlar = list(SATIR_SUTUNLARI)
+    alt_kosul = f"WHERE rapor_no IN (SELECT no FROM rapor r {kosul})" if kosul else ""
+    for rapor_no, *degerler in con.execute(
+        f"SELECT rapor_no, {', '.join(sutunlar)} FROM satir {alt_kosul} ORDER BY rapor_no, sira", parametreler
+    ):
+        satir = {}
+        for anahtar, sutun, v in zip(anahtarlar, sutunlar, degerler):
+            if v is None and sutun in ISTEGE_BAGLI:
+                continue
+            satir[anahtar] = v
+        raporlar[rapor_no]["satirlar"].append(satir)
+    return list(raporlar.values())
+
+
+def yukle(dosya=RAPOR_DOSYA):
+    return _raporlar(_baglanti(dosya))
+
+
+def yukle_aralik(tarih_bas=None, tarih_bit=None, dosya=RAPOR_DOSYA):
+    """Tarihi [`tarih_bas`, `tarih_bit`] içindeki vardiyalar (tarih_iso dizini üzerinden)."""
+    kosul, parametreler = _filtre_kosulu(tarih_bas, tarih_bit, None, None, None, None)
+    return _raporlar(_baglanti(dosya), kosul, parametreler)
+
+
+def arsivle(gun=ARSIV_GUN, bugun=None, dosya=RAPOR_DOSYA):
+    """Arşivleme yalnızca JSON arka ucundadır; burada hiçbir şey taşınmaz ve 0 döner.
+
+    Tarih aralığı sorguları zaten tarih dizinini kullanır, ekleme maliyeti de geçmişin
+    boyutundan bağımsızdır.
+    """
+    return 0
+
+
+def ekle(rapor, dosya=RAPOR_DOSYA):
+    izleme.say("depo.yazma")
+    with _islem(dosya) as con:
+        return _ekle(con, rapor)
+
+
+def toplu_ekle(raporlar, dosya=RAPOR_DOSYA):
+    """Birçok vardiyayı tek işlemde ekler; id listesini döndürür."""
+    izleme.say("depo.yazma")
+    with _islem(dosya) as con:
+        return [_ekle(con, rapor) for rapor in raporlar]
+
+
+def sil(rapor_id, dosya=RAPOR_DOSYA):
+    izleme.say("depo.yazma")
+    with _islem(dosya) as con:
+        return con.execute("DELETE FROM rapor WHERE id = ?", (rapor_id,)).rowcount > 0
+
+
+def kaydet(raporlar, dosya=RAPOR_DOSYA):
+    izleme.say("depo.yazma")
+    with _islem(dosya) as con:
+        con.execute("DELETE FROM rapor")
+        for rapor in raporlar:
+            _ekle(con, rapor)
+
+
+def sikistir(dosya=RAPOR_DOSYA):
+    con = _baglanti(dosya)
+    con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    con.execute("VACUUM")
+
+
+def tumunu_sil(dosya=RAPOR_DOSYA):
+    # Yalnızca raporlar silinir; kullanıcılar ve listeler korunur
+    izleme.say("depo.yazma")
+    with _islem(dosya) as con:
+        con.execute("DELETE FROM rapor")
+
+
+def damga(dosya=RAPOR_DOSYA):
+    if not os.path.exists(dosya):
+        return None
+    satir = _baglanti(dosya).execute("SELECT deger FROM meta WHERE anahtar = 'surum'").fetchone()
+    return (satir[0] if satir else 0,)
+
+
+def gunler(dosya=RAPOR_DOSYA):
+    gun = {}
+    for tarih, rapor_id in _baglanti(dosya).execute("SELECT tarih, id FROM rapor ORDER BY no"):
+        gun.setdefault(tarih, []).append(rapor_id)
+    return gun
+
+
+def kayit_idleri(tarih=None, dosya=RAPOR_DOSYA):
+    con = _baglanti(dosya)
+    if tarih is None:
+        return [r[0] for r in con.execute("SELECT id FROM rapor ORDER BY no")]
+    return [r[0] for r in con.execute("SELECT id FROM rapor WHERE tarih = ? ORDER BY no", (tarih,))]
+
+
+def kayit_sayisi(dosya=RAPOR_DOSYA):
+    return _baglanti(dosya).execute("SELECT COUNT(*) FROM rapor").fetchone()[0]
+
+
+def getir(idler, dosya=RAPOR_DOSYA):
+    idler = list(idler)
+    if not idler:
+        return []
+    raporlar = _raporlar(
+        _baglanti(dosya), f"WHERE id IN ({', '.join('?' * len(idler))})", tuple(idler)
+    )
+    sira = {rapor_id: i for i, rapor_id in enumerate(idler)}
+    return sorted(raporlar, key=lambda r: sira[r["id"]])
+
+
+def _filtre_kosulu(tarih_bas, tarih_bit, vardiya, makine, operator, is_kodu):
+    kosullar, parametreler = [], []
+    if tarih_bas is not None:
+        kosullar.append("r.tarih_iso >= ?")
+        parametreler.append(pd.Timestamp(tarih_bas).strftime("%Y-%m-%d"))
+    if tarih_bit is not None:
+        kosullar.append("r.tarih_iso <= ?")
+        parametreler.append(pd.Timestamp(tarih_bit).strftime("%Y-%m-%d"))
+    for boyut, deger in (("Vardiya", vardiya), ("Makine", makine), ("Operatör", operator), ("İş Kodu", is_kodu)):
+        if deger is not None:
+            kosullar.append(f"{BOYUT_SQL[boyut]} = ?")
+            parametreler.append(deger)
+    return (" WHERE " + " AND ".join(kosullar) if kosullar else ""), parametreler
+
+
+def grup(boyutlar, dosya=RAPOR_DOSYA):
+    """Boyut(lar) bazında Üretim/Hurda/Hedef toplamları (SQL GROUP BY), boyutlara göre sıralı."""
+    izleme.say("depo.sorgu")
+    if isinstance(boyutlar, str):
+        boyutlar = [boyutlar]
+    ifadeler = ", ".join(BOYUT_SQL[b] for b in boyutlar)
+    sorgu = (
+        f"SELECT {ifadeler}, SUM(s.uretim), SUM(s.hurda), SUM(s.hedef) "
+        f"FROM satir s JOIN rapor r ON r.no = s.rapor_no GROUP BY {ifadeler} ORDER BY {ifadeler}"
+    )
+    satirlar = _baglanti(dosya).execute(sorgu).fetchall()
+    return pd.DataFrame(satirlar, columns=[*boyutlar, "Üretim", "Hurda", "Hedef"])
+
+
+def toplamlar(tarih_bas=None, tarih_bit=None, vardiya=None, makine=None, operator=None,
+              is_kodu=None, dosya=RAPOR_DOSYA):
+    izleme.say("depo.sorgu")
+    kosul, parametreler = _filtre_kosulu(tarih_bas, tarih_bit, vardiya, makine, operator, is_kodu)
+    satir = _baglanti(dosya).execute(
+        "SELECT COALESCE(SUM(s.uretim), 0), COALESCE(SUM(s.hurda), 0), "
+        "COALESCE(SUM(CASE WHEN r.vardiya = 'Gündüz' THEN s.uretim END), 0), "
+        "COALESCE(SUM(CASE WHEN r.vardiya = 'Gece' THEN s.uretim END), 0) "
+        f"FROM satir s JOIN rapor r ON r.no = s.rapor_no{kosul}",
+        parametreler,
+    ).fetchone()
+    return dict(zip(("toplam_uretim", "toplam_hurda", "gunduz_uretim", "gece_uretim"), satir))
+
+
+def filtrele(tarih_bas=None, tarih_bit=None, vardiya=None, makine=None, operator=None,
+             is_kodu=None, dosya=RAPOR_DOSYA):
+    """Filtreye uyan satırlar, olgu tablosunun sütun adlarıyla (tipler çağıran tarafından atanır)."""
+    izleme.say("depo.sorgu")
+    kosul, parametreler = _filtre_kosulu(tarih_bas, tarih_bit, vardiya, makine, operator, is_kodu)
+    satirlar = _baglanti(dosya).execute(
+        "SELECT r.tarih, r.vardiya, s.makine, s.is_kodu, s.operator, s.baslama, s.bitis, s.uretim, "
+        "s.hurda, s.kod, s.aciklama, s.hedef "
+        f"FROM satir s JOIN rapor r ON r.no = s.rapor_no{kosul} ORDER BY r.tarih_iso IS NULL, r.tarih_iso, r.no, s.sira",
+        parametreler,
+    ).fetchall()
+    return pd.DataFrame(satirlar, columns=[
+        "Tarih", "Vardiya", "Makine", "İş Kodu", "Operatör", "Başlama Saati", "Bitiş Saati",
+        "Üretim", "Hurda", "Kod", "Açıklama", "Hedef"
+    ])
+
+
+def tarih_araligi(dosya=RAPOR_DOSYA):
+    en_kucuk, en_buyuk = _baglanti(dosya).execute(
+        "SELECT MIN(tarih_iso), MAX(tarih_iso) FROM rapor"
+    ).fetchone()
+    if en_kucuk is None:
+        return None, None
+    return pd.Timestamp(en_kucuk), pd.Timestamp(en_buyuk)
+
+
+def secenekler(sutun, dosya=RAPOR_DOSYA):
+    ifade = BOYUT_SQL[sutun]
+    tablo = "rapor r" if ifade.startswith("r.") else "satir s"
+    return [r[0] for r in _baglanti(dosya).execute(f"SELECT DISTINCT {ifade} FROM {tablo} ORDER BY 1")]
+
+
+def _liste_adi(dosya):
+    return os.path.splitext(os.path.basename(dosya))[0]
+
+
+def _ana_veri_bayragi(dosya):
+    # Liste bir kez yazıldıysa meta'da işaretlenir; boş liste "hiç oluşturulmamış" sayılmaz
+    return "ana_veri:" + _liste_adi(dosya)
+
+
+def ana_veri_oku(dosya, varsayilan, db=RAPOR_DOSYA):
+    """Ana veri (kullanıcılar sözlüğü ya da operatör/kod listesi); hiç yazılmamışsa varsayılanla oluşturulur.
+
+    `dosya` JSON arka ucundaki dosya adıdır (ör. "operatorler.json") ve liste adı olarak kullanılır.
+    Tüm öğeleri silinmiş bir liste, JSON arka ucundaki gibi boş döner.
+    """
+    izleme.say("ana_veri.okuma")
+    con = _baglanti(db)
+    if isinstance(varsayilan, dict):
+        satirlar = con.execute("SELECT ad, sifre FROM kullanici ORDER BY sira").fetchall()
+    else:
+        satirlar = con.execute(
+            "SELECT deger FROM liste_ogesi WHERE liste = ? ORDER BY sira", (_liste_adi(dosya),)
+        ).fetchall()
+    if not satirlar and con.execute(
+        "SELECT 1 FROM meta WHERE anahtar = ?", (_ana_veri_bayragi(dosya),)
+    ).fetchone() is None:
+        ana_veri_yaz(dosya, varsayilan, db)
+        return dict(varsayilan) if isinstance(varsayilan, dict) else list(varsayilan)
+    if isinstance(varsayilan, dict):
+        return dict(satirlar)
+    return [r[0] for r in satirlar]
+
+
+def ana_veri_yaz(dosya, veri, db=RAPOR_DOSYA):
+    izleme.say("ana_veri.yazma")
+    with _islem(db, sayac="ana_veri_surum") as con:
+        if isinstance(veri, dict):
+            con.execute("DELETE FROM kullanici")
+            con.executemany(
+                "INSERT INTO kullanici (ad, sifre, sira) VALUES (?, ?, ?)",
+                [(ad, sifre, i) for i, (ad, sifre) in enumerate(veri.items())],
+            )
+        else:
+            liste = _liste_adi(dosya)
+            con.execute("DELETE FROM liste_ogesi WHERE liste = ?", (liste,))
+            con.executemany(
+                "INSERT INTO liste_ogesi (liste, sira, deger) VALUES (?, ?, ?)",
+                [(liste, i, deger) for i, deger in enumerate(veri)],
+            )
+        con.execute("INSERT OR IGNORE INTO meta (anahtar, deger) VALUES (?, 1)", (_ana_veri_bayragi(dosya),))
+
+
+def ana_veri_damgasi(dosya, db=RAPOR_DOSYA):
+    # Tüm ana veri listeleri tek sayacı paylaşır; herhangi birinin yazılması hepsini eskitir
+    if not os.path.exists(db):
+        return None
+    satir = _baglanti(db).execute("SELECT deger FROM meta WHERE anahtar = 'ana_veri_surum'").fetchone()
+    return (satir[0] if satir else 0,)
+
+
+def ana_veri_kilidi(dosya, db=RAPOR_DOSYA):
+    return kilit(db)
+
+
+def ana_veri_guncelle(dosya, varsayilan, degistir, db=RAPOR_DOSYA):
+    """Oku-değiştir-yaz tek işlemde (bkz. depo_json.ana_veri_guncelle)."""
+    with _islem(db, sayac=None):
+        veri = ana_veri_oku(dosya, varsayilan, db)
+        degisti = bool(degistir(veri))
+        if degisti:
+            ana_veri_yaz(dosya, veri, db)
+    return veri, degisti
+
+
+def ice_aktar(db=RAPOR_DOSYA, ana_veri_dosyalari=("kullanicilar.json", "operatorler.json",
+                                                  "hatakodlari.json", "iskodlari.json")):
+    """Mevcut JSON dosyalarını (rapor günlüğü/raporlar.json ve ana veri dosyaları) veritabanına aktarır."""
+    import json
+
+    import depo_json
+
+    raporlar = depo_json.yukle()
+    kaydet(raporlar, db)
+    for dosya in ana_veri_dosyalari:
+        if os.path.exists(dosya):
+            with open(dosya, "r", encoding="utf-8") as f:
+                ana_veri_yaz(dosya, json.load(f), db)
+    return len(raporlar)
+
+
+if __name__ == "__main__":
+    import sys
+
+    hedef = sys.argv[1] if len(sys.argv) > 1 else RAPOR_DOSYA
+    print(f"{ice_aktar(hedef)} rapor {hedef} dosyasına aktarıldı.")
@@ -0,0 +1,223 @@
+"""Raporların CSV, Excel ve Parquet olarak dışa aktarılması.
+
+Satırlar depodan parça parça (varsayılan 500 vardiya) okunur ve her parça
+hemen çıktı dosyasına yazılır; geçmişin tamamı hiçbir zaman bellekte
+tek bir tabloya dönüştürülmez. Excel için `openpyxl`, Parquet için `pyarrow`
+gerekir; kurulu değilse o biçim kullanılamaz.
+
+Gece toplu dışa aktarma için:
+
+    python disa_aktar.py rapor.csv --bas 01-01-2024 --bit 31-12-2024 [--makine T03] [--gecmis]
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+import depo
+import tablo
+
+PARCA_KAYIT = 500
+EXCEL_SATIR_SINIRI = 1_048_575  # başlık satırı hariç
+
+RAPOR_SUTUNLARI = list(tablo.RAPOR_SUTUNLARI)
+GECMIS_SUTUNLARI = [
+    "Tarih", "Vardiya", "Zaman", "Makine", "İş Kodu", "Operatör", "Başlama Saati", "Bitiş Saati",
+    "Üretim", "Hurda", "Kod", "Açıklama", "Hedef"
+]
+SAYI_SUTUNLARI = set(tablo.SAYI_SUTUNLARI)
+
+MIME = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def bicimler():
+    """Bu ortamda kullanılabilen çıktı biçimleri."""
+    sonuc = ["csv"]
+    try:
+        import openpyxl  # noqa: F401
+        sonuc.append("xlsx")
+    except ImportError:
+        pass
+    try:
+        import pyarrow  # noqa: F401
+        sonuc.append("parquet")
+    except ImportError:
+        pass
+    return sonuc
+
+
+def _tarih(metin):
+    try:
+        return datetime.strptime(metin, "%d-%m-%Y")
+    except (TypeError, ValueError):
+        return None
+
+
+def _cerceve(raporlar, sutunlar):
+    veri = {s: [] for s in sutunlar}
+    rapor_alanlari = {"Tarih": "tarih", "Vardiya": "vardiya", "Zaman": "zaman"}
+    for rapor in raporlar:
+        satirlar = rapor.get("satirlar", [])
+        for s in sutunlar:
+            if s in rapor_alanlari:
+                veri[s].extend([rapor.get(rapor_alanlari[s], "")] * len(satirlar))
+            else:
+                bos = 0 if s in SAYI_SUTUNLARI else ""
+                veri[s].extend([satir.get(s, bos) for satir in satirlar])
+    df = pd.DataFrame(veri, columns=sutunlar)
+    for s in SAYI_SUTUNLARI & set(sutunlar):
+        df[s] = pd.to_numeric(df[s], errors="coerce").fillna(0).astype("int64")
+    for s in set(sutunlar) - SAYI_SUTUNLARI:
+        df[s] = df[s].fillna("").astype(str)
+    return df
+
+
+def _tarih_araligindaki_idler(tarih_bas, tarih_bit, dosya):
+    bas = pd.Timestamp(tarih_bas).to_pydatetime() if tarih_bas is not None else None
+    bit = pd.Timestamp(tarih_bit).to_pydatetime() if tarih_bit is not None else None
+    gunler = []
+    for metin, idler in depo.gunler(dosya).items():
+        t = _tarih(metin)
+        if t is None:
+            # Tarihi okunamayan vardiyalar yalnızca tarih filtresi yokken, en sonda
+            if bas is None and bit is None:
+                gunler.append((datetime.max, idler))
+            continue
+        if (bas is None or t >= bas) and (bit is None or t <= bit):
+            gunler.append((t, idler))
+    gunler.sort(key=lambda g: g[0])
+    return [rapor_id for _, idler in gunler for rapor_id in idler]
+
+
+def depodan_parcalar(tarih_bas=None, tarih_bit=None, vardiya=None, makine=None, operator=None,
+                     is_kodu=None, gecmis=False, gun=None, parca=PARCA_KAYIT, dosya=depo.RAPOR_DOSYA):
+    """Filtreye uyan satırları tarih sırasıyla, `parca` vardiyalık DataFrame parçaları halinde üretir.
+
+    Tarih aralığı depo dizininden (tarih -> kayıt id'leri) seçilir; yalnızca seçilen
+    vardiyalar okunur. `gun` (GG-AA-YYYY) verilirse yalnızca o günün vardiyaları alınır.
+    `gecmis` doğruysa Kayıtlar sekmesindeki tüm alanlar (saatler, kayıt zamanı) de çıktıya girer.
+    """
+    sutunlar = GECMIS_SUTUNLARI if gecmis else RAPOR_SUTUNLARI
+    if gun is not None:
+        secili = depo.kayit_idleri(gun, dosya)
+    else:
+        secili = _tarih_araligindaki_idler(tarih_bas, tarih_bit, dosya)
+
+    for i in range(0, len(secili), parca):
+        df = _cerceve(depo.getir(secili[i:i + parca], dosya), sutunlar)
+        for sutun, deger in (("Vardiya", vardiya), ("Makine", makine), ("Operatör", operator), ("İş Kodu", is_kodu)):
+            if deger is not None:
+                df = df[df[sutun] == deger]
+        if not df.empty:
+            yield df
+
+
+def _csv_yaz(parcalar, sutunlar, f):
+    metin = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+    yazici = csv.writer(metin)
+    yazici.writerow(sutunlar)
+    for df in parcalar:
+        df.to_csv(metin, header=False, index=False, columns=sutunlar)
+    metin.flush()
+    metin.detach()
+
+
+def _excel_yaz(parcalar, sutunlar, f):
+    from openpyxl import Workbook
+
+    # write_only: satırlar sayfaya akıtılır, çalışma kitabı bellekte tutulmaz
+    wb = Workbook(write_only=True)
+    sayfa, satir_sayisi = None, EXCEL_SATIR_SINIRI
+    for df in parcalar:
+        for satir in df[sutunlar].itertuples(index=False, name=None):
+            if satir_sayisi >= EXCEL_SATIR_SINIRI:
+                sayfa = wb.create_sheet(f"Rapor {len(wb.worksheets) + 1}")
+                sayfa.append(sutunlar)
+                satir_sayisi = 0
+            sayfa.append(satir)
+            satir_sayisi += 1
+    if sayfa is None:
+        wb.create_sheet("Rapor 1").append(sutunlar)
+    wb.save(f)
+
+
+def _parquet_yaz(parcalar, sutunlar, f):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sema = pa.schema([(s, pa.int64() if s in SAYI_SUTUNLARI else pa.string()) for s in sutunlar])
+    with pq.ParquetWriter(f, sema, compression="zstd") as yazici:
+        for df in parcalar:
+            parca = df[sutunlar].copy()
+            for s in sutunlar:
+                parca[s] = parca[s].astype("int64" if s in SAYI_SUTUNLARI else str)
+            # Her parça ayrı bir satır grubu olarak yazılır
+            yazici.write_table(pa.Table.from_pandas(parca, schema=sema, preserve_index=False))
+
+
+YAZICILAR = {"csv": _csv_yaz, "xlsx": _excel_yaz, "parquet": _parquet_yaz}
+
+
+def yaz(parcalar, bicim, hedef, sutunlar=RAPOR_SUTUNLARI):
+    """Parçaları `hedef`e (dosya yolu ya da ikili dosya nesnesi) `bicim` biçiminde yazar."""
+    if bicim not in YAZICILAR:
+        raise ValueError(f"Bilinmeyen biçim: {bicim}")
+    if isinstance(hedef, (str, os.PathLike)):
+        with open(hedef, "wb") as f:
+            YAZICILAR[bicim](parcalar, sutunlar, f)
+    else:
+        YAZICILAR[bicim](parcalar, sutunlar, hedef)
+
+
+def bayt_olarak(parcalar, bicim, sutunlar=RAPOR_SUTUNLARI):
+    """İndirme düğmeleri için çıktıyı bellekte üretir."""
+    tampon = io.BytesIO()
+    yaz(parcalar, bicim, tampon, sutunlar)
+    return tampon.getvalue()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Raporları CSV/Excel/Parquet olarak dışa aktar")
+    ap.add_argument("cikti", help="çıktı dosyası (.csv, .xlsx, .parquet)")
+    ap.add_argument("--bicim", choices=sorted(YAZICILAR), help="belirtilmezse dosya uzantısından")
+    ap.add_argument("--bas", help="başlangıç tarihi (GG-AA-YYYY)")
+    ap.add_argument("--bit", help="bitiş tarihi (GG-AA-YYYY)")
+    ap.add_argument("--vardiya")
+    ap.add_argument("--makine")
+    ap.add_argument("--operator")
+    ap.add_argument("--is-kodu")
+    ap.add_argument("--gecmis", action="store_true", help="saatler ve kayıt zamanı dahil tüm alanlar")
+    args = ap.parse_args(argv)
+
+    bicim = args.bicim or os.path.splitext(args.cikti)[1].lstrip(".").lower()
+    if bicim not in bicimler():
+        ap.error(f"'{bicim}' biçimi kullanılamıyor (kullanılabilir: {', '.join(bicimler())})")
+    tarih_bas = _tarih(args.bas) if args.bas else None
+    tarih_bit = _tarih(args.bit) if args.bit else None
+    if (args.bas and tarih_bas is None) or (args.bit and tarih_bit is None):
+        ap.error("Tarihler GG-AA-YYYY biçiminde olmalı")
+
+    sayac = {"satir": 0}
+
+    def say(parcalar):
+        for df in parcalar:
+            sayac["satir"] += len(df)
+            yield df
+
+    parcalar = depodan_parcalar(tarih_bas, tarih_bit, args.vardiya, args.makine, args.operator,
+                                args.is_kodu, gecmis=args.gecmis)
+    yaz(say(parcalar), bicim, args.cikti, GECMIS_SUTUNLARI if args.gecmis else RAPOR_SUTUNLARI)
+    print(f"{sayac['satir']} satır {args.cikti} dosyasına yazıldı.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
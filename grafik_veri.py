@@ -0,0 +1,76 @@
+"""Grafiklere gönderilen verinin sunucu tarafında küçültülmesi.
+
+Zaman serileri görünen tarih aralığına göre gün, hafta ya da ay kovalarına
+toplanır; böylece çizilen nokta sayısı geçmişin uzunluğundan bağımsız olarak
+`MAKS_NOKTA` ile sınırlı kalır. Tarih sütunu GG-AA-YYYY metninden gerçek
+tarihe çevrilir (metin sıralaması ay/yıl sırasını bozuyordu). Çok kategorili
+eksenlerde (ör. 300 iş kodu) yalnızca en büyük `ILK_N` kategori gösterilir,
+kalanlar tek bir "Diğer" çubuğunda toplanır.
+"""
+import pandas as pd
+
+import verim as _verim
+
+MAKS_NOKTA = 400
+ILK_N = 20
+DIGER = "Diğer"
+
+# kova -> (pandas dönem sıklığı, gün cinsinden yaklaşık uzunluk)
+KOVALAR = {"Gün": ("D", 1), "Hafta": ("W-SUN", 7), "Ay": ("M", 30)}
+
+
+def kova_sec(tarih_bas, tarih_bit, maks_nokta=MAKS_NOKTA):
+    """Aralıktaki nokta sayısını `maks_nokta` altında tutan en ince kova (Gün, Hafta, Ay)."""
+    if tarih_bas is None or tarih_bit is None:
+        return "Gün"
+    gun = (pd.Timestamp(tarih_bit) - pd.Timestamp(tarih_bas)).days + 1
+    for kova, (_, uzunluk) in KOVALAR.items():
+        if gun / uzunluk <= maks_nokta:
+            return kova
+    return "Ay"
+
+
+def zaman_serisi(df, olculer, tarih_bas=None, tarih_bit=None, kova=None, tarih_sutun="Tarih"):
+    """Günlük toplamları (`tarih_sutun` GG-AA-YYYY) seçilen kovaya toplar.
+
+    `kova` verilmezse aralığa göre `kova_sec` ile seçilir. Dönen tabloda Tarih
+    gerçek tarih (kovanın ilk günü) olur ve sıralıdır; tarihi okunamayan satırlar atılır.
+    """
+    tarih = pd.to_datetime(df[tarih_sutun], format="%d-%m-%Y", errors="coerce")
+    maske = tarih.notna()
+    if tarih_bas is not None:
+        maske &= tarih >= pd.Timestamp(tarih_bas)
+    if tarih_bit is not None:
+        maske &= tarih <= pd.Timestamp(tarih_bit)
+    veri = df.loc[maske, olculer].assign(**{tarih_sutun: tarih[maske]})
+    if veri.empty:
+        return pd.DataFrame(columns=[tarih_sutun, *olculer])
+    kova = kova or kova_sec(veri[tarih_sutun].min(), veri[tarih_sutun].max())
+    # Her tarih kovasının ilk gününe taşınır (hafta pazartesi başlar)
+    anahtar = veri[tarih_sutun].dt.to_period(KOVALAR[kova][0]).dt.start_time
+    sonuc = veri.groupby(anahtar.rename(tarih_sutun))[olculer].sum().reset_index()
+    return sonuc.sort_values(tarih_sutun, ignore_index=True)
+
+
+def ilk_n(df, boyut, olcu="Üretim", n=ILK_N, olculer=None):
+    """`olcu`ya göre en büyük `n` kategori ve kalanların toplamı olan "Diğer" satırı.
+
+    Kategori sayısı `n`i aşmıyorsa tablo olduğu gibi döner. Aksi halde ilk `n`
+    büyükten küçüğe sıralanır, "Diğer" en sona eklenir. `olculer` toplanacak
+    sütunlardır (varsayılan: boyut dışındaki tüm sayısal sütunlar).
+    """
+    if len(df) <= n:
+        return df
+    if olculer is None:
+        olculer = [s for s in df.select_dtypes("number").columns if s != boyut]
+    sirali = df.sort_values(olcu, ascending=False, ignore_index=True)
+    ust, kalan = sirali.iloc[:n], sirali.iloc[n:]
+    diger = {boyut: f"{DIGER} ({len(kalan)})", **{s: kalan[s].sum() for s in olculer}}
+    return pd.concat([ust[[boyut, *olculer]], pd.DataFrame([diger])], ignore_index=True)
+
+
+def ilk_n_verim(df, boyut, n=ILK_N):
+    """Verim grafiği için ilk `n` + "Diğer"; "Diğer"in verimi toplamlardan yeniden hesaplanır."""
+    sonuc = ilk_n(df, boyut, "Üretim", n, ["Üretim", "Hedef"])[[boyut, "Üretim", "Hedef"]].copy()
+    sonuc[_verim.VERIM_SUTUN] = _verim.verim_orani(sonuc["Üretim"], sonuc["Hedef"])
+    return sonuc
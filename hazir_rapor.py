@@ -0,0 +1,313 @@
+"""Arka planda önceden hesaplanan (hazır) özet raporlar.
+
+Grafikler ve Raporlar sekmelerinin her açılışta ön-toplamlardan yeniden
+hesapladığı tablolar burada bir kez, istek yolunun dışında hesaplanıp
+`raporlar.jsonl.hazir.json` dosyasına yazılır:
+
+  * grup/<boyut>: Makine, Operatör, İş Kodu, Kod ve Tarih bazında Üretim/Hurda/Hedef
+  * Gün, Hafta, Ay: dönem başına toplamlar, hurda oranı ve verim
+  * Kod: hata kodu başına hurda, hurdadaki payı ve hurda oranı
+  * Verim/Makine, Verim/Operatör: verim tabloları
+  * toplam: tüm tarih aralığı için Raporlar özet çubuğu
+
+Hesaplamayı bir işçi yapar: uygulamayla birlikte başlayan bir iş parçacığı
+(`baslat`) ya da ayrı bir süreç (`python hazir_rapor.py`). İşçi her kayıttan
+sonra (`tetikle`) ve her `aralik` saniyede bir depo damgasını yoklar; damga
+değiştiyse raporları yeniden hesaplar. Ayrı süreçte çalışırken başka
+terminallerin yazmaları da bu yoklamayla yakalanır.
+
+Her rapor kümesi hesaplandığı andaki depo damgasını taşır. `oku` yalnızca damgası
+deponun şimdiki damgasıyla aynı olan sonucu döndürür, bayat bir sonuç hiçbir zaman
+gösterilmez; sonuç yoksa ya da bayatsa None döner ve çağıran (motor) eskisi gibi
+ön-toplamlardan hesaplar. Dönen tablolar paylaşıldığından yerinde değiştirilmemelidir.
+`TDS_HAZIR_RAPOR=0` ile uygulama içindeki işçi kapatılır.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+import depo
+import grafik_veri
+import izleme
+import ozet
+import sorgu
+import tablo
+import verim as _verim
+
+SURUM = 2
+ARALIK = 60
+GRUP_BOYUTLARI = ["Tarih", "Makine", "Operatör", "İş Kodu", "Kod"]
+VERIM_BOYUTLARI = ["Makine", "Operatör"]
+KODSUZ = _verim.KODSUZ
+
+_kilit = threading.Lock()
+_bellek = {}
+_isciler = {}
+
+
+def yol(dosya=depo.RAPOR_DOSYA):
+    return dosya + ".hazir.json"
+
+
+def etkin():
+    return os.environ.get("TDS_HAZIR_RAPOR", "1").strip() != "0"
+
+
+def _kimlik(dosya):
+    # Kayıt kimliği: vardiya sayısı ve depo sırasıyla son vardiyanın id'si. Damga tek başına
+    # yetmez; silinip yeniden oluşturulan SQLite deposunun sürüm sayacı baştan başlar
+    if not os.path.exists(dosya):
+        return None
+    idler = depo.kayit_idleri(dosya=dosya)
+    return [len(idler), idler[-1] if idler else None]
+
+
+# --- Rapor tabloları ---
+
+def donem_tablosu(gunluk, kova):
+    """Günlük toplamlardan (grup/Tarih) `kova` (Gün, Hafta, Ay) başına toplamlar, hurda oranı ve verim."""
+    df = grafik_veri.zaman_serisi(gunluk, ozet.OLCULER, kova=kova)
+    df[_verim.HURDA_SUTUN] = _verim.hurda_orani(df["Üretim"], df["Hurda"])
+    df[_verim.VERIM_SUTUN] = _verim.verim_orani(df["Üretim"], df["Hedef"])
+    return df
+
+
+def kod_tablosu(kodlar):
+    """Hata kodu başına hurda; pay toplam hurdaya, oran toplam işlenen parçaya göredir."""
+    uretim, hurda = kodlar["Üretim"].sum(), kodlar["Hurda"].sum()
+    df = kodlar.loc[kodlar["Hurda"] > 0, ["Kod", "Hurda"]].copy()
+    df["Kod"] = df["Kod"].replace("", KODSUZ)
+    df["Hurda Payı (%)"] = 100 * df["Hurda"] / hurda if hurda else 0.0
+    df[_verim.HURDA_SUTUN] = _verim.hurda_orani(uretim, df["Hurda"]) if uretim + hurda else 0.0
+    return df.sort_values(["Hurda", "Kod"], ascending=[False, True], ignore_index=True)
+
+
+def hesapla(dosya=depo.RAPOR_DOSYA):
+    """Tüm raporları ön-toplamlardan hesaplar: {"raporlar": {ad: DataFrame}, "toplam": dict ya da None}."""
+    raporlar = {}
+    for boyut in GRUP_BOYUTLARI:
+        raporlar[f"grup/{boyut}"] = ozet.grup(boyut, dosya)[[boyut, *ozet.OLCULER]]
+    gunluk = raporlar["grup/Tarih"]
+    for kova in grafik_veri.KOVALAR:
+        raporlar[kova] = donem_tablosu(gunluk, kova)
+    raporlar["Kod"] = kod_tablosu(raporlar["grup/Kod"])
+    for boyut in VERIM_BOYUTLARI:
+        raporlar[f"Verim/{boyut}"] = _verim.verim(raporlar[f"grup/{boyut}"], boyut)
+    # Özet çubuğu tarih aralığına göre süzer; tam aralık için toplam önceden alınır
+    tarih_bas, tarih_bit = sorgu.tarih_araligi(dosya)
+    toplam = None
+    if tarih_bas is not None:
+        toplam = dict(ozet.toplamlar(tarih_bas, tarih_bit, dosya=dosya),
+                      tarih_bas=f"{tarih_bas:%Y-%m-%d}", tarih_bit=f"{tarih_bit:%Y-%m-%d}")
+    return {"raporlar": raporlar, "toplam": toplam}
+
+
+# --- Disk biçimi ---
+
+def _kodla(df):
+    tarihler = [s for s in df.columns if pd.api.types.is_datetime64_any_dtype(df[s])]
+    df = df.assign(**{s: df[s].dt.strftime("%Y-%m-%d") for s in tarihler})
+    return {"sutunlar": list(df.columns), "tarihler": tarihler, "satirlar": df.to_dict("split")["data"]}
+
+
+def _coz(veri):
+    df = pd.DataFrame(veri["satirlar"], columns=veri["sutunlar"])
+    for s in veri["tarihler"]:
+        df[s] = pd.to_datetime(df[s], format="%Y-%m-%d")
+    return df
+
+
+def _imza(hedef):
+    try:
+        st = os.stat(hedef)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _yaz(sonuc, damga, kimlik, hesap_zamani, dosya):
+    hedef = yol(dosya)
+    gecici = f"{hedef}.{os.getpid()}.{threading.get_ident()}.tmp"
+    icerik = {
+        "arka_uc": depo.ARKA_UC, "surum": SURUM, "kimlik": kimlik, "damga": damga,
+        "zaman": hesap_zamani, "toplam": sonuc["toplam"],
+        "raporlar": {ad: _kodla(df) for ad, df in sonuc["raporlar"].items()},
+    }
+    try:
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(icerik, f, ensure_ascii=False)
+        os.replace(gecici, hedef)
+    except OSError:
+        try:
+            os.remove(gecici)
+        except OSError:
+            pass
+        return None
+    return _imza(hedef)
+
+
+def _oku(dosya):
+    # Dosya değişmediyse bellekteki çözülmüş hali kullanılır
+    hedef = yol(dosya)
+    imza = _imza(hedef)
+    if imza is None:
+        return None
+    with _kilit:
+        kayit = _bellek.get(dosya)
+        if kayit is not None and kayit["imza"] == imza:
+            return kayit
+    try:
+        with open(hedef, encoding="utf-8") as f:
+            icerik = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (icerik.get("arka_uc"), icerik.get("surum"), icerik.get("kimlik")) != (depo.ARKA_UC, SURUM, _kimlik(dosya)):
+        return None
+    izleme.say("hazir.okuma")
+    kayit = {
+        "imza": imza, "damga": tuple(icerik["damga"]) if icerik.get("damga") is not None else None,
+        "zaman": icerik.get("zaman"), "toplam": icerik.get("toplam"),
+        "raporlar": {ad: _coz(veri) for ad, veri in icerik["raporlar"].items()},
+    }
+    with _kilit:
+        _bellek[dosya] = kayit
+    return kayit
+
+
+def _guncel(dosya):
+    kayit = _oku(dosya)
+    if kayit is None or kayit["damga"] is None or kayit["damga"] != depo.damga(dosya):
+        return None
+    return kayit
+
+
+def oku(ad, dosya=depo.RAPOR_DOSYA):
+    """`ad` raporu (ör. "grup/Makine", "Hafta", "Kod"); güncel değilse None."""
+    kayit = _guncel(dosya)
+    if kayit is None:
+        return None
+    izleme.say("hazir.isabet")
+    return kayit["raporlar"].get(ad)
+
+
+def toplam(tarih_bas, tarih_bit, dosya=depo.RAPOR_DOSYA):
+    """[`tarih_bas`, `tarih_bit`] tüm kayıtları kapsıyorsa hazır özet çubuğu toplamları, değilse None."""
+    kayit = _guncel(dosya)
+    if kayit is None or kayit["toplam"] is None:
+        return None
+    t = kayit["toplam"]
+    if pd.Timestamp(tarih_bas) > pd.Timestamp(t["tarih_bas"]) or pd.Timestamp(tarih_bit) < pd.Timestamp(t["tarih_bit"]):
+        return None
+    izleme.say("hazir.isabet")
+    return {k: v for k, v in t.items() if k not in ("tarih_bas", "tarih_bit")}
+
+
+def zaman(dosya=depo.RAPOR_DOSYA):
+    """Güncel raporların hesaplandığı an (epoch saniye) ya da None."""
+    kayit = _guncel(dosya)
+    return None if kayit is None else kayit["zaman"]
+
+
+def guncelle(dosya=depo.RAPOR_DOSYA, zorla=False):
+    """Depo damgası değiştiyse (ya da `zorla`) raporları yeniden hesaplayıp yazar; hesapladıysa True."""
+    damga = depo.damga(dosya)
+    if damga is None:
+        return False
+    if not zorla and _guncel(dosya) is not None:
+        return False
+    # Damga hesaplamadan önce alınır: arada gelen bir yazma sonucu bayat gösterir, yeni değil
+    kimlik = _kimlik(dosya)
+    with izleme.aralik("Hazır rapor/hesaplama"):
+        sonuc = hesapla(dosya)
+        # Olgu tablosu da ısıtılır; sekmelerin filtreleri ilk açılışta beklemez
+        tablo.olgu_tablosu(dosya)
+    simdi = time.time()
+    imza = _yaz(sonuc, list(damga), kimlik, simdi, dosya)
+    if imza is None:
+        return False
+    with _kilit:
+        _bellek[dosya] = {"imza": imza, "damga": tuple(damga), "zaman": simdi,
+                          "toplam": sonuc["toplam"], "raporlar": sonuc["raporlar"]}
+    izleme.say("hazir.yazma")
+    return True
+
+
+def sil(dosya=depo.RAPOR_DOSYA):
+    with _kilit:
+        _bellek.pop(dosya, None)
+    try:
+        os.remove(yol(dosya))
+    except FileNotFoundError:
+        pass
+
+
+# --- İşçi ---
+
+def _calis(dosya, aralik, tetik, dur):
+    while not dur.is_set():
+        try:
+            guncelle(dosya)
+        except Exception:
+            # İşçi hiçbir zaman uygulamayı düşürmez; sekmeler hesaplamayı kendisi yapar
+            izleme.say("hazir.hata")
+        tetik.wait(aralik)
+        tetik.clear()
+
+
+def baslat(dosya=depo.RAPOR_DOSYA, aralik=ARALIK):
+    """Bu süreçte `dosya` için işçi iş parçacığını (yoksa) başlatır; iş parçacığını döndürür."""
+    with _kilit:
+        isci = _isciler.get(dosya)
+        if isci is None or not isci["is_parcacigi"].is_alive():
+            tetik, dur = threading.Event(), threading.Event()
+            t = threading.Thread(target=_calis, args=(dosya, aralik, tetik, dur),
+                                 name="hazir-rapor", daemon=True)
+            isci = _isciler[dosya] = {"is_parcacigi": t, "tetik": tetik, "dur": dur}
+            t.start()
+        return isci["is_parcacigi"]
+
+
+def tetikle(dosya=depo.RAPOR_DOSYA):
+    """Kayıttan sonra çağrılır: bu süreçte işçi varsa beklemeden yeniden hesaplar."""
+    isci = _isciler.get(dosya)
+    if isci is not None:
+        isci["tetik"].set()
+
+
+def durdur(dosya=depo.RAPOR_DOSYA):
+    with _kilit:
+        isci = _isciler.pop(dosya, None)
+    if isci is not None:
+        isci["dur"].set()
+        isci["tetik"].set()
+        isci["is_parcacigi"].join()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Özet raporları arka planda önceden hesapla")
+    ap.add_argument("--aralik", type=float, default=ARALIK, help="depo damgasını yoklama aralığı (saniye)")
+    ap.add_argument("--bir-kez", action="store_true", help="bir kez hesapla ve çık")
+    ap.add_argument("--zorla", action="store_true", help="damga değişmemiş olsa da yeniden hesapla")
+    args = ap.parse_args(argv)
+    if args.bir_kez:
+        if not depo.kayit_sayisi():
+            print(f"{depo.RAPOR_DOSYA}: kayıt yok")
+            return 0
+        hesaplandi = guncelle(zorla=args.zorla)
+        print(f"{yol()}: {'hesaplandı' if hesaplandi else 'güncel'}")
+        return 0
+    if args.zorla:
+        guncelle(zorla=True)
+    try:
+        _calis(depo.RAPOR_DOSYA, args.aralik, threading.Event(), threading.Event())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+"""Hata koduna göre hurda analizi: Pareto, kayan pencereli oran trendi ve sapmalar.
+
+Tüm hesaplar olgu tablosu üzerinde vektörel grup işlemleriyle yapılır; satır
+ya da grup başına Python çağrısı yoktur. Olgu tablosunun her sürümü için bir
+kez iki ara tablo kurulur ve süreç genelinde saklanır:
+
+  * hurdalı satırlar (Hurda > 0): Pareto yalnızca bunlardan toplanır
+  * makine × gün toplamları: trend ve sapma hesapları bunun üzerinde çalışır,
+    böylece çok yıllık geçmişte de tablo boyutu gün × makine sayısıyla sınırlıdır
+
+Hurda oranı her yerde verim.hurda_orani ile (Hurda / (Üretim + Hurda)) alınır;
+kayan pencerelerde oran, penceredeki toplamlardan yeniden hesaplanır (günlük
+oranların ortalaması değil). Dönen tablolar paylaşıldığından yerinde değiştirilmemelidir.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import depo
+import grafik_veri
+import tablo
+import verim as _verim
+
+PARETO_BOYUTLARI = ["Kod", "Makine", "İş Kodu"]
+TREND_PENCERE = 7
+SAPMA_PENCERE = 30
+SAPMA_ESIK = 2.0
+# Tabanı bundan az günden oluşan makineler için sapma hesaplanmaz
+TABAN_EN_AZ_GUN = 5
+TUMU = "Tümü"
+
+_kilit = threading.Lock()
+_durumlar = {}
+
+
+def _kur(df):
+    hurdali = df.loc[df["Hurda"].to_numpy() > 0, [*PARETO_BOYUTLARI, "Hurda", "Açıklama"]].reset_index(drop=True)
+    gunluk = (df.loc[df["Tarih_dt"].notna()]
+              .groupby(["Makine", "Tarih_dt"], observed=True)[["Üretim", "Hurda"]].sum().reset_index())
+    return {"kaynak": df, "hurdali": hurdali, "gunluk": gunluk, "sonuc": {}}
+
+
+def _durum(dosya):
+    df = tablo.olgu_tablosu(dosya)
+    with _kilit:
+        durum = _durumlar.get(dosya)
+        if durum is None or durum["kaynak"] is not df:
+            durum = _durumlar[dosya] = _kur(df)
+        return durum
+
+
+def _oran(uretim, hurda):
+    # Trend için: işlenen parça olmayan pencerede oran bilinmez (0 değil)
+    oran = _verim.hurda_orani(uretim, hurda)
+    oran[(np.asarray(uretim) + np.asarray(hurda)) == 0] = np.nan
+    return oran
+
+
+def pareto(boyutlar=PARETO_BOYUTLARI, n=grafik_veri.ILK_N, dosya=depo.RAPOR_DOSYA):
+    """Hurdanın `boyutlar` kırılımında Pareto tablosu: en büyük `n` neden + "Diğer".
+
+    Sütunlar: Neden (boyut değerlerinin birleşimi), boyutlar, Hurda, Hurda Payı (%),
+    Kümülatif Pay (%) ve o nedende en sık girilen Açıklama.
+    """
+    boyutlar = list(boyutlar)
+    durum = _durum(dosya)
+    anahtar = ("pareto", tuple(boyutlar), n)
+    with _kilit:
+        sonuc = durum["sonuc"].get(anahtar)
+    if sonuc is not None:
+        return sonuc
+
+    h = durum["hurdali"]
+    sutunlar = ["Neden", *boyutlar, "Hurda", "Hurda Payı (%)", "Kümülatif Pay (%)", "Sık Açıklama"]
+    if h.empty or not boyutlar:
+        sonuc = pd.DataFrame(columns=sutunlar)
+    else:
+        g = h.groupby(boyutlar, observed=True)["Hurda"].sum().reset_index()
+        g = g.sort_values(["Hurda", *boyutlar], ascending=[False] + [True] * len(boyutlar), ignore_index=True)
+        ust, kalan = g.iloc[:n], g.iloc[n:]
+        # En sık açıklama: (neden, açıklama) sayıları büyükten küçüğe, her nedenin ilki
+        aciklama = h["Açıklama"].fillna("").astype(str).str.strip()
+        dolu = (aciklama != "").to_numpy()
+        sik = (h.loc[dolu, boyutlar].assign(**{"Sık Açıklama": aciklama[dolu].astype("category")})
+               .groupby([*boyutlar, "Sık Açıklama"], observed=True).size().reset_index(name="adet")
+               .sort_values("adet", ascending=False, kind="stable").drop_duplicates(boyutlar))
+        ust = ust.merge(sik[[*boyutlar, "Sık Açıklama"]], on=boyutlar, how="left")
+        for b in boyutlar:
+            ust[b] = ust[b].astype(str)
+        if "Kod" in boyutlar:
+            ust["Kod"] = ust["Kod"].replace("", _verim.KODSUZ)
+        ust["Sık Açıklama"] = ust["Sık Açıklama"].astype(object).fillna("").astype(str)
+        ust.insert(0, "Neden", ust[boyutlar[0]].str.cat([ust[b] for b in boyutlar[1:]], sep=" · "))
+        g = ust
+        if len(kalan):
+            diger = {"Neden": f"{grafik_veri.DIGER} ({len(kalan)})", **{b: "" for b in boyutlar},
+                     "Hurda": kalan["Hurda"].sum(), "Sık Açıklama": ""}
+            g = pd.concat([ust, pd.DataFrame([diger])], ignore_index=True)
+        toplam = g["Hurda"].sum()
+        g["Hurda Payı (%)"] = 100 * g["Hurda"] / toplam
+        g["Kümülatif Pay (%)"] = g["Hurda Payı (%)"].cumsum()
+        sonuc = g[sutunlar]
+    with _kilit:
+        durum["sonuc"][anahtar] = sonuc
+    return sonuc
+
+
+def trend(tarih_bas=None, tarih_bit=None, kova=None, pencere=TREND_PENCERE, dosya=depo.RAPOR_DOSYA):
+    """Makine başına (ve "Tümü") kayan pencereli hurda oranı, uzun biçimde: Tarih, Makine, Hurda Oranı (%).
+
+    Günlük toplamlar önce `kova`ya (verilmezse grafik_veri.kova_sec) toplanır; pencere
+    son `pencere` kovadır. Kayıt olmayan kovalar 0 sayılır, böylece pencere takvime göre kayar.
+    """
+    g = _durum(dosya)["gunluk"]
+    maske = np.ones(len(g), dtype=bool)
+    if tarih_bas is not None:
+        maske &= (g["Tarih_dt"] >= pd.Timestamp(tarih_bas)).to_numpy()
+    if tarih_bit is not None:
+        maske &= (g["Tarih_dt"] <= pd.Timestamp(tarih_bit)).to_numpy()
+    g = g.loc[maske]
+    if g.empty:
+        return pd.DataFrame(columns=["Tarih", "Makine", _verim.HURDA_SUTUN])
+    kova = kova or grafik_veri.kova_sec(g["Tarih_dt"].min(), g["Tarih_dt"].max())
+    siklik = grafik_veri.KOVALAR[kova][0]
+    donem = g["Tarih_dt"].dt.to_period(siklik)
+    genis = (g.groupby([donem.dt.start_time.rename("Tarih"), "Makine"], observed=True)[["Üretim", "Hurda"]].sum()
+             .unstack("Makine", fill_value=0))
+    takvim = pd.period_range(donem.min(), donem.max(), freq=siklik).start_time
+    genis = genis.reindex(takvim, fill_value=0)
+    olculer = {}
+    for olcu in ("Üretim", "Hurda"):
+        t = genis[olcu]
+        t.columns = t.columns.astype(str)
+        t[TUMU] = t.sum(axis=1)
+        olculer[olcu] = t.rolling(pencere, min_periods=1).sum()
+    oran = pd.DataFrame(_oran(olculer["Üretim"].to_numpy(), olculer["Hurda"].to_numpy()),
+                        index=takvim.rename("Tarih"), columns=olculer["Üretim"].columns.rename("Makine"))
+    return oran.stack().dropna().rename(_verim.HURDA_SUTUN).reset_index()
+
+
+def sapmalar(pencere=SAPMA_PENCERE, esik=SAPMA_ESIK, dosya=depo.RAPOR_DOSYA):
+    """Son `pencere` gündeki hurda oranı makinenin kendi tabanından sapan makineler.
+
+    Taban, makinenin bu pencereden önceki tüm günleridir. Sapma, farkın tabandaki
+    günlük oranların standart sapmasına (σ) bölümüdür; |sapma| ≥ `esik` olanlar
+    "Yüksek"/"Düşük" işaretlenir. Tabanı hep aynı oranda olan (σ = 0) makinede her
+    değişiklik işaretlenir. Pencere, tablodaki son tarihten geriye sayılır.
+    """
+    g = _durum(dosya)["gunluk"]
+    g = g.loc[(g["Üretim"] + g["Hurda"]).to_numpy() > 0]
+    sutunlar = ["Makine", "Taban Gün", "Taban Oran (%)", "Günlük σ (puan)", "Son Gün", "Son Oran (%)",
+                "Fark (puan)", "Sapma (σ)", "Durum"]
+    if g.empty:
+        return pd.DataFrame(columns=sutunlar)
+    sinir = g["Tarih_dt"].max() - pd.Timedelta(days=pencere - 1)
+    g = g.assign(oran=_verim.hurda_orani(g["Üretim"], g["Hurda"]), son=g["Tarih_dt"] >= sinir)
+    ozet = g.groupby(["Makine", "son"], observed=True).agg(
+        gun=("oran", "size"), uretim=("Üretim", "sum"), hurda=("Hurda", "sum"), sigma=("oran", "std")
+    ).unstack("son")
+    ozet.index = ozet.index.astype(str)
+
+    def al(olcu, son):
+        return ozet[(olcu, son)] if (olcu, son) in ozet.columns else pd.Series(np.nan, index=ozet.index)
+
+    t = pd.DataFrame({"Makine": ozet.index})
+    t["Taban Gün"] = al("gun", False).fillna(0).astype("int64").to_numpy()
+    t["Taban Oran (%)"] = _oran(al("uretim", False).fillna(0), al("hurda", False).fillna(0))
+    t["Günlük σ (puan)"] = al("sigma", False).to_numpy()
+    t["Son Gün"] = al("gun", True).fillna(0).astype("int64").to_numpy()
+    t["Son Oran (%)"] = _oran(al("uretim", True).fillna(0), al("hurda", True).fillna(0))
+    fark = (t["Son Oran (%)"] - t["Taban Oran (%)"]).to_numpy()
+    sigma = t["Günlük σ (puan)"].fillna(0).to_numpy()
+    t["Fark (puan)"] = fark
+    t["Sapma (σ)"] = np.divide(fark, sigma, out=np.full(len(t), np.nan), where=sigma > 0)
+    sabit = sigma == 0
+    yetersiz = (t["Taban Gün"] < TABAN_EN_AZ_GUN) | (t["Son Gün"] == 0)
+    t["Durum"] = np.select(
+        [yetersiz, (t["Sapma (σ)"] >= esik) | (sabit & (fark > 0)), (t["Sapma (σ)"] <= -esik) | (sabit & (fark < 0))],
+        ["Yetersiz veri", "Yüksek", "Düşük"], default="Normal"
+    )
+    # İşaretliler önce; kendi içlerinde sapması büyük olan üstte
+    sira = t["Durum"].map({"Yüksek": 0, "Düşük": 1, "Normal": 2, "Yetersiz veri": 3})
+    buyukluk = -t["Sapma (σ)"].abs().fillna(np.inf)
+    return (t.assign(_sira=sira, _buyukluk=buyukluk).sort_values(["_sira", "_buyukluk", "Makine"], ignore_index=True)
+            [sutunlar])
+
+
+def gecersiz_kil(dosya=depo.RAPOR_DOSYA):
+    with _kilit:
+        _durumlar.pop(dosya, None)
@@ -0,0 +1,118 @@
+"""Sıcak yol ölçümü: zamanlanmış aralıklar, okuma/yazma sayaçları ve kayan yüzdelikler.
+
+`with izleme.aralik("Raporlar/filtre"):` bloğun süresini ölçer. Her aşamanın
+son `PENCERE` ölçümü süreç genelinde tutulur (tüm oturumlar ortak);
+yüzdelikler bu pencere üzerinden hesaplanır. Ayrıca her iş parçacığı kendi
+son yeniden çalıştırmasının (rerun) aralıklarını ayrı tutar; Streamlit her
+oturumun betiğini kendi iş parçacığında çalıştırdığından bu, o oturumun son
+çizimidir. `say()` depo okuma/yazma gibi olayları sayar.
+
+İsteğe bağlı olarak her aralık bir JSONL günlüğüne de yazılır: `TDS_IZLEME_GUNLUGU`
+ortam değişkeni ya da `gunluk(dosya)` ile açılır.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+PENCERE = 500
+YUZDELIKLER = (50, 90, 99)
+
+_kilit = threading.Lock()
+_olcumler = defaultdict(lambda: deque(maxlen=PENCERE))
+_sayaclar = defaultdict(int)
+_yerel = threading.local()
+_gunluk = {"dosya": os.environ.get("TDS_IZLEME_GUNLUGU") or None}
+
+
+def calisma_baslat():
+    """Yeni bir yeniden çalıştırma başlar; bu iş parçacığının son çalışma listesi sıfırlanır."""
+    _yerel.calisma = []
+    _yerel.baslangic = time.perf_counter()
+
+
+def _kaydet(ad, sure_ms):
+    with _kilit:
+        _olcumler[ad].append(sure_ms)
+        dosya = _gunluk["dosya"]
+    calisma = getattr(_yerel, "calisma", None)
+    if calisma is not None:
+        calisma.append((ad, sure_ms))
+    if dosya:
+        satir = json.dumps({
+            "zaman": datetime.now().isoformat(timespec="milliseconds"),
+            "asama": ad,
+            "ms": round(sure_ms, 3),
+            "is_parcacigi": threading.get_ident(),
+        }, ensure_ascii=False)
+        try:
+            with open(dosya, "a", encoding="utf-8") as f:
+                f.write(satir + "\n")
+        except OSError:
+            # Günlük yazılamıyorsa ölçüm yine bellekte kalır; uygulama durmamalı
+            pass
+
+
+@contextlib.contextmanager
+def aralik(ad):
+    bas = time.perf_counter()
+    try:
+        yield
+    finally:
+        _kaydet(ad, (time.perf_counter() - bas) * 1000)
+
+
+def say(ad, n=1):
+    with _kilit:
+        _sayaclar[ad] += n
+
+
+def gunluk(dosya=None):
+    """JSONL günlüğünü `dosya`ya yönlendirir; None kapatır. Geçerli günlük dosyasını döndürür."""
+    with _kilit:
+        _gunluk["dosya"] = dosya or None
+        return _gunluk["dosya"]
+
+
+def gunluk_dosyasi():
+    return _gunluk["dosya"]
+
+
+def sifirla():
+    with _kilit:
+        _olcumler.clear()
+        _sayaclar.clear()
+
+
+def son_calisma():
+    """Bu iş parçacığının (oturumun) geçerli/son çalışmasındaki aralıklar, çalışma sırasıyla."""
+    calisma = getattr(_yerel, "calisma", None) or []
+    return pd.DataFrame(calisma, columns=["Aşama", "Süre (ms)"])
+
+
+def calisma_suresi_ms():
+    baslangic = getattr(_yerel, "baslangic", None)
+    return None if baslangic is None else (time.perf_counter() - baslangic) * 1000
+
+
+def yuzdelikler():
+    """Aşama başına çağrı sayısı, son ölçüm ve kayan pencere yüzdelikleri (ms)."""
+    with _kilit:
+        kopya = {ad: np.fromiter(o, dtype="float64") for ad, o in _olcumler.items() if o}
+    sutunlar = ["Aşama", "Ölçüm", "Son (ms)", *[f"p{y} (ms)" for y in YUZDELIKLER], "Maks (ms)"]
+    satirlar = []
+    for ad in sorted(kopya):
+        o = kopya[ad]
+        satirlar.append([ad, len(o), o[-1], *np.percentile(o, YUZDELIKLER), o.max()])
+    return pd.DataFrame(satirlar, columns=sutunlar).round(2)
+
+
+def sayaclar():
+    with _kilit:
+        return dict(sorted(_sayaclar.items()))
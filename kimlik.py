@@ -0,0 +1,211 @@
+"""Kullanıcı doğrulama: tuzlu parola özetleri ve bellekte tutulan oturum belirteçleri.
+
+Parolalar kullanıcı dosyasında düz metin yerine tuzlu özet olarak saklanır:
+"scrypt$n$r$p$tuz$özet" (hashlib.scrypt yoksa "pbkdf2_sha256$tur$tuz$özet"; tuz
+ve özet base64). Düz metin kayıtlar (eski dosyalar, varsayılan kullanıcılar)
+dosya ilk okunduğunda bir kez özetlenip yazılır; parametreleri eskimiş bir
+özet de ilk başarılı girişte yeni parametrelerle yenilenir.
+
+Giriş tek bir özet doğrulaması yapar ve rastgele bir belirteç (token) döndürür.
+Belirteç süreç belleğinde kullanıcı adıyla saklanır; sonraki yeniden
+çalıştırmalar oturumu yalnızca bu bellekten doğrular, kullanıcı dosyasına
+dokunmaz. Şifre değişince ya da kullanıcı silinince o kullanıcının diğer
+belirteçleri iptal edilir; `OTURUM_SURESI` saniye kullanılmayan belirteçler
+düşer. Belirteçler süreçle birlikte yok olur (yeniden başlatmadan sonra yeniden
+giriş gerekir); başka bir süreçte yapılan şifre değişikliği açık oturumları kapatmaz.
+"""
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+import ana_veri
+from motor import KULLANICI_DOSYA, VARSAYILAN_KULLANICILAR
+
+SCRYPT = {"n": 2**14, "r": 8, "p": 1}
+PBKDF2_TUR = 600_000
+TUZ_BAYT = 16
+OZET_BAYT = 32
+OTURUM_SURESI = 12 * 3600
+
+_kilit = threading.Lock()
+_oturumlar = {}
+
+
+def _b64(veri):
+    return base64.b64encode(veri).decode("ascii")
+
+
+def _scrypt_var():
+    return hasattr(hashlib, "scrypt")
+
+
+def ozetle(sifre):
+    """`sifre` için yeni tuzla saklanacak özet metni."""
+    tuz = secrets.token_bytes(TUZ_BAYT)
+    if _scrypt_var():
+        n, r, p = SCRYPT["n"], SCRYPT["r"], SCRYPT["p"]
+        ozet = hashlib.scrypt(sifre.encode("utf-8"), salt=tuz, n=n, r=r, p=p, dklen=OZET_BAYT)
+        return f"scrypt${n}${r}${p}${_b64(tuz)}${_b64(ozet)}"
+    ozet = hashlib.pbkdf2_hmac("sha256", sifre.encode("utf-8"), tuz, PBKDF2_TUR, OZET_BAYT)
+    return f"pbkdf2_sha256${PBKDF2_TUR}${_b64(tuz)}${_b64(ozet)}"
+
+
+def _coz(kayit):
+    # (algoritma, parametreler, tuz, özet) ya da tanınmayan biçimde None
+    if not isinstance(kayit, str):
+        return None
+    parcalar = kayit.split("$")
+    try:
+        if parcalar[0] == "scrypt" and len(parcalar) == 6:
+            return "scrypt", tuple(int(x) for x in parcalar[1:4]), base64.b64decode(parcalar[4]), base64.b64decode(parcalar[5])
+        if parcalar[0] == "pbkdf2_sha256" and len(parcalar) == 4:
+            return "pbkdf2_sha256", (int(parcalar[1]),), base64.b64decode(parcalar[2]), base64.b64decode(parcalar[3])
+    except ValueError:
+        return None
+    return None
+
+
+def ozetli_mi(kayit):
+    return _coz(kayit) is not None
+
+
+def eski_mi(kayit):
+    """Kayıt düz metinse ya da şimdiki parametrelerle özetlenmemişse True."""
+    cozulmus = _coz(kayit)
+    if cozulmus is None:
+        return True
+    algoritma, parametreler = cozulmus[:2]
+    if algoritma == "scrypt":
+        return parametreler != (SCRYPT["n"], SCRYPT["r"], SCRYPT["p"])
+    return _scrypt_var() or parametreler[0] < PBKDF2_TUR
+
+
+def dogrula(sifre, kayit):
+    """`sifre` kayıtlı özetle (ya da henüz taşınmamış düz metinle) eşleşiyor mu; sabit sürede karşılaştırır."""
+    cozulmus = _coz(kayit)
+    if cozulmus is None:
+        return isinstance(kayit, str) and hmac.compare_digest(kayit.encode("utf-8"), sifre.encode("utf-8"))
+    algoritma, parametreler, tuz, beklenen = cozulmus
+    try:
+        if algoritma == "scrypt":
+            n, r, p = parametreler
+            ozet = hashlib.scrypt(sifre.encode("utf-8"), salt=tuz, n=n, r=r, p=p, dklen=len(beklenen))
+        else:
+            ozet = hashlib.pbkdf2_hmac("sha256", sifre.encode("utf-8"), tuz, parametreler[0], len(beklenen))
+    except (AttributeError, ValueError):
+        # Bu Python'da scrypt yok ya da parametreler geçersiz
+        return False
+    return hmac.compare_digest(ozet, beklenen)
+
+
+def kullanicilar(dosya=KULLANICI_DOSYA):
+    """Kullanıcı → özet sözlüğü; düz metin kayıt varsa önce hepsi özetlenip yazılır."""
+    veri = ana_veri.oku(dosya, VARSAYILAN_KULLANICILAR)
+    if all(ozetli_mi(kayit) for kayit in veri.values()):
+        return veri
+
+    def degistir(sozluk):
+        duz = [ad for ad, kayit in sozluk.items() if not ozetli_mi(kayit)]
+        for ad in duz:
+            sozluk[ad] = ozetle(str(sozluk[ad]))
+        return bool(duz)
+    return ana_veri.guncelle(dosya, VARSAYILAN_KULLANICILAR, degistir)[0]
+
+
+def _yenile(kullanici, eski, sifre, dosya):
+    # Eski parametreli özeti yeniler; bu arada başka biri şifreyi değiştirdiyse dokunmaz
+    yeni = ozetle(sifre)
+
+    def degistir(sozluk):
+        if sozluk.get(kullanici) != eski:
+            return False
+        sozluk[kullanici] = yeni
+        return True
+    ana_veri.guncelle(dosya, VARSAYILAN_KULLANICILAR, degistir)
+
+
+def _temizle(simdi):
+    for belirtec in [b for b, o in _oturumlar.items() if simdi - o["son"] > OTURUM_SURESI]:
+        del _oturumlar[belirtec]
+
+
+def giris(kullanici, sifre, dosya=KULLANICI_DOSYA):
+    """Şifre doğruysa yeni oturum belirteci, değilse None."""
+    kayit = kullanicilar(dosya).get(kullanici)
+    if kayit is None or not dogrula(sifre, kayit):
+        return None
+    if eski_mi(kayit):
+        _yenile(kullanici, kayit, sifre, dosya)
+    belirtec = secrets.token_urlsafe(32)
+    simdi = time.monotonic()
+    with _kilit:
+        _temizle(simdi)
+        _oturumlar[belirtec] = {"kullanici": kullanici, "dosya": dosya, "son": simdi}
+    return belirtec
+
+
+def oturum(belirtec):
+    """Belirtecin kullanıcısı; belirteç yoksa, süresi dolduysa ya da iptal edildiyse None. Dosya okunmaz."""
+    if not belirtec:
+        return None
+    simdi = time.monotonic()
+    with _kilit:
+        o = _oturumlar.get(belirtec)
+        if o is None:
+            return None
+        if simdi - o["son"] > OTURUM_SURESI:
+            del _oturumlar[belirtec]
+            return None
+        o["son"] = simdi
+        return o["kullanici"]
+
+
+def cikis(belirtec):
+    with _kilit:
+        _oturumlar.pop(belirtec, None)
+
+
+def _iptal(kullanici, dosya, haric=None):
+    with _kilit:
+        for belirtec in [b for b, o in _oturumlar.items()
+                         if o["kullanici"] == kullanici and o["dosya"] == dosya and b != haric]:
+            del _oturumlar[belirtec]
+
+
+def kullanici_ekle(kullanici, sifre, dosya=KULLANICI_DOSYA):
+    """Yeni kullanıcıyı özetlenmiş şifreyle ekler; (kullanıcılar, eklendi mi). Var olan kullanıcıya dokunmaz."""
+    kullanicilar(dosya)
+    ozet = ozetle(sifre)
+
+    def degistir(sozluk):
+        if kullanici in sozluk:
+            return False
+        sozluk[kullanici] = ozet
+        return True
+    return ana_veri.guncelle(dosya, VARSAYILAN_KULLANICILAR, degistir)
+
+
+def sifre_degistir(kullanici, sifre, dosya=KULLANICI_DOSYA, haric=None):
+    """Şifreyi günceller ve kullanıcının `haric` dışındaki oturumlarını kapatır; (kullanıcılar, değişti mi)."""
+    kullanicilar(dosya)
+    ozet = ozetle(sifre)
+
+    def degistir(sozluk):
+        if kullanici not in sozluk:
+            return False
+        sozluk[kullanici] = ozet
+        return True
+    sonuc = ana_veri.guncelle(dosya, VARSAYILAN_KULLANICILAR, degistir)
+    if sonuc[1]:
+        _iptal(kullanici, dosya, haric)
+    return sonuc
+
+
+def kullanici_sil(kullanici, dosya=KULLANICI_DOSYA):
+    """Kullanıcıyı siler ve tüm oturumlarını kapatır; (kullanıcılar, silindi mi)."""
+    sonuc = ana_veri.guncelle(dosya, VARSAYILAN_KULLANICILAR, lambda sozluk: sozluk.pop(kullanici, None) is not None)
+    _iptal(kullanici, dosya)
+    return sonuc
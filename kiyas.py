@@ -0,0 +1,305 @@
+"""Rapor hattı için başsız (Streamlit'siz) performans ölçümü ve sentetik veri üreteci.
+
+Sentetik geçmiş gerçek `raporlar.json` biçimindedir: T01–T13 makineleri,
+yapılandırılmış operatörler, 300 iş kodu ve HT hata kodları, günde iki vardiya.
+Her boyut için (varsayılan 1k / 100k / 1M satır) geçici bir dizinde depo
+kurulur ve hattın her aşaması (yazma, yükleme, olgu tablosu, anlık görüntüden
+yükleme, sorgu dizini, filtre, ön-toplamlar, gruplar, verim, grafik verisi,
+süre göstergeleri, hurda analizi, hazır raporların hesaplanması ve okunması,
+artımlı ekleme, dışa aktarma, arşivleme ve tarih aralığıyla yükleme) ayrı ayrı
+ölçülür. Süreler izlemesiz bir geçişte, bellek tepe değerleri `tracemalloc` ile
+ikinci bir geçişte alınır; sonuç JSON olarak yazılır ve sürümler arasında
+karşılaştırılabilir.
+
+    python kiyas.py [--arka-uc json|sqlite] [--satir 1000 100000 1000000] [--yil 3] [--cikti kiyas.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+MAKINELER = [f"T{i:02}" for i in range(1, 14)]
+IS_KODLARI = [f"{i:03}" for i in range(1, 301)]
+YEDEK_OPERATORLER = [f"Operatör {i}" for i in range(1, 21)]
+YEDEK_HATA_KODLARI = [f"HT{i:02}" for i in range(1, 11)]
+SAATLER = {"Gündüz": ("08:00", "20:00"), "Gece": ("20:00", "08:00")}
+
+def uret(satir, yil=3, tohum=0, operatorler=YEDEK_OPERATORLER, hata_kodlari=YEDEK_HATA_KODLARI,
+         son_gun=date(2025, 12, 31)):
+    """`satir` satırlık sentetik geçmiş; vardiyalar `son_gun`e kadar en fazla `yil` yıla yayılır.
+
+    Satır sayısı vardiya sayısından azsa yalnızca son günler doldurulur. Aynı tohum aynı veriyi üretir.
+    """
+    import depo
+
+    rnd = random.Random(tohum)
+    vardiya_sayisi = min(satir, yil * 365 * 2)
+    if not vardiya_sayisi:
+        return []
+    taban, artan = divmod(satir, vardiya_sayisi)
+    ilk_gun = son_gun - timedelta(days=(vardiya_sayisi - 1) // 2)
+    raporlar = []
+    for k in range(vardiya_sayisi):
+        tarih = (ilk_gun + timedelta(days=k // 2)).strftime("%d-%m-%Y")
+        vardiya = "Gündüz" if k % 2 == 0 else "Gece"
+        baslama, bitis = SAATLER[vardiya]
+        satirlar = []
+        for j in range(taban + (k < artan)):
+            hedef = rnd.randrange(3000, 7000, 50)
+            uretim = int(hedef * rnd.uniform(0.6, 1.1))
+            hurda = int(uretim * rnd.random() * 0.05)
+            satirlar.append({
+                "Makine": MAKINELER[j % len(MAKINELER)],
+                "İş Kodu": rnd.choice(IS_KODLARI),
+                "Operatör": rnd.choice(operatorler),
+                "Başlama Saati": baslama,
+                "Bitiş Saati": bitis,
+                "Üretim": uretim,
+                "Hurda": hurda,
+                "Kod": rnd.choice(hata_kodlari) if hurda else "",
+                "Açıklama": "",
+                "Hedef": hedef,
+            })
+        raporlar.append({
+            "id": depo.yeni_id(),
+            "tarih": tarih,
+            "vardiya": vardiya,
+            "zaman": f"{tarih} {baslama}",
+            "satirlar": satirlar,
+        })
+    return raporlar
+
+
+def _yapilandirilmis(dosya, yedek):
+    # Yapılandırılmış listeler salt okunur alınır; depo yoksa oluşturulmaz
+    import depo
+
+    if not os.path.exists(depo.RAPOR_DOSYA if depo.SQL else dosya):
+        return yedek
+    return list(depo.ana_veri_oku(dosya, [])) or yedek
+
+
+def asamalar(raporlar, dosya):
+    """(ad, fonksiyon) çiftleri, hattın çalışma sırasıyla. Her aşama kendi önbelleğini soğuk başlatır."""
+    import anlik
+    import depo
+    import disa_aktar
+    import hazir_rapor
+    import hurda
+    import motor
+    import ozet
+    import sorgu
+    import sure
+    import tablo
+
+    tarihler = sorted({datetime.strptime(r["tarih"], "%d-%m-%Y") for r in raporlar})
+    son_ay = (tarihler[-1] - timedelta(days=30), tarihler[-1]) if tarihler else (None, None)
+    ek = uret(len(MAKINELER), yil=1, tohum=1)
+
+    def yaz():
+        motor.raporlari_kaydet(raporlar, dosya)
+
+    def yukle():
+        motor.raporlar(dosya)
+
+    def olgu_tablosu():
+        # Depodan kurulum (ardından anlık görüntü yazılır)
+        anlik.sil(dosya)
+        tablo.gecersiz_kil(dosya)
+        tablo.olgu_tablosu(dosya)
+
+    def anlik_yukle():
+        # Soğuk başlangıç: tablo sütunlu anlık görüntüden okunur
+        tablo.gecersiz_kil(dosya)
+        tablo.olgu_tablosu(dosya)
+
+    def sorgu_dizini():
+        sorgu.gecersiz_kil(dosya)
+        sorgu.dizin(dosya)
+
+    def filtre():
+        motor.filtrele(*son_ay, makine="T03", dosya=dosya)
+        motor.filtrele(dosya=dosya)
+
+    def ozet_kur():
+        ozet.gecersiz_kil(dosya)
+        ozet.hucreler(dosya)
+
+    def toplamlar():
+        motor.toplamlar(*son_ay, dosya=dosya)
+        motor.toplamlar(dosya=dosya)
+
+    def gruplar():
+        for boyut in ("Makine", "Operatör", "İş Kodu", "Tarih"):
+            motor.grup(boyut, dosya)
+
+    def verim_hesabi():
+        motor.verim("Makine", dosya)
+        motor.verim("Operatör", dosya)
+
+    def grafik_verisi():
+        motor.grafik_grup("İş Kodu", dosya=dosya)
+        motor.grafik_verim("Operatör", dosya=dosya)
+        motor.zaman_serisi(dosya=dosya)
+
+    def sure_gostergeleri():
+        sure.gecersiz_kil(dosya)
+        motor.parca_saat("Makine", dosya)
+        motor.makine_kullanimi(dosya)
+        motor.bosta_kalma(dosya)
+
+    def hurda_analizi():
+        hurda.gecersiz_kil(dosya)
+        motor.hurda_pareto(dosya=dosya)
+        motor.hurda_trendi(dosya=dosya)
+        motor.hurda_sapmalari(dosya=dosya)
+
+    def hazir_hesapla():
+        hazir_rapor.guncelle(dosya, zorla=True)
+
+    def hazir_oku():
+        # İstek yolu: sekmelerin okuduğu tablolar hazır raporlardan gelir
+        for boyut in ("Makine", "Operatör", "İş Kodu", "Tarih"):
+            motor.grup(boyut, dosya)
+        motor.verim("Makine", dosya)
+        motor.donem_ozeti("Hafta", dosya)
+        motor.hurda_kodlari(dosya)
+        motor.toplamlar(*motor.tarih_araligi(dosya), dosya=dosya)
+
+    def artimli_ekle():
+        for rapor in ek:
+            motor.vardiya_ekle(dict(rapor, id=depo.yeni_id()), dosya)
+
+    def disa_aktar_csv():
+        disa_aktar.yaz(disa_aktar.depodan_parcalar(dosya=dosya), "csv", os.devnull)
+
+    def arsivle():
+        # Kayıtlar yalnızca ilk tekrarda taşınır; sonraki tekrarlar taşınacak vardiya bulmaz
+        motor.arsivle(dosya=dosya)
+
+    def aralik_yukle():
+        # Son ayın vardiyaları; JSON deposunda yalnızca örtüşen arşiv bölümleri açılır
+        depo.yukle_aralik(*son_ay, dosya=dosya)
+
+    sonuc = [("yaz", yaz), ("yukle", yukle), ("olgu_tablosu", olgu_tablosu)]
+    if anlik.kullanilabilir():
+        sonuc.append(("anlik_yukle", anlik_yukle))
+    if not depo.SQL:
+        sonuc.append(("sorgu_dizini", sorgu_dizini))
+    sonuc += [
+        ("filtre", filtre), ("ozet_kur", ozet_kur), ("toplamlar", toplamlar), ("gruplar", gruplar),
+        ("verim", verim_hesabi), ("grafik_verisi", grafik_verisi),
+        ("sure_gostergeleri", sure_gostergeleri), ("hurda_analizi", hurda_analizi),
+        ("hazir_hesapla", hazir_hesapla), ("hazir_oku", hazir_oku),
+        ("artimli_ekle", artimli_ekle), ("disa_aktar_csv", disa_aktar_csv),
+    ]
+    if not depo.SQL:
+        sonuc.append(("arsivle", arsivle))
+    sonuc.append(("aralik_yukle", aralik_yukle))
+    return sonuc
+
+
+def olc(satir, yil, tekrar, dizin):
+    import depo
+    import izleme
+    import motor
+
+    dosya = os.path.join(dizin, os.path.basename(depo.RAPOR_DOSYA))
+    operatorler = _yapilandirilmis(motor.OPERATOR_DOSYA, YEDEK_OPERATORLER)
+    hata_kodlari = [k for k in _yapilandirilmis(motor.HATAKOD_DOSYA, YEDEK_HATA_KODLARI) if k] or YEDEK_HATA_KODLARI
+
+    bas = time.perf_counter()
+    raporlar = uret(satir, yil, operatorler=operatorler, hata_kodlari=hata_kodlari)
+    sonuc = {
+        "satir": satir,
+        "vardiya": len(raporlar),
+        "uretim_s": round(time.perf_counter() - bas, 4),
+        "asamalar": {},
+    }
+    liste = asamalar(raporlar, dosya)
+
+    # 1. geçiş: süreler (tracemalloc kapalı; en iyi tekrar alınır)
+    for ad, fn in liste:
+        sureler = []
+        for _ in range(tekrar):
+            bas = time.perf_counter()
+            fn()
+            sureler.append(time.perf_counter() - bas)
+        sonuc["asamalar"][ad] = {"sure_s": round(min(sureler), 6)}
+
+    # 2. geçiş: aşama başına tepe bellek ve depo okuma/yazma sayıları
+    depo.tumunu_sil(dosya)
+    tracemalloc.start()
+    try:
+        for ad, fn in liste:
+            tracemalloc.reset_peak()
+            onceki, _ = tracemalloc.get_traced_memory()
+            sayac_once = izleme.sayaclar()
+            fn()
+            simdiki, tepe = tracemalloc.get_traced_memory()
+            sayac_sonra = izleme.sayaclar()
+            sonuc["asamalar"][ad]["okuma_yazma"] = {
+                k: v - sayac_once.get(k, 0) for k, v in sayac_sonra.items() if v != sayac_once.get(k, 0)
+            }
+            sonuc["asamalar"][ad]["tepe_bellek_mb"] = round((tepe - onceki) / 2**20, 3)
+            sonuc["asamalar"][ad]["kalan_bellek_mb"] = round((simdiki - onceki) / 2**20, 3)
+    finally:
+        tracemalloc.stop()
+    sonuc["depo_boyutu_mb"] = round(
+        sum(os.path.getsize(os.path.join(kok, f)) for kok, _, dosyalar in os.walk(dizin) for f in dosyalar) / 2**20, 3
+    )
+    return sonuc
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rapor hattı performans ölçümü")
+    ap.add_argument("--arka-uc", choices=["json", "sqlite"], default=os.environ.get("TDS_DEPO", "json"))
+    ap.add_argument("--satir", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    ap.add_argument("--yil", type=int, default=3, help="sentetik geçmişin yayıldığı yıl sayısı")
+    ap.add_argument("--tekrar", type=int, default=3, help="süre ölçümünde tekrar sayısı (en iyisi alınır)")
+    ap.add_argument("--cikti", help="JSON sonuç dosyası (belirtilmezse standart çıktı)")
+    args = ap.parse_args(argv)
+
+    os.environ["TDS_DEPO"] = args.arka_uc
+    import depo
+    import pandas as pd
+
+    rapor = {
+        "zaman": datetime.now().isoformat(timespec="seconds"),
+        "arka_uc": depo.ARKA_UC,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "yil": args.yil,
+        "tekrar": args.tekrar,
+        "olcumler": [],
+    }
+    for satir in args.satir:
+        dizin = tempfile.mkdtemp(prefix="tds_kiyas_")
+        try:
+            olcum = olc(satir, args.yil, args.tekrar, dizin)
+        finally:
+            shutil.rmtree(dizin, ignore_errors=True)
+        rapor["olcumler"].append(olcum)
+        print(f"{satir} satır: " + ", ".join(
+            f"{ad} {a['sure_s']:.3f}s" for ad, a in olcum["asamalar"].items()
+        ), file=sys.stderr)
+
+    metin = json.dumps(rapor, ensure_ascii=False, indent=2)
+    if args.cikti:
+        with open(args.cikti, "w", encoding="utf-8") as f:
+            f.write(metin + "\n")
+    else:
+        print(metin)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
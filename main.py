@@ -1,9 +1,20 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import json
 from datetime import datetime
-import os
+
+import disa_aktar
+import grafik_veri
+import hazir_rapor
+import hurda
+import izleme
+import kimlik
+import motor
+import toplu_giris
+from motor import (
+    OPERATOR_DOSYA, HATAKOD_DOSYA, ISKOD_DOSYA,
+    VARSAYILAN_OPERATORLER, VARSAYILAN_HATAKODLARI, VARSAYILAN_ISKODLARI,
+)
 
 # (Opsiyonel) Python tarafında TR ay/gün isimleri için
 try:
@@ -13,42 +24,29 @@ except Exception:
     pass
 
 LOGO_PATH = "tds_logo.png"
-KULLANICI_DOSYA = "kullanicilar.json"
-OPERATOR_DOSYA = "operatorler.json"
-HATAKOD_DOSYA = "hatakodlari.json"
-ISKOD_DOSYA = "iskodlari.json"
-
-VARSAYILAN_KULLANICILAR = {
-    "admin": "1234",
-    "Arda Ertan": "1234",
-    "Emrah Karaman": "1234",
-    "Elif Kaya": "abc1",
-    "Berk Aslan": "berk42",
-    "Zeynep Gül": "zeynep!"
-}
-VARSAYILAN_OPERATORLER = [
-    "Sercan Gür", "Salim Tanrıkulu", "Ali Sucu", "İsa Akça", "Mürsel Gümüşsoy",
-    "Yunus Kılıç", "Ş Muratoğlu", "Arda Ertan", "Furkan Ekin", "Burak Polat",
-    "Canan Gül", "Elif Yüce", "Derya Aksu", "Ece Baran", "Berk Aslan",
-    "Hüseyin Sevim", "Yusuf Uzun", "Emre Sarı", "Seda Öztürk", "Zeynep Yıldız"
-]
-VARSAYILAN_HATAKODLARI = [
-    "HT01", "HT02", "HT03", "HT04", "HT05", "HT06", "HT07", "HT08", "HT09", "HT10"
-]
-VARSAYILAN_ISKODLARI = [f"{i:03}" for i in range(1, 301)]
 ADMINS = ["admin"]
 
-def load_or_init(filename, default):
-    if not os.path.exists(filename):
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(default, f, ensure_ascii=False, indent=2)
-        return default.copy() if isinstance(default, list) else dict(default)
-    with open(filename, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def save_json(filename, data):
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+# Özet raporlar süreç başına bir arka plan işçisinde önceden hesaplanır (bkz. hazir_rapor).
+# İşçi modül yüklenirken değil, ilk sayfa çiziminde bir kez başlatılır; önbellek
+# temizlenince (ör. testlerde st.cache_resource.clear()) durdurulur.
+@st.cache_resource(show_spinner=False, on_release=lambda isci: hazir_rapor.durdur())
+def start_report_worker():
+    return hazir_rapor.baslat() if hazir_rapor.etkin() else None
+
+# Dışa aktarma: dosya yalnızca düğmeye basılınca hazırlanır, her yeniden çizimde değil.
+# Hazırlanan dosya filtreler ya da depo değişince geçersiz sayılır.
+def export_area(anahtar, dosya_adi, parcalar, sutunlar, imza):
+    col_bicim, col_hazirla, col_indir = st.columns([1,1,2])
+    bicim = col_bicim.selectbox("Biçim", disa_aktar.bicimler(), key=f"{anahtar}_bicim", label_visibility="collapsed")
+    imza = (bicim, imza, motor.damga())
+    if col_hazirla.button("Dışa Aktar", key=f"{anahtar}_hazirla"):
+        st.session_state[anahtar] = (imza, disa_aktar.bayt_olarak(parcalar(), bicim, sutunlar))
+    hazir = st.session_state.get(anahtar)
+    if hazir and hazir[0] == imza:
+        col_indir.download_button(
+            f"{bicim.upper()} İndir", hazir[1], file_name=f"{dosya_adi}.{bicim}",
+            mime=disa_aktar.MIME[bicim], key=f"{anahtar}_indir"
+        )
 
 # Stil
 st.markdown("""
@@ -79,6 +77,19 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Grafik: toplama, şekil kurma ve çizim ayrı aşamalar olarak ölçülür; toplanan tablo döner
+def chart(ad, veri, sekil):
+    with izleme.aralik(f"Grafikler/{ad}/toplama"):
+        df = veri()
+    if df.empty:
+        st.info("Bu grafik için veri yok.")
+        return df
+    with izleme.aralik(f"Grafikler/{ad}/şekil"):
+        fig = sekil(df)
+    with izleme.aralik(f"Grafikler/{ad}/çizim"):
+        st.plotly_chart(fig, use_container_width=True)
+    return df
+
 def get_image_base64(img_path):
     import base64
     try:
@@ -115,85 +126,74 @@ def logo_header():
     )
     st.write("---")
 
-def main_app():
-    st.set_page_config(layout="wide")
-    logo_header()
-
-    kullanicilar = load_or_init(KULLANICI_DOSYA, VARSAYILAN_KULLANICILAR)
-    operatorler = load_or_init(OPERATOR_DOSYA, VARSAYILAN_OPERATORLER)
-    hatakodlari = load_or_init(HATAKOD_DOSYA, VARSAYILAN_HATAKODLARI)
-    iskodlari = load_or_init(ISKOD_DOSYA, VARSAYILAN_ISKODLARI)
-
-    def load_data():
-        if os.path.exists("raporlar.json"):
-            with open("raporlar.json", "r", encoding="utf-8") as f:
-                return json.load(f)
-        return []
-
-    def save_data(data):
-        with open("raporlar.json", "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
-    def delete_all_data():
-        if os.path.exists("raporlar.json"):
-            os.remove("raporlar.json")
-
-    sekme_ikon = [
-        "📝 Veri Girişi",
-        "📋 Kayıtlar",
-        "🔍 Raporlar & Filtreleme",
-        "📊 Grafikler"
-    ]
-    if st.session_state.get("giris") and st.session_state.get("kullanici") in ADMINS:
-        sekme_ikon.append("🔑 Admin Paneli")
-    tab1, tabKayitlar, tab2, tab3, *admin_tab = st.tabs(sekme_ikon)
+# Tembel sekmeler: Streamlit destekliyorsa (on_change="rerun") yalnızca seçili sekmenin
+# içeriği çalışır; desteklemeyen sürümlerde sekmeler eskisi gibi hep birlikte çizilir.
+def lazy_tabs(etiketler, key):
+    try:
+        return st.tabs(etiketler, key=key, on_change="rerun")
+    except TypeError:
+        return st.tabs(etiketler)
+
+def is_open(sekme):
+    # Durum izlenmiyorsa .open None döner; o durumda sekme çizilir
+    return getattr(sekme, "open", None) is not False
+
+# Gizli sekmelerdeki widget'lar o çalışmada çizilmediği için Streamlit durumlarını siler;
+# değerleri yeniden atamak filtrelerin ve sayfa seçiminin sekme değişiminde korunmasını sağlar.
+KALICI_ANAHTARLAR = [
+    "gun_kayitlar", "kayit_sayfa_boyutu", "kayit_sayfa", "kayit_disa_bicim", "rapor_disa_bicim",
+    "rapor_bas", "rapor_bit", "rapor_vardiya", "rapor_makine", "rapor_operator", "rapor_is_kodu",
+    "rapor_donem", "grafik_sekme", "grafik_aralik", "grafik_kova",
+    "hurda_kirilim", "hurda_aralik", "hurda_kova", "hurda_pencere", "sapma_pencere", "sapma_esik",
+]
 
-    # --- 1. SEKME: VERİ GİRİŞİ ---
-    with tab1:
-        col1, col2 = st.columns([2,1])
-        with col1:
-            # Tarih kutusunu DD-MM-YYYY olarak göster
-            tarih_dt = st.date_input("Tarih (GG-AA-YYYY)", value=datetime.today(), format="DD-MM-YYYY")
-            tarih = tarih_dt.strftime("%d-%m-%Y")
-        with col2:
-            vardiya = st.selectbox("Vardiya", ["Gündüz", "Gece"])
-
-        st.markdown("<div style='margin-bottom: -18px;'></div>", unsafe_allow_html=True)
-        st.markdown("<h5 style='margin-bottom: 4px; margin-top: 6px;'>Üretim Tablosu</h5>", unsafe_allow_html=True)
-
-        satir_sayisi = 13
-        # Başlama/Bitiş Saati alanları eklendi (kullanıcı seçecek)
-        default_rows = [{
-            "Makine": f"T{i:02}",
-            "İş Kodu": "",
-            "Operatör": "",
-            "Başlama Saati": None,
-            "Bitiş Saati": None,
-            "Üretim": 0,
-            "Hurda": 0,
-            "Kod": "",
-            "Açıklama": "",
-            "Hedef": 0
-        } for i in range(1, satir_sayisi+1)]
-
-        # Operatör'ün hemen yanına saatler
-        df = pd.DataFrame(default_rows)[[
-            "Makine", "İş Kodu", "Operatör", "Başlama Saati", "Bitiş Saati",
-            "Üretim", "Hurda", "Kod", "Açıklama", "Hedef"
-        ]]
+def keep_widget_state():
+    for anahtar in KALICI_ANAHTARLAR:
+        if anahtar in st.session_state:
+            st.session_state[anahtar] = st.session_state[anahtar]
+
+# Tarih aralığı seçimleri verinin sınırlarıyla başlar. Sınırlar `sinir_anahtari` altında saklanır;
+# sonradan daha yeni (ya da eski) tarihli bir vardiya kaydedilince eski sınırda duran uç yeni sınıra
+# taşınır, kullanıcının elle değiştirdiği uç olduğu gibi kalır.
+def follow_date_bounds(sinir_anahtari, secim, min_date, max_date):
+    sinir = (min_date.date(), max_date.date())
+    onceki = st.session_state.get(sinir_anahtari)
+    st.session_state[sinir_anahtari] = sinir
+    return motor.tarih_secimi(secim, onceki, sinir)
+
+# Veri Girişi bir fragment: tablo düzenlemeleri yalnızca bu bölümü yeniden çalıştırır
+fragment = getattr(st, "fragment", lambda f: f)
+
+# --- 1. SEKME: VERİ GİRİŞİ ---
+@fragment
+def data_entry_tab():
+    col1, col2 = st.columns([2,1])
+    with col1:
+        # Tarih kutusunu DD-MM-YYYY olarak göster
+        tarih_dt = st.date_input("Tarih (GG-AA-YYYY)", value=datetime.today(), format="DD-MM-YYYY")
+        tarih = tarih_dt.strftime("%d-%m-%Y")
+    with col2:
+        vardiya = st.selectbox("Vardiya", ["Gündüz", "Gece"])
+
+    st.markdown("<div style='margin-bottom: -18px;'></div>", unsafe_allow_html=True)
+    st.markdown("<h5 style='margin-bottom: 4px; margin-top: 6px;'>Üretim Tablosu</h5>", unsafe_allow_html=True)
+
+    with izleme.aralik("Veri Girişi/çizim"):
+        # Her makine için bir boş satır; saatler Operatör'ün hemen yanında
+        df = pd.DataFrame(motor.bos_giris_satirlari())[motor.GIRIS_SUTUNLARI]
 
         df_edit = st.data_editor(
             df,
             column_config={
                 "Makine": st.column_config.TextColumn(width="small"),
-                "İş Kodu": st.column_config.SelectboxColumn(options=[""] + iskodlari, width="small"),
-                "Operatör": st.column_config.SelectboxColumn(options=[""] + operatorler, width="small"),
+                "İş Kodu": st.column_config.SelectboxColumn(options=motor.ana_veri_secenekleri(ISKOD_DOSYA, VARSAYILAN_ISKODLARI), width="small"),
+                "Operatör": st.column_config.SelectboxColumn(options=motor.ana_veri_secenekleri(OPERATOR_DOSYA, VARSAYILAN_OPERATORLER), width="small"),
                 # Saatler HH:mm görünsün
                 "Başlama Saati": st.column_config.TimeColumn(format="HH:mm", step=1, width="small"),
                 "Bitiş Saati": st.column_config.TimeColumn(format="HH:mm", step=1, width="small"),
                 "Üretim": st.column_config.NumberColumn(width="small", step=1, min_value=0),
                 "Hurda": st.column_config.NumberColumn(width="small", step=1, min_value=0),
-                "Kod": st.column_config.SelectboxColumn(options=[""] + hatakodlari, width="small"),
+                "Kod": st.column_config.SelectboxColumn(options=motor.ana_veri_secenekleri(HATAKOD_DOSYA, VARSAYILAN_HATAKODLARI), width="small"),
                 "Açıklama": st.column_config.TextColumn(width="medium"),
                 "Hedef": st.column_config.NumberColumn(width="small", step=1, min_value=0),
             },
@@ -203,72 +203,64 @@ def main_app():
             key="uretim_tablosu"
         )
 
-        if st.button("KAYDET", type="primary"):
-            # TimeColumn -> time veya string olabilir; JSON'a HH:MM olarak yaz
-            def _fmt_time(t):
-                try:
-                    return t.strftime("%H:%M") if t else ""
-                except:
-                    return str(t)[:5] if t else ""
-
-            rows = df_edit.to_dict("records")
-            for r in rows:
-                if not isinstance(r.get("Başlama Saati"), str):
-                    r["Başlama Saati"] = _fmt_time(r.get("Başlama Saati"))
-                if not isinstance(r.get("Bitiş Saati"), str):
-                    r["Bitiş Saati"] = _fmt_time(r.get("Bitiş Saati"))
-
-            kayitlar = [
-                row for row in rows
-                if any([
-                    row["İş Kodu"], row["Operatör"], row["Üretim"], row["Hurda"],
-                    row["Kod"], row["Açıklama"], row["Hedef"], row["Başlama Saati"], row["Bitiş Saati"]
-                ])
-            ]
-            if kayitlar:
-                data = load_data()
-                data.append({
-                    "tarih": tarih,
-                    "vardiya": vardiya,
-                    "zaman": datetime.now().strftime("%d-%m-%Y %H:%M"),
-                    "satirlar": kayitlar
-                })
-                save_data(data)
-                st.success("Tablo kaydedildi!")
-            else:
-                st.warning("Hiçbir satırda veri yok.")
-
-    # --- 2. SEKME: KAYITLAR ---
-    with tabKayitlar:
-        st.subheader("Kayıtlar", divider=True)
-        data = load_data()
-        if data:
-            if "tum_sil_onay" not in st.session_state:
+    if st.button("KAYDET", type="primary"):
+        # TimeColumn -> time veya string olabilir; motor HH:MM metnine çevirip boş satırları atar
+        rapor = motor.vardiya_raporu(tarih, vardiya, df_edit.to_dict("records"))
+        if rapor:
+            with izleme.aralik("Veri Girişi/kayıt"):
+                motor.vardiya_ekle(rapor)
+            st.success("Tablo kaydedildi!")
+        else:
+            st.warning("Hiçbir satırda veri yok.")
+
+# --- 2. SEKME: KAYITLAR ---
+def records_tab():
+    st.subheader("Kayıtlar", divider=True)
+    # Kayıtlar dizin üzerinden sayfalanır; yalnızca görünen sayfadaki vardiyalar okunur
+    kayit_var = motor.kayit_sayisi() > 0
+    if kayit_var:
+        if "tum_sil_onay" not in st.session_state:
+            st.session_state.tum_sil_onay = False
+
+        if st.button("Tüm Kayıtları Kalıcı Olarak Sil", type="secondary"):
+            st.session_state.tum_sil_onay = True
+
+        if st.session_state.tum_sil_onay:
+            st.warning("Bu işlem tüm kayıtları GERİ DÖNÜŞÜMSÜZ siler. Emin misiniz?")
+            col_yes, col_no = st.columns([1,1])
+            if col_yes.button("Evet, hepsini sil!", type="primary"):
+                motor.tumunu_sil()
+                st.success("Tüm kayıtlar silindi! Sayfayı yenileyin.")
+                st.session_state.tum_sil_onay = False
+                st.rerun()
+            if col_no.button("İptal", type="secondary"):
                 st.session_state.tum_sil_onay = False
 
-            if st.button("Tüm Kayıtları Kalıcı Olarak Sil", type="secondary"):
-                st.session_state.tum_sil_onay = True
-
-            if st.session_state.tum_sil_onay:
-                st.warning("Bu işlem tüm kayıtları GERİ DÖNÜŞÜMSÜZ siler. Emin misiniz?")
-                col_yes, col_no = st.columns([1,1])
-                if col_yes.button("Evet, hepsini sil!", type="primary"):
-                    delete_all_data()
-                    st.success("Tüm kayıtlar silindi! Sayfayı yenileyin.")
-                    st.session_state.tum_sil_onay = False
-                    st.rerun()
-                if col_no.button("İptal", type="secondary"):
-                    st.session_state.tum_sil_onay = False
-
-        if not data:
-            st.info("Henüz kayıt yok.")
-        else:
-            tum_gunler = sorted(list({r.get("tarih", "") for r in data if r.get("tarih", "")}))
-            sec_gun = st.selectbox("Günü Seç", ["Tümü"] + tum_gunler, key="gun_kayitlar")
+    if not kayit_var:
+        st.info("Henüz kayıt yok.")
+    else:
+        col_gun, col_boyut, col_sayfa = st.columns([2,1,1])
+        sec_gun = col_gun.selectbox("Günü Seç", ["Tümü"] + motor.kayit_gunleri(), key="gun_kayitlar")
+        sayfa_boyutu = col_boyut.selectbox("Sayfa Başına Kayıt", [10, 25, 50, 100], key="kayit_sayfa_boyutu")
+        gun = None if sec_gun == "Tümü" else sec_gun
+
+        # Sayfa numarası aralık dışına çıktıysa (gün ya da sayfa boyutu değişti) widget'tan önce düzeltilir
+        with izleme.aralik("Kayıtlar/yükleme"):
+            kayit_sayfasi = motor.kayit_sayfasi(gun, st.session_state.get("kayit_sayfa", 1), sayfa_boyutu)
+        sayfa_sayisi = kayit_sayfasi["sayfa_sayisi"]
+        st.session_state.kayit_sayfa = kayit_sayfasi["sayfa"]
+        sayfa = col_sayfa.number_input("Sayfa", min_value=1, max_value=sayfa_sayisi, step=1, key="kayit_sayfa")
+        st.caption(f"{kayit_sayfasi['toplam']} kayıt — Sayfa {sayfa}/{sayfa_sayisi}")
+
+        export_area(
+            "kayit_disa", "kayitlar" if gun is None else f"kayitlar_{gun}",
+            lambda: disa_aktar.depodan_parcalar(gecmis=True, gun=gun),
+            disa_aktar.GECMIS_SUTUNLARI, sec_gun
+        )
 
-            for i, rapor in reversed(list(enumerate(data))):
-                if sec_gun != "Tümü" and rapor.get("tarih", "") != sec_gun:
-                    continue
+        with izleme.aralik("Kayıtlar/çizim"):
+            for rapor in kayit_sayfasi["raporlar"]:
+                rapor_id = rapor["id"]
                 zaman = rapor.get('zaman', '')
                 st.markdown(
                     f"<div style='display:flex;align-items:center;gap:18px;font-size:1.1rem;margin-top:8px;'>"
@@ -283,83 +275,64 @@ def main_app():
                     st.dataframe(df_rapor, use_container_width=True)  # Saatler burada görünsün
                 else:
                     st.info("Bu raporda kayıtlı satır yok.")
-                if st.button("Günü Sil", key=f"gun_sil_{i}", help="Bu günün tüm kayıtlarını siler!"):
-                    st.session_state.gun_sil_idx = i
-                if st.session_state.get("gun_sil_idx") == i:
+                if st.button("Günü Sil", key=f"gun_sil_{rapor_id}", help="Bu günün tüm kayıtlarını siler!"):
+                    st.session_state.gun_sil_id = rapor_id
+                if st.session_state.get("gun_sil_id") == rapor_id:
                     col_gun1, col_gun2 = st.columns([1,2])
                     with col_gun1:
-                        if st.button("Eminim, silinsin!", key=f"gun_sil_em_{i}", type="primary"):
-                            data.pop(i)
-                            save_data(data)
-                            st.session_state.gun_sil_idx = None
+                        if st.button("Eminim, silinsin!", key=f"gun_sil_em_{rapor_id}", type="primary"):
+                            motor.vardiya_sil(rapor)
+                            st.session_state.gun_sil_id = None
                             st.rerun()
                     with col_gun2:
-                        if st.button("İptal", key=f"gun_iptal_{i}", type="secondary"):
-                            st.session_state.gun_sil_idx = None
-
-    # --- 3. SEKME: RAPORLAR & FİLTRELEME (saat sütunları yok) ---
-    with tab2:
-        st.subheader("Raporlar ve Filtreleme", divider=True)
-        data = load_data()
-        if not data:
-            st.info("Henüz kayıt yok.")
+                        if st.button("İptal", key=f"gun_iptal_{rapor_id}", type="secondary"):
+                            st.session_state.gun_sil_id = None
+
+# --- 3. SEKME: RAPORLAR & FİLTRELEME (saat sütunları yok) ---
+def reports_tab():
+    st.subheader("Raporlar ve Filtreleme", divider=True)
+    if not motor.kayit_sayisi():
+        st.info("Henüz kayıt yok.")
+    else:
+        with izleme.aralik("Raporlar/yükleme"):
+            min_date, max_date = motor.tarih_araligi()
+            secenekler = {s: ["Tümü"] + motor.filtre_secenekleri(s) for s in ("Vardiya", "Makine", "Operatör", "İş Kodu")}
+
+        # Seçim oturum durumunda korunur; veri sınırları genişleyince sınırdaki uç da genişler
+        if min_date is None:
+            st.session_state.setdefault("rapor_bas", datetime.today())
+            st.session_state.setdefault("rapor_bit", datetime.today())
         else:
-            all_rows = []
-            for rapor in data:
-                for satir in rapor.get("satirlar", []):
-                    all_rows.append({
-                        "Tarih": rapor.get("tarih", ""),
-                        "Vardiya": rapor.get("vardiya", ""),
-                        "Makine": satir.get("Makine", ""),
-                        "İş Kodu": satir.get("İş Kodu", ""),
-                        "Operatör": satir.get("Operatör", ""),
-                        "Üretim": satir.get("Üretim", 0),
-                        "Hurda": satir.get("Hurda", 0),
-                        "Kod": satir.get("Kod", ""),
-                        "Açıklama": satir.get("Açıklama", ""),
-                        "Hedef": satir.get("Hedef", 0)
-                    })
-            df_all = pd.DataFrame(all_rows)
-
-            if not df_all.empty:
-                df_all["Tarih_dt"] = pd.to_datetime(df_all["Tarih"], format="%d-%m-%Y", errors='coerce')
-                min_date = df_all["Tarih_dt"].min()
-                max_date = df_all["Tarih_dt"].max()
-            else:
-                min_date = max_date = datetime.today()
-
-            col1, col2 = st.columns(2)
-            with col1:
-                tarih_bas = st.date_input("Başlangıç Tarihi", value=min_date if min_date is not None else datetime.today(), format="DD-MM-YYYY")
-            with col2:
-                tarih_bit = st.date_input("Bitiş Tarihi", value=max_date if max_date is not None else datetime.today(), format="DD-MM-YYYY")
-
-            col3, col4, col5, col6 = st.columns(4)
-            vardiya_f = col3.selectbox("Vardiya", ["Tümü"] + sorted(df_all["Vardiya"].unique()), index=0)
-            makine_f = col4.selectbox("Makine", ["Tümü"] + sorted(df_all["Makine"].unique()), index=0)
-            op_f = col5.selectbox("Operatör", ["Tümü"] + sorted(df_all["Operatör"].unique()), index=0)
-            is_kodu_f = col6.selectbox("İş Kodu", ["Tümü"] + sorted(df_all["İş Kodu"].unique()), index=0)
-
-            filtre = df_all.copy()
-            if not filtre.empty:
-                filtre["Tarih_dt"] = pd.to_datetime(filtre["Tarih"], format="%d-%m-%Y", errors='coerce')
-                filtre = filtre[(filtre["Tarih_dt"] >= pd.to_datetime(tarih_bas)) & (filtre["Tarih_dt"] <= pd.to_datetime(tarih_bit))]
-
-            if vardiya_f != "Tümü":
-                filtre = filtre[filtre["Vardiya"] == vardiya_f]
-            if makine_f != "Tümü":
-                filtre = filtre[filtre["Makine"] == makine_f]
-            if op_f != "Tümü":
-                filtre = filtre[filtre["Operatör"] == op_f]
-            if is_kodu_f != "Tümü":
-                filtre = filtre[filtre["İş Kodu"] == is_kodu_f]
-
-            toplam_uretim = filtre["Üretim"].sum()
-            toplam_hurda = filtre["Hurda"].sum()
-            gunduz_uretim = filtre[filtre["Vardiya"] == "Gündüz"]["Üretim"].sum()
-            gece_uretim = filtre[filtre["Vardiya"] == "Gece"]["Üretim"].sum()
-
-            st.dataframe(filtre.drop(columns=["Tarih_dt"]), use_container_width=True)
+            secim = (st.session_state["rapor_bas"], st.session_state["rapor_bit"]) if "rapor_bas" in st.session_state else None
+            st.session_state["rapor_bas"], st.session_state["rapor_bit"] = follow_date_bounds(
+                "rapor_sinir", secim, min_date, max_date
+            )
+        col1, col2 = st.columns(2)
+        with col1:
+            tarih_bas = st.date_input("Başlangıç Tarihi", format="DD-MM-YYYY", key="rapor_bas")
+        with col2:
+            tarih_bit = st.date_input("Bitiş Tarihi", format="DD-MM-YYYY", key="rapor_bit")
+
+        col3, col4, col5, col6 = st.columns(4)
+        vardiya_f = col3.selectbox("Vardiya", secenekler["Vardiya"], key="rapor_vardiya")
+        makine_f = col4.selectbox("Makine", secenekler["Makine"], key="rapor_makine")
+        op_f = col5.selectbox("Operatör", secenekler["Operatör"], key="rapor_operator")
+        is_kodu_f = col6.selectbox("İş Kodu", secenekler["İş Kodu"], key="rapor_is_kodu")
+
+        secim = [None if f == "Tümü" else f for f in (vardiya_f, makine_f, op_f, is_kodu_f)]
+        with izleme.aralik("Raporlar/filtre"):
+            filtre = motor.filtrele(tarih_bas, tarih_bit, *secim)
+
+        # Özet çubuğu satırlardan değil, ön-toplamlardan gelir
+        with izleme.aralik("Raporlar/toplama"):
+            toplam = motor.toplamlar(tarih_bas, tarih_bit, *secim)
+        toplam_uretim = toplam["toplam_uretim"]
+        toplam_hurda = toplam["toplam_hurda"]
+        gunduz_uretim = toplam["gunduz_uretim"]
+        gece_uretim = toplam["gece_uretim"]
+
+        with izleme.aralik("Raporlar/çizim"):
+            st.dataframe(filtre[disa_aktar.RAPOR_SUTUNLARI], use_container_width=True)
             st.markdown(
                 f"""
                 <div class="custom-summary-bar" style='
@@ -382,177 +355,367 @@ def main_app():
                 """,
                 unsafe_allow_html=True
             )
+        export_area(
+            "rapor_disa", f"rapor_{tarih_bas:%d-%m-%Y}_{tarih_bit:%d-%m-%Y}",
+            lambda: disa_aktar.depodan_parcalar(tarih_bas, tarih_bit, *secim),
+            disa_aktar.RAPOR_SUTUNLARI, (tarih_bas, tarih_bit, *secim)
+        )
 
-    # --- 4. SEKME: GRAFİKLER ---
-    with tab3:
-        st.subheader("Grafik Analizler", divider=True)
-        data = load_data()
-        if not data:
-            st.info("Henüz kayıt yok.")
+        # Dönem özetleri arka planda hazırlanır; hazır değilse günlük toplamlardan hesaplanır
+        with st.expander("Dönem Özeti"):
+            kova = st.radio("Dönem", list(grafik_veri.KOVALAR), horizontal=True, key="rapor_donem")
+            with izleme.aralik("Raporlar/dönem özeti"):
+                donem = motor.donem_ozeti(kova)
+            st.dataframe(
+                donem, hide_index=True, use_container_width=True,
+                column_config={"Tarih": st.column_config.DateColumn(format="DD-MM-YYYY")}
+            )
+            hesap_zamani = motor.hazir_rapor_zamani()
+            if hesap_zamani is not None:
+                st.caption(f"Önceden hesaplandı: {hesap_zamani:%d-%m-%Y %H:%M:%S}")
+
+# --- 4. SEKME: GRAFİKLER ---
+def daily_chart():
+    # Aralık uzadıkça noktalar haftalık/aylık kovalara toplanır; grafik boyutu sınırlı kalır
+    min_date, max_date = motor.tarih_araligi()
+    if min_date is None:
+        st.info("Tarihi okunabilen kayıt yok.")
+        return
+    st.session_state["grafik_aralik"] = follow_date_bounds(
+        "grafik_sinir", st.session_state.get("grafik_aralik"), min_date, max_date
+    )
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        aralik = st.date_input("Tarih Aralığı", format="DD-MM-YYYY", key="grafik_aralik")
+    with col2:
+        kova = st.selectbox("Toplama", ["Otomatik", *grafik_veri.KOVALAR], key="grafik_kova")
+    if len(aralik) != 2:
+        st.info("Bitiş tarihini de seçin.")
+        return
+    tarih_bas, tarih_bit = aralik
+    if kova == "Otomatik":
+        kova = grafik_veri.kova_sec(tarih_bas, tarih_bit)
+    chart("Günlük", lambda: motor.zaman_serisi(tarih_bas, tarih_bit, kova), lambda df: px.line(
+        df, x="Tarih", y=["Üretim", "Hurda"], markers=len(df) <= 120,
+        title=f"{'Günlük' if kova == 'Gün' else kova + 'lık'} Toplam Üretim ve Hurda"
+    ).update_xaxes(type="date"))
+
+def pareto_figure(df):
+    # Çubuklar hurda, çizgi sağ eksende kümülatif pay
+    fig = px.bar(df, x="Neden", y="Hurda", hover_data=["Hurda Payı (%)", "Sık Açıklama"], title="Hurda Pareto")
+    fig.add_scatter(x=df["Neden"], y=df["Kümülatif Pay (%)"], name="Kümülatif Pay (%)", yaxis="y2", mode="lines+markers")
+    fig.update_layout(yaxis2=dict(overlaying="y", side="right", range=[0, 105], title="Kümülatif Pay (%)"),
+                      showlegend=False)
+    return fig.update_xaxes(type="category")
+
+def scrap_pareto_chart():
+    st.session_state.setdefault("hurda_kirilim", hurda.PARETO_BOYUTLARI)
+    boyutlar = st.multiselect("Kırılım", hurda.PARETO_BOYUTLARI, key="hurda_kirilim")
+    if not boyutlar:
+        st.info("En az bir kırılım seçin.")
+        return
+    df = chart("Hurda Pareto", lambda: motor.hurda_pareto(boyutlar), pareto_figure)
+    if not df.empty:
+        st.dataframe(df.drop(columns="Neden"), hide_index=True, use_container_width=True)
+
+def scrap_trend_chart():
+    min_date, max_date = motor.tarih_araligi()
+    if min_date is None:
+        st.info("Tarihi okunabilen kayıt yok.")
+        return
+    st.session_state["hurda_aralik"] = follow_date_bounds(
+        "hurda_sinir", st.session_state.get("hurda_aralik"), min_date, max_date
+    )
+    st.session_state.setdefault("hurda_pencere", hurda.TREND_PENCERE)
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        aralik = st.date_input("Tarih Aralığı", format="DD-MM-YYYY", key="hurda_aralik")
+    with col2:
+        kova = st.selectbox("Toplama", ["Otomatik", *grafik_veri.KOVALAR], key="hurda_kova")
+    with col3:
+        pencere = st.number_input("Pencere (kova)", min_value=1, max_value=90, key="hurda_pencere")
+    if len(aralik) != 2:
+        st.info("Bitiş tarihini de seçin.")
+        return
+    tarih_bas, tarih_bit = aralik
+    if kova == "Otomatik":
+        kova = grafik_veri.kova_sec(tarih_bas, tarih_bit)
+    chart("Hurda Trendi", lambda: motor.hurda_trendi(tarih_bas, tarih_bit, kova, int(pencere)), lambda df: px.line(
+        df, x="Tarih", y="Hurda Oranı (%)", color="Makine",
+        title=f"Hurda Oranı (%), son {int(pencere)} {kova.lower()} kayan toplam"
+    ).update_xaxes(type="date"))
+
+def scrap_deviation_chart():
+    st.session_state.setdefault("sapma_pencere", hurda.SAPMA_PENCERE)
+    st.session_state.setdefault("sapma_esik", hurda.SAPMA_ESIK)
+    col1, col2 = st.columns(2)
+    pencere = col1.number_input("Son kaç gün", min_value=1, max_value=365, key="sapma_pencere")
+    esik = col2.number_input("Eşik (σ)", min_value=0.5, max_value=5.0, step=0.5, key="sapma_esik")
+    st.caption("Her makinenin son dönem hurda oranı, kendi geçmişindeki (taban) oranla karşılaştırılır.")
+    df = chart("Hurda Sapmaları", lambda: motor.hurda_sapmalari(int(pencere), esik), lambda df: px.bar(
+        df, x="Makine", y="Fark (puan)", color="Durum", hover_data=["Taban Oran (%)", "Son Oran (%)", "Sapma (σ)"],
+        color_discrete_map={"Yüksek": "#d62728", "Düşük": "#2ca02c", "Normal": "#9fb7d9", "Yetersiz veri": "#cccccc"},
+        title="Tabana Göre Hurda Oranı Farkı (puan)"
+    ).update_xaxes(type="category"))
+    if not df.empty:
+        isaretli = int(df["Durum"].isin(["Yüksek", "Düşük"]).sum())
+        if isaretli:
+            st.warning(f"{isaretli} makinenin hurda oranı tabanından belirgin biçimde sapıyor.")
+        st.dataframe(df, hide_index=True, use_container_width=True)
+
+def charts_tab():
+    st.subheader("Grafik Analizler", divider=True)
+    if not motor.kayit_sayisi():
+        st.info("Henüz kayıt yok.")
+    else:
+        # Her grafik yalnızca kendi alt sekmesi açıkken hesaplanır
+        grafikler = {
+            "Makine Bazında Üretim/Hurda": lambda: chart("Makine", lambda: motor.grafik_grup("Makine"), lambda df: px.bar(
+                df, x="Makine", y=["Üretim", "Hurda"], barmode="group", title="Makine Bazında Üretim ve Hurda"
+            )),
+            "Operatör Bazında Üretim": lambda: chart("Operatör", lambda: motor.grafik_grup("Operatör"), lambda df: px.bar(
+                df, x="Operatör", y=["Üretim", "Hurda"], barmode="group", title="Operatör Bazında Üretim ve Hurda"
+            )),
+            "İş Kodu Bazında Üretim": lambda: chart("İş Kodu", lambda: motor.grafik_grup("İş Kodu"), lambda df: px.bar(
+                df, x="İş Kodu", y=["Üretim", "Hurda"], barmode="group",
+                title=f"İş Kodu Bazında Üretim ve Hurda (ilk {grafik_veri.ILK_N})"
+            ).update_xaxes(type="category")),
+            "Verim (Makine)": lambda: chart("Verim (Makine)", lambda: motor.grafik_verim("Makine"), lambda df: px.bar(
+                df, x="Makine", y="Verim (%)", title="Makine Bazında Verim (%)"
+            )),
+            "Verim (Operatör)": lambda: chart("Verim (Operatör)", lambda: motor.grafik_verim("Operatör"), lambda df: px.bar(
+                df, x="Operatör", y="Verim (%)", title="Operatör Bazında Verim (%)"
+            )),
+            "Hurda Kodları": lambda: chart("Hurda Kodları", motor.hurda_kodlari, lambda df: px.bar(
+                df, x="Kod", y="Hurda", hover_data=["Hurda Payı (%)", "Hurda Oranı (%)"],
+                title="Hata Kodu Bazında Hurda"
+            ).update_xaxes(type="category")),
+            "Hurda Pareto": scrap_pareto_chart,
+            "Hurda Trendi": scrap_trend_chart,
+            "Hurda Sapmaları": scrap_deviation_chart,
+            "Günlük Toplamlar": daily_chart,
+            # Süre göstergeleri yalnızca Başlama/Bitiş Saati girilmiş satırlardan hesaplanır
+            "Parça/Saat": lambda: chart("Parça/Saat", lambda: motor.parca_saat("Makine"), lambda df: px.bar(
+                df, x="Makine", y="Parça/Saat", hover_data=["Üretim", "Süre (saat)"], title="Makine Bazında Saatlik Üretim"
+            )),
+            "Makine Kullanımı": lambda: chart("Kullanım", motor.makine_kullanimi, lambda df: px.bar(
+                df, x="Makine", y="Kullanım (%)", color="Vardiya", barmode="group",
+                hover_data=["Vardiya Sayısı", "Çalışma (saat)"], title="Vardiya Bazında Makine Kullanımı (%)"
+            )),
+            "Boşta Kalma": lambda: chart("Boşta Kalma", motor.bosta_kalma, lambda df: px.bar(
+                df, x="Makine", y="Toplam Boşluk (saat)", hover_data=["Boşluk Sayısı", "Ortalama Boşluk (dk)"],
+                title="İşler Arası Boşta Kalma Süresi"
+            )),
+        }
+        for sekme, ciz in zip(lazy_tabs(list(grafikler), key="grafik_sekme"), grafikler.values()):
+            if is_open(sekme):
+                with sekme:
+                    ciz()
+
+# --- 5. SEKME: ADMIN PANELİ ---
+def admin_panel():
+    with izleme.aralik("Ana Veri/yükleme"):
+        kullanicilar = kimlik.kullanicilar()
+        operatorler = motor.ana_veri_oku(OPERATOR_DOSYA, VARSAYILAN_OPERATORLER)
+        hatakodlari = motor.ana_veri_oku(HATAKOD_DOSYA, VARSAYILAN_HATAKODLARI)
+        iskodlari = motor.ana_veri_oku(ISKOD_DOSYA, VARSAYILAN_ISKODLARI)
+
+    st.header("🔑 Admin Paneli")
+    st.info("Bu panel yalnızca admin tarafından görülebilir.")
+
+    st.subheader("Kullanıcılar")
+    with st.expander("Kullanıcıları Görüntüle / Ekle / Sil / Şifre Değiştir"):
+        users = list(kullanicilar.keys())
+        st.write("Kullanıcılar:", users)
+        yeni_user = st.text_input("Yeni Kullanıcı Adı Ekle", "")
+        yeni_pass = st.text_input("Yeni Kullanıcı Şifresi", "", type="password")
+        if st.button("Kullanıcı Ekle"):
+            if yeni_user and yeni_pass:
+                kullanicilar, eklendi = kimlik.kullanici_ekle(yeni_user, yeni_pass)
+                if eklendi:
+                    st.success(f"{yeni_user} eklendi.")
+                else:
+                    st.warning("Bu kullanıcı zaten var.")
+        silinecek_user = st.selectbox("Silinecek Kullanıcı", [u for u in users if u not in ADMINS], key="kullanici_sil")
+        if st.button("Kullanıcıyı Sil"):
+            kullanicilar, silindi = kimlik.kullanici_sil(silinecek_user)
+            if silindi:
+                st.success(f"{silinecek_user} silindi.")
+        sec_user = st.selectbox("Şifresini Değiştir", users, key="sifre_degistir")
+        degis_pass = st.text_input("Yeni Şifre", "", type="password", key="degis_pass")
+        if st.button("Şifreyi Güncelle"):
+            if degis_pass:
+                # Kullanıcının diğer oturumları kapanır; şifreyi değiştiren bu oturum açık kalır
+                kullanicilar, _ = kimlik.sifre_degistir(sec_user, degis_pass, haric=st.session_state.get("oturum"))
+                st.success(f"{sec_user} şifresi güncellendi.")
+
+    st.subheader("Operatörler")
+    with st.expander("Operatörleri Görüntüle / Ekle / Sil"):
+        st.write("Operatörler:", operatorler)
+        yeni_op = st.text_input("Yeni Operatör Ekle", "")
+        if st.button("Operatör Ekle"):
+            if yeni_op:
+                operatorler, eklendi = motor.liste_ekle(OPERATOR_DOSYA, VARSAYILAN_OPERATORLER, yeni_op)
+                if eklendi:
+                    st.success(f"{yeni_op} eklendi.")
+        sil_op = st.selectbox("Silinecek Operatör", operatorler, key="op_sil")
+        if st.button("Operatörü Sil"):
+            operatorler, silindi = motor.liste_cikar(OPERATOR_DOSYA, VARSAYILAN_OPERATORLER, sil_op)
+            if silindi:
+                st.success(f"{sil_op} silindi.")
+
+    st.subheader("Hata Kodları")
+    with st.expander("Hata Kodlarını Görüntüle / Ekle / Sil"):
+        st.write("Hata Kodları:", hatakodlari)
+        yeni_hata = st.text_input("Yeni Hata Kodu Ekle", "")
+        if st.button("Hata Kodu Ekle"):
+            if yeni_hata:
+                hatakodlari, eklendi = motor.liste_ekle(HATAKOD_DOSYA, VARSAYILAN_HATAKODLARI, yeni_hata)
+                if eklendi:
+                    st.success(f"{yeni_hata} eklendi.")
+        sil_hata = st.selectbox("Silinecek Hata Kodu", hatakodlari, key="hata_sil")
+        if st.button("Hata Kodunu Sil"):
+            hatakodlari, silindi = motor.liste_cikar(HATAKOD_DOSYA, VARSAYILAN_HATAKODLARI, sil_hata)
+            if silindi:
+                st.success(f"{sil_hata} silindi.")
+
+    st.subheader("İş Kodları")
+    with st.expander("İş Kodlarını Görüntüle / Ekle / Sil"):
+        st.write("İş Kodları:", iskodlari)
+        yeni_iskod = st.text_input("Yeni İş Kodu Ekle", "")
+        if st.button("İş Kodu Ekle"):
+            if yeni_iskod:
+                iskodlari, eklendi = motor.liste_ekle(ISKOD_DOSYA, VARSAYILAN_ISKODLARI, yeni_iskod)
+                if eklendi:
+                    st.success(f"{yeni_iskod} eklendi.")
+        sil_iskod = st.selectbox("Silinecek İş Kodu", iskodlari, key="iskod_sil")
+        if st.button("İş Kodunu Sil"):
+            iskodlari, silindi = motor.liste_cikar(ISKOD_DOSYA, VARSAYILAN_ISKODLARI, sil_iskod)
+            if silindi:
+                st.success(f"{sil_iskod} silindi.")
+
+    st.subheader("Toplu İçe Aktarma")
+    with st.expander("Vardiya Tablosu Yükle (CSV / Excel / Parquet)"):
+        st.caption(
+            "Sütunlar: Tarih, Vardiya, Makine ve isteğe bağlı olarak " + ", ".join(motor.GIRIS_SUTUNLARI[1:])
+            + ". Hatalı satır varsa hiçbir vardiya eklenmez."
+        )
+        yuklenen = st.file_uploader("Dosya", type=["csv", "xlsx", "parquet"], key="toplu_dosya")
+        atla = st.checkbox("Aynı tarih ve vardiyası kayıtlı olanları atla", value=True, key="toplu_atla")
+        if yuklenen is not None:
+            try:
+                with izleme.aralik("Toplu İçe Aktarma/doğrulama"):
+                    sonuc = toplu_giris.dogrula(toplu_giris.oku(yuklenen, yuklenen.name), atla)
+            except (OSError, ValueError) as e:
+                st.error(f"Dosya okunamadı: {e}")
+            else:
+                if not sonuc["hatalar"].empty:
+                    st.error(f"{len(sonuc['hatalar'])} hata bulundu; dosyayı düzeltip yeniden yükleyin.")
+                    st.dataframe(sonuc["hatalar"], hide_index=True, use_container_width=True)
+                else:
+                    st.info(
+                        f"{sonuc['satir']} satır, {len(sonuc['raporlar'])} vardiya eklenecek"
+                        + (f", {len(sonuc['atlanan'])} vardiya zaten kayıtlı (atlanacak)." if sonuc["atlanan"] else ".")
+                    )
+                    if sonuc["raporlar"] and st.button("İçe Aktar", type="primary"):
+                        with izleme.aralik("Toplu İçe Aktarma/kayıt"):
+                            idler = motor.vardiyalar_ekle(sonuc["raporlar"])
+                        st.success(f"{len(idler)} vardiya eklendi.")
+
+    st.subheader("Arşiv")
+    with st.expander("Eski Vardiyaları Arşivle"):
+        bolumler = motor.arsiv_bolumleri()
+        if bolumler is None:
+            st.info("SQLite deposu tarih dizini kullanır; arşiv bölümü gerekmez.")
         else:
-            all_rows = []
-            for rapor in data:
-                for satir in rapor.get("satirlar", []):
-                    all_rows.append({
-                        "Tarih": rapor.get("tarih", ""),
-                        "Vardiya": rapor.get("vardiya", ""),
-                        "Makine": satir.get("Makine", ""),
-                        "Operatör": satir.get("Operatör", ""),
-                        "İş Kodu": satir.get("İş Kodu", ""),
-                        "Üretim": satir.get("Üretim", 0),
-                        "Hurda": satir.get("Hurda", 0),
-                        "Kod": satir.get("Kod", ""),
-                        "Hedef": satir.get("Hedef", 0)
-                    })
-            df_all = pd.DataFrame(all_rows)
-            grafik_sekmeleri = st.tabs([
-                "Makine Bazında Üretim/Hurda",
-                "Operatör Bazında Üretim",
-                "İş Kodu Bazında Üretim",
-                "Verim (Makine)",
-                "Verim (Operatör)",
-                "Günlük Toplamlar",
-            ])
-            with grafik_sekmeleri[0]:
-                df_group = df_all.groupby("Makine")[["Üretim", "Hurda"]].sum().reset_index()
-                st.plotly_chart(
-                    px.bar(df_group, x="Makine", y=["Üretim", "Hurda"], barmode="group", title="Makine Bazında Üretim ve Hurda"),
-                    use_container_width=True
-                )
-            with grafik_sekmeleri[1]:
-                df_op = df_all.groupby("Operatör")[["Üretim", "Hurda"]].sum().reset_index()
-                st.plotly_chart(
-                    px.bar(df_op, x="Operatör", y=["Üretim", "Hurda"], barmode="group", title="Operatör Bazında Üretim ve Hurda"),
-                    use_container_width=True
-                )
-            with grafik_sekmeleri[2]:
-                df_kod = df_all.groupby("İş Kodu")[["Üretim", "Hurda"]].sum().reset_index()
-                st.plotly_chart(
-                    px.bar(df_kod, x="İş Kodu", y=["Üretim", "Hurda"], barmode="group", title="İş Kodu Bazında Üretim ve Hurda"),
-                    use_container_width=True
-                )
-            with grafik_sekmeleri[3]:
-                df_verim = df_all.groupby("Makine").apply(
-                    lambda x: 100 * x["Üretim"].sum() / x["Hedef"].sum() if x["Hedef"].sum() else 0
-                ).reset_index(name="Verim (%)")
-                st.plotly_chart(
-                    px.bar(df_verim, x="Makine", y="Verim (%)", title="Makine Bazında Verim (%)"),
-                    use_container_width=True
-                )
-            with grafik_sekmeleri[4]:
-                df_opverim = df_all.groupby("Operatör").apply(
-                    lambda x: 100 * x["Üretim"].sum() / x["Hedef"].sum() if x["Hedef"].sum() else 0
-                ).reset_index(name="Verim (%)")
-                st.plotly_chart(
-                    px.bar(df_opverim, x="Operatör", y="Verim (%)", title="Operatör Bazında Verim (%)"),
-                    use_container_width=True
-                )
-            with grafik_sekmeleri[5]:
-                df_tarih = df_all.groupby("Tarih")[["Üretim", "Hurda"]].sum().reset_index()
-                st.plotly_chart(
-                    px.line(df_tarih, x="Tarih", y=["Üretim", "Hurda"], markers=True, title="Günlük Toplam Üretim ve Hurda"),
-                    use_container_width=True
-                )
+            if bolumler:
+                st.dataframe(pd.DataFrame(bolumler, columns=["Ay", "Vardiya"]), hide_index=True, use_container_width=True)
+            else:
+                st.caption("Henüz arşiv bölümü yok.")
+            arsiv_gun = st.number_input("Kaç günden eski vardiyalar", min_value=1, value=motor.ARSIV_GUN, step=30,
+                                        key="arsiv_gun")
+            if st.button("Arşivle"):
+                with izleme.aralik("Arşiv/taşıma"):
+                    tasinan = motor.arsivle(int(arsiv_gun))
+                st.success(f"{tasinan} vardiya arşive taşındı.")
+
+# --- 6. SEKME: PERFORMANS (yalnızca admin) ---
+def performance_panel():
+    st.header("⏱️ Performans")
+    st.info("Yüzdelikler ve sayaçlar tüm oturumları kapsar; 'Bu Çalışma' yalnızca bu sayfanın son çizimidir.")
+
+    col_calisma, col_sayac = st.columns([2,1])
+    with col_calisma:
+        st.subheader("Bu Çalışma")
+        st.dataframe(izleme.son_calisma(), hide_index=True, use_container_width=True)
+    with col_sayac:
+        st.subheader("Okuma / Yazma")
+        st.dataframe(
+            pd.DataFrame(list(izleme.sayaclar().items()), columns=["Sayaç", "Adet"]),
+            hide_index=True, use_container_width=True
+        )
 
-    # --- 5. SEKME: ADMIN PANELİ ---
-    if admin_tab:
-        with admin_tab[0]:
-            st.header("🔑 Admin Paneli")
-            st.info("Bu panel yalnızca admin tarafından görülebilir.")
-
-            st.subheader("Kullanıcılar")
-            with st.expander("Kullanıcıları Görüntüle / Ekle / Sil / Şifre Değiştir"):
-                users = list(kullanicilar.keys())
-                st.write("Kullanıcılar:", users)
-                yeni_user = st.text_input("Yeni Kullanıcı Adı Ekle", "")
-                yeni_pass = st.text_input("Yeni Kullanıcı Şifresi", "", type="password")
-                if st.button("Kullanıcı Ekle"):
-                    if yeni_user and yeni_pass:
-                        if yeni_user not in kullanicilar:
-                            kullanicilar[yeni_user] = yeni_pass
-                            save_json(KULLANICI_DOSYA, kullanicilar)
-                            st.success(f"{yeni_user} eklendi.")
-                        else:
-                            st.warning("Bu kullanıcı zaten var.")
-                silinecek_user = st.selectbox("Silinecek Kullanıcı", [u for u in users if u not in ADMINS], key="kullanici_sil")
-                if st.button("Kullanıcıyı Sil"):
-                    if silinecek_user in kullanicilar:
-                        del kullanicilar[silinecek_user]
-                        save_json(KULLANICI_DOSYA, kullanicilar)
-                        st.success(f"{silinecek_user} silindi.")
-                sec_user = st.selectbox("Şifresini Değiştir", users, key="sifre_degistir")
-                degis_pass = st.text_input("Yeni Şifre", "", type="password", key="degis_pass")
-                if st.button("Şifreyi Güncelle"):
-                    if degis_pass:
-                        kullanicilar[sec_user] = degis_pass
-                        save_json(KULLANICI_DOSYA, kullanicilar)
-                        st.success(f"{sec_user} şifresi güncellendi.")
-
-            st.subheader("Operatörler")
-            with st.expander("Operatörleri Görüntüle / Ekle / Sil"):
-                st.write("Operatörler:", operatorler)
-                yeni_op = st.text_input("Yeni Operatör Ekle", "")
-                if st.button("Operatör Ekle"):
-                    if yeni_op and yeni_op not in operatorler:
-                        operatorler.append(yeni_op)
-                        save_json(OPERATOR_DOSYA, operatorler)
-                        st.success(f"{yeni_op} eklendi.")
-                sil_op = st.selectbox("Silinecek Operatör", operatorler, key="op_sil")
-                if st.button("Operatörü Sil"):
-                    if sil_op in operatorler:
-                        operatorler.remove(sil_op)
-                        save_json(OPERATOR_DOSYA, operatorler)
-                        st.success(f"{sil_op} silindi.")
-
-            st.subheader("Hata Kodları")
-            with st.expander("Hata Kodlarını Görüntüle / Ekle / Sil"):
-                st.write("Hata Kodları:", hatakodlari)
-                yeni_hata = st.text_input("Yeni Hata Kodu Ekle", "")
-                if st.button("Hata Kodu Ekle"):
-                    if yeni_hata and yeni_hata not in hatakodlari:
-                        hatakodlari.append(yeni_hata)
-                        save_json(HATAKOD_DOSYA, hatakodlari)
-                        st.success(f"{yeni_hata} eklendi.")
-                sil_hata = st.selectbox("Silinecek Hata Kodu", hatakodlari, key="hata_sil")
-                if st.button("Hata Kodunu Sil"):
-                    if sil_hata in hatakodlari:
-                        hatakodlari.remove(sil_hata)
-                        save_json(HATAKOD_DOSYA, hatakodlari)
-                        st.success(f"{sil_hata} silindi.")
-
-            st.subheader("İş Kodları")
-            with st.expander("İş Kodlarını Görüntüle / Ekle / Sil"):
-                st.write("İş Kodları:", iskodlari)
-                yeni_iskod = st.text_input("Yeni İş Kodu Ekle", "")
-                if st.button("İş Kodu Ekle"):
-                    if yeni_iskod and yeni_iskod not in iskodlari:
-                        iskodlari.append(yeni_iskod)
-                        save_json(ISKOD_DOSYA, iskodlari)
-                        st.success(f"{yeni_iskod} eklendi.")
-                sil_iskod = st.selectbox("Silinecek İş Kodu", iskodlari, key="iskod_sil")
-                if st.button("İş Kodunu Sil"):
-                    if sil_iskod in iskodlari:
-                        iskodlari.remove(sil_iskod)
-                        save_json(ISKOD_DOSYA, iskodlari)
-                        st.success(f"{sil_iskod} silindi.")
+    st.subheader(f"Aşama Yüzdelikleri (son {izleme.PENCERE} ölçüm)")
+    st.dataframe(izleme.yuzdelikler(), hide_index=True, use_container_width=True)
+
+    acik = izleme.gunluk_dosyasi()
+    col_dosya, col_gunluk, col_sifirla = st.columns([2,1,1])
+    gunluk_dosyasi = col_dosya.text_input("JSONL Günlük Dosyası", value=acik or "izleme.jsonl")
+    if col_gunluk.button("Günlüğü Kapat" if acik else "Günlüğü Aç"):
+        izleme.gunluk(None if acik else gunluk_dosyasi.strip())
+        st.rerun()
+    if col_sifirla.button("Ölçümleri Sıfırla"):
+        izleme.sifirla()
+        st.rerun()
+    if acik:
+        st.caption(f"Her aşama {acik} dosyasına da yazılıyor.")
+
+def main_app():
+    st.set_page_config(layout="wide")
+    logo_header()
+    keep_widget_state()
+
+    sekme_ikon = [
+        "📝 Veri Girişi",
+        "📋 Kayıtlar",
+        "🔍 Raporlar & Filtreleme",
+        "📊 Grafikler"
+    ]
+    if st.session_state.get("kullanici") in ADMINS:
+        sekme_ikon += ["🔑 Admin Paneli", "⏱️ Performans"]
+    sekmeler = lazy_tabs(sekme_ikon, key="sekme")
+    # Yalnızca seçili sekmenin içeriği hesaplanır ve çizilir
+    for sekme, ciz in zip(sekmeler, [data_entry_tab, records_tab, reports_tab, charts_tab, admin_panel, performance_panel]):
+        if is_open(sekme):
+            with sekme:
+                ciz()
 
 def login_page():
-    kullanicilar = load_or_init(KULLANICI_DOSYA, VARSAYILAN_KULLANICILAR)
+    kullanicilar = kimlik.kullanicilar()
     logo_header()
     user = st.selectbox("Kullanıcı Adı", list(kullanicilar.keys()))
     pwd = st.text_input("Şifre", type="password")
     if st.button("Giriş Yap", use_container_width=True):
-        if kullanicilar.get(user) == pwd:
-            st.session_state["giris"] = True
+        belirtec = kimlik.giris(user, pwd)
+        if belirtec:
+            st.session_state["oturum"] = belirtec
             st.session_state["kullanici"] = user
             st.success(f"Hoşgeldin, {user}!")
             st.rerun()
         else:
             st.error("Kullanıcı adı veya şifre hatalı.")
 
-if "giris" not in st.session_state or not st.session_state["giris"]:
+# Oturum her çalıştırmada yalnızca bellekteki belirteçten doğrulanır (bkz. kimlik);
+# kullanıcı dosyası okunmaz. Süresi dolan ya da iptal edilen oturum giriş sayfasına döner.
+kullanici = kimlik.oturum(st.session_state.get("oturum"))
+if kullanici is None:
+    st.session_state.pop("kullanici", None)
     login_page()
 else:
-    main_app()
+    st.session_state["kullanici"] = kullanici
+    izleme.calisma_baslat()
+    start_report_worker()
+    with izleme.aralik("Sayfa/toplam"):
+        main_app()
 
 
@@ -0,0 +1,371 @@
+"""Uygulamanın arayüzden bağımsız veri motoru.
+
+Streamlit sekmelerinin kullandığı tüm veri yolu buradadır: ana veriler,
+vardiya ekleme/silme (önbellek ve ön-toplam güncellemeleriyle birlikte),
+veri girişi satırlarının normalleştirilmesi, Kayıtlar sayfalaması, olgu
+tablosu, filtreler, toplamlar, verim, süre göstergeleri, hurda analizi,
+grafik verisi ve hazır (arka planda önceden hesaplanmış) raporlar. `main.py` yalnızca bu fonksiyonları
+çağırıp sonuçları çizer; toplu işler (dışa aktarma, ölçüm) aynı kod yolunu
+Streamlit başlatmadan kullanabilir. Tüm fonksiyonlar diğer modüllerdeki gibi
+isteğe bağlı bir `dosya` (depo yolu) alır.
+"""
+from datetime import datetime
+
+import ana_veri
+import anlik
+import depo
+import grafik_veri
+import hazir_rapor
+import hurda
+import ozet
+import sorgu
+import sure
+import tablo
+import verim as _verim
+
+KULLANICI_DOSYA = "kullanicilar.json"
+OPERATOR_DOSYA = "operatorler.json"
+HATAKOD_DOSYA = "hatakodlari.json"
+ISKOD_DOSYA = "iskodlari.json"
+ARSIV_GUN = depo.ARSIV_GUN
+
+# İlk kurulum kullanıcıları; şifreler dosyaya ilk okumada özetlenerek yazılır (bkz. kimlik)
+VARSAYILAN_KULLANICILAR = {
+    "admin": "1234",
+    "Arda Ertan": "1234",
+    "Emrah Karaman": "1234",
+    "Elif Kaya": "abc1",
+    "Berk Aslan": "berk42",
+    "Zeynep Gül": "zeynep!"
+}
+VARSAYILAN_OPERATORLER = [
+    "Sercan Gür", "Salim Tanrıkulu", "Ali Sucu", "İsa Akça", "Mürsel Gümüşsoy",
+    "Yunus Kılıç", "Ş Muratoğlu", "Arda Ertan", "Furkan Ekin", "Burak Polat",
+    "Canan Gül", "Elif Yüce", "Derya Aksu", "Ece Baran", "Berk Aslan",
+    "Hüseyin Sevim", "Yusuf Uzun", "Emre Sarı", "Seda Öztürk", "Zeynep Yıldız"
+]
+VARSAYILAN_HATAKODLARI = [
+    "HT01", "HT02", "HT03", "HT04", "HT05", "HT06", "HT07", "HT08", "HT09", "HT10"
+]
+VARSAYILAN_ISKODLARI = [f"{i:03}" for i in range(1, 301)]
+
+MAKINE_SAYISI = 13
+MAKINELER = [f"T{i:02}" for i in range(1, MAKINE_SAYISI + 1)]
+GIRIS_SUTUNLARI = [
+    "Makine", "İş Kodu", "Operatör", "Başlama Saati", "Bitiş Saati",
+    "Üretim", "Hurda", "Kod", "Açıklama", "Hedef"
+]
+
+
+# --- Ana veriler ---
+# Okumalar süreç genelindeki önbellekten gelir (bkz. ana_veri); güncellemeler
+# oku-değiştir-yaz olarak tek kilit altında yapılır ve (güncel veri, değişti mi) döner.
+
+def ana_veri_oku(dosya, varsayilan):
+    return ana_veri.oku(dosya, varsayilan)
+
+
+def ana_veri_secenekleri(dosya, varsayilan):
+    return ana_veri.secenekler(dosya, varsayilan)
+
+
+def liste_ekle(dosya, varsayilan, oge):
+    def degistir(liste):
+        if oge in liste:
+            return False
+        liste.append(oge)
+        return True
+    return ana_veri.guncelle(dosya, varsayilan, degistir)
+
+
+def liste_cikar(dosya, varsayilan, oge):
+    def degistir(liste):
+        if oge not in liste:
+            return False
+        liste.remove(oge)
+        return True
+    return ana_veri.guncelle(dosya, varsayilan, degistir)
+
+
+# --- Depo ---
+
+def raporlar(dosya=depo.RAPOR_DOSYA):
+    return depo.yukle(dosya)
+
+
+def raporlari_kaydet(raporlar, dosya=depo.RAPOR_DOSYA):
+    depo.kaydet(raporlar, dosya)
+    tablo.gecersiz_kil(dosya)
+    ozet.gecersiz_kil(dosya)
+    hazir_rapor.tetikle(dosya)
+
+
+def vardiya_ekle(rapor, dosya=depo.RAPOR_DOSYA):
+    # Yalnızca yeni vardiya günlüğe eklenir; geçmiş yeniden yazılmaz.
+    # Damgalar kilit altında alınır ki başka bir terminalin yazması araya girmesin.
+    with depo.kilit(dosya):
+        onceki = depo.damga(dosya)
+        rapor_id = depo.ekle(rapor, dosya)
+        sonraki = depo.damga(dosya)
+    ozet.ekle(rapor, onceki, sonraki, dosya)
+    tablo.gecersiz_kil(dosya)
+    hazir_rapor.tetikle(dosya)
+    return rapor_id
+
+
+def vardiyalar_ekle(raporlar, dosya=depo.RAPOR_DOSYA):
+    """Birçok vardiyayı tek depo yazmasıyla ekler (toplu içe aktarma); id listesini döndürür."""
+    raporlar = [dict(rapor, id=rapor.get("id") or depo.yeni_id()) for rapor in raporlar]
+    if not raporlar:
+        return []
+    with depo.kilit(dosya):
+        onceki = depo.damga(dosya)
+        idler = depo.toplu_ekle(raporlar, dosya)
+        sonraki = depo.damga(dosya)
+    ozet.toplu_ekle(raporlar, onceki, sonraki, dosya)
+    tablo.gecersiz_kil(dosya)
+    hazir_rapor.tetikle(dosya)
+    return idler
+
+
+def vardiya_sil(rapor, dosya=depo.RAPOR_DOSYA):
+    # Silme kayıt id'si ile yapılır; başka bir terminal kaydı zaten sildiyse hiçbir şey değişmez
+    with depo.kilit(dosya):
+        onceki = depo.damga(dosya)
+        silindi = depo.sil(rapor["id"], dosya)
+        sonraki = depo.damga(dosya)
+    if silindi:
+        ozet.cikar(rapor, onceki, sonraki, dosya)
+        tablo.gecersiz_kil(dosya)
+        hazir_rapor.tetikle(dosya)
+    return silindi
+
+
+def tumunu_sil(dosya=depo.RAPOR_DOSYA):
+    depo.tumunu_sil(dosya)
+    anlik.sil(dosya)
+    hazir_rapor.sil(dosya)
+    tablo.gecersiz_kil(dosya)
+    ozet.gecersiz_kil(dosya)
+
+
+def arsivle(gun=ARSIV_GUN, dosya=depo.RAPOR_DOSYA):
+    """`gun` günden eski vardiyaları aylık arşiv bölümlerine taşır; taşınan kayıt sayısı."""
+    tasinan = depo.arsivle(gun, dosya=dosya)
+    if tasinan:
+        tablo.gecersiz_kil(dosya)
+        ozet.gecersiz_kil(dosya)
+        hazir_rapor.tetikle(dosya)
+    return tasinan
+
+
+def arsiv_bolumleri(dosya=depo.RAPOR_DOSYA):
+    """(ay, vardiya sayısı) listesi; SQLite arka ucunda arşiv bölümü olmadığından None."""
+    if depo.SQL:
+        return None
+    return [(b["ad"], len(b["idler"])) for b in depo.bolumler(dosya=dosya) if b["ad"] is not None]
+
+
+def kayit_sayisi(dosya=depo.RAPOR_DOSYA):
+    return depo.kayit_sayisi(dosya)
+
+
+def damga(dosya=depo.RAPOR_DOSYA):
+    """Deponun değişim damgası; depo her yazıldığında değişir."""
+    return depo.damga(dosya)
+
+
+# --- Veri girişi ---
+
+def bos_giris_satirlari(satir_sayisi=MAKINE_SAYISI):
+    """Veri girişi tablosunun başlangıç satırları: her makine için bir boş satır."""
+    return [{
+        "Makine": f"T{i:02}",
+        "İş Kodu": "",
+        "Operatör": "",
+        "Başlama Saati": None,
+        "Bitiş Saati": None,
+        "Üretim": 0,
+        "Hurda": 0,
+        "Kod": "",
+        "Açıklama": "",
+        "Hedef": 0
+    } for i in range(1, satir_sayisi + 1)]
+
+
+def saat_metni(t):
+    """Saat değerini (time, Timestamp ya da metin) depoda tutulan "HH:MM" biçimine çevirir."""
+    if isinstance(t, str):
+        return t
+    if t is None or t != t:  # boş hücre: None, NaN ya da NaT
+        return ""
+    try:
+        return t.strftime("%H:%M") if t else ""
+    except (AttributeError, ValueError):
+        return str(t)[:5] if t else ""
+
+
+def vardiya_raporu(tarih, vardiya, satirlar, zaman=None):
+    """Veri girişi satırlarından kaydedilecek vardiya raporu.
+
+    Saatler "HH:MM" metnine çevrilir, tamamen boş satırlar atılır. Hiç dolu
+    satır yoksa None döner. `tarih` GG-AA-YYYY metni ya da date olabilir.
+    """
+    if not isinstance(tarih, str):
+        tarih = tarih.strftime("%d-%m-%Y")
+    kayitlar = []
+    for satir in satirlar:
+        satir = dict(satir)
+        satir["Başlama Saati"] = saat_metni(satir.get("Başlama Saati"))
+        satir["Bitiş Saati"] = saat_metni(satir.get("Bitiş Saati"))
+        if any(satir.get(s) for s in GIRIS_SUTUNLARI[1:]):
+            kayitlar.append(satir)
+    if not kayitlar:
+        return None
+    return {
+        "tarih": tarih,
+        "vardiya": vardiya,
+        "zaman": zaman or datetime.now().strftime("%d-%m-%Y %H:%M"),
+        "satirlar": kayitlar,
+    }
+
+
+# --- Kayıtlar ---
+
+def kayit_gunleri(dosya=depo.RAPOR_DOSYA):
+    return sorted(g for g in depo.gunler(dosya) if g)
+
+
+def kayit_sayfasi(gun=None, sayfa=1, sayfa_boyutu=10, dosya=depo.RAPOR_DOSYA):
+    """Kayıtlar sekmesinin bir sayfası, en yeni kayıt en üstte.
+
+    Yalnızca sayfadaki vardiyalar okunur. `sayfa` geçerli aralığa çekilir;
+    {"raporlar", "toplam", "sayfa", "sayfa_sayisi"} döner.
+    """
+    idler = depo.kayit_idleri(gun, dosya)[::-1]
+    sayfa_sayisi = max(1, -(-len(idler) // sayfa_boyutu))
+    sayfa = min(max(1, sayfa), sayfa_sayisi)
+    return {
+        "raporlar": depo.getir(idler[(sayfa - 1) * sayfa_boyutu:sayfa * sayfa_boyutu], dosya),
+        "toplam": len(idler),
+        "sayfa": sayfa,
+        "sayfa_sayisi": sayfa_sayisi,
+    }
+
+
+# --- Raporlar ve Grafikler ---
+
+def olgu_tablosu(dosya=depo.RAPOR_DOSYA):
+    return tablo.olgu_tablosu(dosya)
+
+
+def tarih_araligi(dosya=depo.RAPOR_DOSYA):
+    return sorgu.tarih_araligi(dosya)
+
+
+def tarih_secimi(secim, onceki_sinir, sinir):
+    """Verinin tarih sınırları `onceki_sinir`den `sinir`e geçtiğinde tarih aralığı seçimi.
+
+    Seçim ya da önceki sınırlar yoksa sınırların kendisi döner. Eski sınırda duran uç
+    yeni sınıra taşınır; kullanıcının elle değiştirdiği uç olduğu gibi kalır.
+    """
+    if secim is None or onceki_sinir is None:
+        return sinir
+    if onceki_sinir == sinir or len(secim) != 2:
+        return tuple(secim)
+    bas, bit = (t.date() if isinstance(t, datetime) else t for t in secim)
+    return (sinir[0] if bas == onceki_sinir[0] else bas, sinir[1] if bit == onceki_sinir[1] else bit)
+
+
+def filtre_secenekleri(sutun, dosya=depo.RAPOR_DOSYA):
+    return sorgu.secenekler(sutun, dosya)
+
+
+def filtrele(tarih_bas=None, tarih_bit=None, vardiya=None, makine=None, operator=None,
+             is_kodu=None, dosya=depo.RAPOR_DOSYA):
+    return sorgu.filtrele(tarih_bas, tarih_bit, vardiya, makine, operator, is_kodu, dosya)
+
+
+def toplamlar(tarih_bas=None, tarih_bit=None, vardiya=None, makine=None, operator=None,
+              is_kodu=None, dosya=depo.RAPOR_DOSYA):
+    # Süzgeçsiz, tüm tarihleri kapsayan özet çubuğu hazır raporlardan gelir
+    if tarih_bas is not None and tarih_bit is not None and (vardiya, makine, operator, is_kodu) == (None,) * 4:
+        hazir = hazir_rapor.toplam(tarih_bas, tarih_bit, dosya)
+        if hazir is not None:
+            return hazir
+    return ozet.toplamlar(tarih_bas, tarih_bit, vardiya, makine, operator, is_kodu, dosya)
+
+
+def grup(boyut, dosya=depo.RAPOR_DOSYA):
+    """`boyut` bazında Üretim/Hurda/Hedef; arka plan işçisinin güncel sonucu varsa o, yoksa ön-toplamlar."""
+    hazir = hazir_rapor.oku(f"grup/{boyut}", dosya)
+    return ozet.grup(boyut, dosya) if hazir is None else hazir
+
+
+def verim(boyut, dosya=depo.RAPOR_DOSYA):
+    """`boyut` (Makine, Operatör, ...) bazında verim tablosu, ön-toplamlardan."""
+    hazir = hazir_rapor.oku(f"Verim/{boyut}", dosya)
+    return _verim.verim(grup(boyut, dosya), boyut) if hazir is None else hazir
+
+
+def donem_ozeti(kova, dosya=depo.RAPOR_DOSYA):
+    """Gün, Hafta ya da Ay başına Üretim/Hurda/Hedef, hurda oranı ve verim."""
+    hazir = hazir_rapor.oku(kova, dosya)
+    return hazir_rapor.donem_tablosu(grup("Tarih", dosya), kova) if hazir is None else hazir
+
+
+def hurda_kodlari(dosya=depo.RAPOR_DOSYA):
+    """Hata kodu başına hurda, toplam hurdadaki payı ve hurda oranı."""
+    hazir = hazir_rapor.oku("Kod", dosya)
+    return hazir_rapor.kod_tablosu(grup("Kod", dosya)) if hazir is None else hazir
+
+
+def hazir_rapor_zamani(dosya=depo.RAPOR_DOSYA):
+    """Güncel hazır raporların hesaplandığı an (datetime) ya da henüz yoksa None."""
+    zaman = hazir_rapor.zaman(dosya)
+    return None if zaman is None else datetime.fromtimestamp(zaman)
+
+
+# --- Süre göstergeleri (Başlama/Bitiş Saati) ---
+
+def parca_saat(boyut, dosya=depo.RAPOR_DOSYA):
+    return sure.parca_saat(boyut, dosya)
+
+
+def makine_kullanimi(dosya=depo.RAPOR_DOSYA):
+    return sure.kullanim(dosya)
+
+
+def bosta_kalma(dosya=depo.RAPOR_DOSYA):
+    return sure.bosta_kalma(dosya)
+
+
+# --- Hurda analizi ---
+
+def hurda_pareto(boyutlar=hurda.PARETO_BOYUTLARI, n=grafik_veri.ILK_N, dosya=depo.RAPOR_DOSYA):
+    return hurda.pareto(boyutlar, n, dosya)
+
+
+def hurda_trendi(tarih_bas=None, tarih_bit=None, kova=None, pencere=hurda.TREND_PENCERE, dosya=depo.RAPOR_DOSYA):
+    return hurda.trend(tarih_bas, tarih_bit, kova, pencere, dosya)
+
+
+def hurda_sapmalari(pencere=hurda.SAPMA_PENCERE, esik=hurda.SAPMA_ESIK, dosya=depo.RAPOR_DOSYA):
+    return hurda.sapmalar(pencere, esik, dosya)
+
+
+# --- Grafik verisi ---
+# Grafiklere ön-toplamların (ya da hazır raporların) küçültülmüş hali gider (bkz. grafik_veri)
+
+def grafik_grup(boyut, n=grafik_veri.ILK_N, dosya=depo.RAPOR_DOSYA):
+    """`boyut` bazında Üretim/Hurda: en büyük `n` kategori + "Diğer"."""
+    return grafik_veri.ilk_n(grup(boyut, dosya), boyut, "Üretim", n, ["Üretim", "Hurda"])
+
+
+def grafik_verim(boyut, n=grafik_veri.ILK_N, dosya=depo.RAPOR_DOSYA):
+    return grafik_veri.ilk_n_verim(grup(boyut, dosya), boyut, n)
+
+
+def zaman_serisi(tarih_bas=None, tarih_bit=None, kova=None, dosya=depo.RAPOR_DOSYA):
+    """Günlük Üretim/Hurda toplamları, aralığa göre gün/hafta/ay kovalarında (bkz. grafik_veri.kova_sec)."""
+    return grafik_veri.zaman_serisi(grup("Tarih", dosya), ["Üretim", "Hurda"], tarih_bas, tarih_bit, kova)
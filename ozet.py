@@ -0,0 +1,216 @@
+"""Panolar için artımlı ön-toplamlar (rollup).
+
+Üretim, Hurda ve Hedef toplamları gün × vardiya × makine × operatör × iş kodu
+hücrelerinde tutulur; ayrıca gün × vardiya ve tek boyutlu (Makine, Operatör,
+İş Kodu, Tarih, Kod) toplamlar ayrıca saklanır. KAYDET ile eklenen ya da "Günü Sil"
+ile silinen bir vardiya yalnızca kendi satırları kadar iş yapar; toplamlar
+geçmişin tamamı yeniden taranmadan güncellenir. Depo bu süreç dışından
+değiştiyse (damga tutmazsa) toplamlar olgu tablosundan bir kez yeniden kurulur.
+SQL arka ucunda toplamlar doğrudan veritabanında hesaplanır.
+"""
+import threading
+
+import pandas as pd
+
+import depo
+import tablo
+
+BOYUTLAR = ["Tarih", "Vardiya", "Makine", "Operatör", "İş Kodu"]
+TEKIL_BOYUTLAR = ["Tarih", "Makine", "Operatör", "İş Kodu", "Kod"]
+OLCULER = ["Üretim", "Hurda", "Hedef"]
+
+_kilit = threading.Lock()
+_durumlar = {}
+
+
+def _metin(v):
+    return "" if v is None or v != v else str(v)
+
+
+def _sayi(v):
+    # tablo.tip_ata ile aynı dönüşüm: "3.7" -> 3, okunamayan ya da NaN -> 0
+    try:
+        return int(float(v))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def _bos_durum(damga):
+    return {
+        "damga": damga,
+        # anahtar -> [Üretim, Hurda, Hedef, satır sayısı]
+        "hucre": {},
+        "gun": {},
+        "tekil": {b: {} for b in TEKIL_BOYUTLAR},
+        "cerceve": {},
+    }
+
+
+def _topla(hedef, anahtar, degerler, isaret):
+    toplam = hedef.get(anahtar)
+    if toplam is None:
+        toplam = hedef[anahtar] = [0, 0, 0, 0]
+    for i, v in enumerate(degerler):
+        toplam[i] += isaret * v
+    toplam[3] += isaret
+    if toplam[3] <= 0:
+        del hedef[anahtar]
+
+
+def _uygula(durum, rapor, isaret):
+    tarih = _metin(rapor.get("tarih", ""))
+    vardiya = _metin(rapor.get("vardiya", ""))
+    for satir in rapor.get("satirlar", []):
+        degerler = [_sayi(satir.get(o, 0)) for o in OLCULER]
+        makine = _metin(satir.get("Makine", ""))
+        operator = _metin(satir.get("Operatör", ""))
+        is_kodu = _metin(satir.get("İş Kodu", ""))
+        kod = _metin(satir.get("Kod", ""))
+        _topla(durum["hucre"], (tarih, vardiya, makine, operator, is_kodu), degerler, isaret)
+        _topla(durum["gun"], (tarih, vardiya), degerler, isaret)
+        for boyut, deger in zip(TEKIL_BOYUTLAR, (tarih, makine, operator, is_kodu, kod)):
+            _topla(durum["tekil"][boyut], deger, degerler, isaret)
+    durum["cerceve"] = {}
+
+
+def _sozluk(g):
+    return {
+        k: [int(u), int(h), int(hd), int(n)]
+        for k, u, h, hd, n in zip(g.index, g["Üretim"], g["Hurda"], g["Hedef"], g["n"])
+    }
+
+
+def _kur(dosya):
+    damga = depo.damga(dosya)
+    df = tablo.olgu_tablosu(dosya)
+    durum = _bos_durum(damga)
+    if df.empty:
+        return durum
+
+    def grupla(boyutlar):
+        g = df.groupby(boyutlar, observed=True)
+        sonuc = g[OLCULER].sum()
+        sonuc["n"] = g.size()
+        return _sozluk(sonuc)
+
+    durum["hucre"] = grupla(BOYUTLAR)
+    durum["gun"] = grupla(["Tarih", "Vardiya"])
+    for boyut in TEKIL_BOYUTLAR:
+        durum["tekil"][boyut] = grupla(boyut)
+    return durum
+
+
+def _durum(dosya):
+    # Çağıran _kilit'i tutuyor olmalı
+    durum = _durumlar.get(dosya)
+    if durum is None or durum["damga"] != depo.damga(dosya):
+        durum = _durumlar[dosya] = _kur(dosya)
+    return durum
+
+
+def _guncelle(raporlar, onceki_damga, sonraki_damga, isaret, dosya):
+    if depo.SQL:
+        return
+    with _kilit:
+        durum = _durumlar.get(dosya)
+        if durum is None or durum["damga"] != onceki_damga:
+            # Toplamlar zaten eskimiş; bir sonraki okumada yeniden kurulur
+            _durumlar.pop(dosya, None)
+            return
+        for rapor in raporlar:
+            _uygula(durum, rapor, isaret)
+        durum["damga"] = sonraki_damga
+
+
+def ekle(rapor, onceki_damga, sonraki_damga, dosya=depo.RAPOR_DOSYA):
+    """Depoya yeni eklenen vardiyayı toplamlara işler.
+
+    Damgalar yazmadan hemen önce ve hemen sonra, aynı `depo.kilit()` altında alınan
+    `depo.damga()` değerleridir; toplamlar yazmadan önceki duruma ait değilse artımlı
+    güncelleme yerine yeniden kurulum yapılır.
+    """
+    _guncelle([rapor], onceki_damga, sonraki_damga, 1, dosya)
+
+
+def toplu_ekle(raporlar, onceki_damga, sonraki_damga, dosya=depo.RAPOR_DOSYA):
+    """Tek yazmada eklenen vardiyaları toplamlara işler (bkz. `ekle`)."""
+    _guncelle(raporlar, onceki_damga, sonraki_damga, 1, dosya)
+
+
+def cikar(rapor, onceki_damga, sonraki_damga, dosya=depo.RAPOR_DOSYA):
+    """Depodan silinen vardiyayı toplamlardan düşer (bkz. `ekle`)."""
+    _guncelle([rapor], onceki_damga, sonraki_damga, -1, dosya)
+
+
+def gecersiz_kil(dosya=depo.RAPOR_DOSYA):
+    with _kilit:
+        _durumlar.pop(dosya, None)
+
+
+def _cerceve(durum, ad, kaynak, sutunlar):
+    # Sözlükten DataFrame'i sürüm başına bir kez kur
+    df = durum["cerceve"].get(ad)
+    if df is None:
+        anahtarlar = list(kaynak.keys())
+        degerler = list(kaynak.values())
+        if len(sutunlar) > 1:
+            df = pd.DataFrame(anahtarlar, columns=sutunlar)
+        else:
+            df = pd.DataFrame({sutunlar[0]: anahtarlar})
+        for i, o in enumerate(OLCULER):
+            df[o] = [d[i] for d in degerler]
+        if "Tarih" in sutunlar:
+            df["Tarih_dt"] = pd.to_datetime(df["Tarih"], format="%d-%m-%Y", errors="coerce")
+        durum["cerceve"][ad] = df
+    return df
+
+
+def grup(boyut, dosya=depo.RAPOR_DOSYA):
+    """Tek boyuta göre (Makine, Operatör, İş Kodu, Tarih, Kod) Üretim/Hurda/Hedef toplamları."""
+    if depo.SQL:
+        return depo.grup(boyut, dosya)
+    with _kilit:
+        durum = _durum(dosya)
+        df = _cerceve(durum, boyut, durum["tekil"][boyut], [boyut])
+    return df.sort_values(boyut, ignore_index=True)
+
+
+def hucreler(dosya=depo.RAPOR_DOSYA):
+    """En ince tanecikteki (gün × vardiya × makine × operatör × iş kodu) toplamlar."""
+    if depo.SQL:
+        return depo.grup(BOYUTLAR, dosya)
+    with _kilit:
+        durum = _durum(dosya)
+        return _cerceve(durum, "hucre", durum["hucre"], BOYUTLAR)
+
+
+def toplamlar(tarih_bas=None, tarih_bit=None, vardiya=None, makine=None, operator=None,
+              is_kodu=None, dosya=depo.RAPOR_DOSYA):
+    """Raporlar sekmesinin özet çubuğu: filtreye uyan toplam, gündüz ve gece üretimi ile toplam hurda.
+
+    Makine/operatör/iş kodu filtresi yoksa gün × vardiya toplamlarından (gün sayısı kadar satır)
+    hesaplanır; varsa ince tanecikli hücreler filtrelenir.
+    """
+    if depo.SQL:
+        return depo.toplamlar(tarih_bas, tarih_bit, vardiya, makine, operator, is_kodu, dosya)
+    with _kilit:
+        durum = _durum(dosya)
+        if makine is None and operator is None and is_kodu is None:
+            df = _cerceve(durum, "gun", durum["gun"], ["Tarih", "Vardiya"])
+        else:
+            df = _cerceve(durum, "hucre", durum["hucre"], BOYUTLAR)
+    maske = pd.Series(True, index=df.index)
+    if tarih_bas is not None:
+        maske &= df["Tarih_dt"] >= pd.to_datetime(tarih_bas)
+    if tarih_bit is not None:
+        maske &= df["Tarih_dt"] <= pd.to_datetime(tarih_bit)
+    for sutun, deger in (("Vardiya", vardiya), ("Makine", makine), ("Operatör", operator), ("İş Kodu", is_kodu)):
+        if deger is not None:
+            maske &= df[sutun] == deger
+    secili = df[maske]
+    return {
+        "toplam_uretim": int(secili["Üretim"].sum()),
+        "toplam_hurda": int(secili["Hurda"].sum()),
+        "gunduz_uretim": int(secili.loc[secili["Vardiya"] == "Gündüz", "Üretim"].sum()),
+        "gece_uretim": int(secili.loc[secili["Vardiya"] == "Gece", "Üretim"].sum()),
+    }
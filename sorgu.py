@@ -0,0 +1,95 @@
+"""Raporlar & Filtreleme sekmesi için dizinli sorgu katmanı.
+
+Olgu tablosu bir kez tarihe göre sıralanır; tarih aralığı ikili arama ile bir
+dilime indirgenir. Vardiya, Makine, Operatör ve İş Kodu filtreleri yalnızca bu
+dilimdeki kategori kodları üzerinde tek bir maske ile uygulanır; tablonun
+tamamı kopyalanmaz. Dizin olgu tablosu nesnesi değişene kadar saklanır.
+SQL arka ucunda aynı filtreler veritabanının dizinleriyle çalıştırılır.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import depo
+import tablo
+
+FILTRE_SUTUNLARI = ["Vardiya", "Makine", "Operatör", "İş Kodu"]
+
+_kilit = threading.Lock()
+_dizinler = {}
+
+
+def _kur(df):
+    sirali = df.sort_values("Tarih_dt", kind="stable", na_position="last", ignore_index=True)
+    tarihler = sirali["Tarih_dt"].to_numpy()
+    return {
+        "kaynak": df,
+        "tablo": sirali,
+        "tarih": tarihler,
+        # NaT'ler sonda; aramalar yalnızca geçerli tarihler üzerinde yapılır
+        "gecerli": int(sirali["Tarih_dt"].notna().sum()),
+        "kod": {s: sirali[s].cat.codes.to_numpy() for s in FILTRE_SUTUNLARI},
+        "kategori": {s: sirali[s].cat.categories for s in FILTRE_SUTUNLARI},
+    }
+
+
+def dizin(dosya=depo.RAPOR_DOSYA):
+    df = tablo.olgu_tablosu(dosya)
+    with _kilit:
+        dz = _dizinler.get(dosya)
+        if dz is None or dz["kaynak"] is not df:
+            dz = _dizinler[dosya] = _kur(df)
+        return dz
+
+
+def secenekler(sutun, dosya=depo.RAPOR_DOSYA):
+    """Filtre kutusu seçenekleri: sütundaki farklı değerler, sıralı."""
+    if depo.SQL:
+        return depo.secenekler(sutun, dosya)
+    return list(dizin(dosya)["kategori"][sutun])
+
+
+def tarih_araligi(dosya=depo.RAPOR_DOSYA):
+    if depo.SQL:
+        return depo.tarih_araligi(dosya)
+    dz = dizin(dosya)
+    if not dz["gecerli"]:
+        return None, None
+    return pd.Timestamp(dz["tarih"][0]), pd.Timestamp(dz["tarih"][dz["gecerli"] - 1])
+
+
+def filtrele(tarih_bas=None, tarih_bit=None, vardiya=None, makine=None, operator=None,
+             is_kodu=None, dosya=depo.RAPOR_DOSYA):
+    """Filtreye uyan satırlar (tarihe göre sıralı). None olan filtreler uygulanmaz."""
+    if depo.SQL:
+        return tablo.tip_ata(depo.filtrele(tarih_bas, tarih_bit, vardiya, makine, operator, is_kodu, dosya))
+    dz = dizin(dosya)
+    tarihler = dz["tarih"][:dz["gecerli"]]
+    bas, bit = 0, len(dz["tablo"])
+    if tarih_bas is not None or tarih_bit is not None:
+        # Tarih filtresi varken tarihi olmayan (NaT) satırlar dışarıda kalır
+        bit = dz["gecerli"]
+    if tarih_bas is not None:
+        bas = int(np.searchsorted(tarihler, np.datetime64(pd.Timestamp(tarih_bas)), side="left"))
+    if tarih_bit is not None:
+        bit = int(np.searchsorted(tarihler, np.datetime64(pd.Timestamp(tarih_bit)), side="right"))
+    if bit <= bas:
+        return dz["tablo"].iloc[0:0]
+
+    maske = None
+    for sutun, deger in zip(FILTRE_SUTUNLARI, (vardiya, makine, operator, is_kodu)):
+        if deger is None:
+            continue
+        kategoriler = dz["kategori"][sutun]
+        if deger not in kategoriler:
+            return dz["tablo"].iloc[0:0]
+        m = dz["kod"][sutun][bas:bit] == kategoriler.get_loc(deger)
+        maske = m if maske is None else maske & m
+    dilim = dz["tablo"].iloc[bas:bit]
+    return dilim if maske is None else dilim[maske]
+
+
+def gecersiz_kil(dosya=depo.RAPOR_DOSYA):
+    with _kilit:
+        _dizinler.pop(dosya, None)
@@ -0,0 +1,123 @@
+"""Eşzamanlı yazma stres denemesi.
+
+Birden çok iş parçacığı (ve istenirse süreç) aynı depoya paralel olarak vardiya
+ekler, kendi eklediklerinin bir kısmını siler, günlüğü sıkıştırır ve ana veri
+listesine öğe ekler. Sonunda hiçbir vardiyanın ya da liste öğesinin
+kaybolmadığı, silinenlerin geri gelmediği ve artımlı toplamların baştan
+hesaplananlarla aynı olduğu doğrulanır. Bir kayıp bulunursa çıkış kodu 1'dir.
+
+    python stres.py [--arka-uc json|sqlite] [--is-parcacigi 8] [--kayit 200] [--surec 0]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+LISTE_DOSYA = "stres_liste.json"
+
+
+def _rapor(isci, k):
+    return {
+        "tarih": f"{k % 28 + 1:02}-01-2025",
+        "vardiya": "Gündüz" if k % 2 else "Gece",
+        "zaman": "",
+        "satirlar": [{
+            "Makine": f"T{k % 13 + 1:02}", "İş Kodu": f"{k % 300 + 1:03}", "Operatör": f"İşçi {isci}",
+            "Üretim": k + 1, "Hurda": k % 3, "Kod": "", "Açıklama": "", "Hedef": 10,
+        }],
+    }
+
+
+def isci(isci_no, kayit, dizin, toplamlari_izle):
+    import depo
+    import ozet
+
+    dosya = os.path.join(dizin, depo.RAPOR_DOSYA)
+    liste = os.path.join(dizin, LISTE_DOSYA)
+    canli, silinen = [], []
+    for k in range(kayit):
+        rapor = dict(_rapor(isci_no, k), id=depo.yeni_id())
+        with depo.kilit(dosya):
+            onceki = depo.damga(dosya)
+            depo.ekle(rapor, dosya)
+            sonraki = depo.damga(dosya)
+        if toplamlari_izle:
+            ozet.ekle(rapor, onceki, sonraki, dosya)
+        canli.append(rapor)
+        if k % 5 == 4:
+            hedef = canli.pop(0)
+            with depo.kilit(dosya):
+                onceki = depo.damga(dosya)
+                silindi = depo.sil(hedef["id"], dosya)
+                sonraki = depo.damga(dosya)
+            if silindi and toplamlari_izle:
+                ozet.cikar(hedef, onceki, sonraki, dosya)
+            silinen.append(hedef["id"])
+        if k % 25 == 24:
+            depo.sikistir(dosya)
+        oge = f"{isci_no}-{k}"
+        depo.ana_veri_guncelle(liste, [], lambda l: l.append(oge) or True)
+    return [r["id"] for r in canli], silinen
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Eşzamanlı yazma stres denemesi")
+    ap.add_argument("--arka-uc", choices=["json", "sqlite"], default="json")
+    ap.add_argument("--is-parcacigi", type=int, default=8)
+    ap.add_argument("--kayit", type=int, default=200, help="işçi başına eklenecek vardiya")
+    ap.add_argument("--surec", type=int, default=0, help="ayrıca bu kadar süreç de çalıştır")
+    args = ap.parse_args()
+
+    os.environ["TDS_DEPO"] = args.arka_uc
+    dizin = tempfile.mkdtemp(prefix="tds_stres_")
+    os.environ["TDS_DB"] = os.path.join(dizin, "tds.db")
+    import depo
+    import ozet
+
+    dosya = os.path.join(dizin, depo.RAPOR_DOSYA)
+    liste = os.path.join(dizin, LISTE_DOSYA)
+    # Süreçler kendi bellek içi toplamlarını tutar; toplam karşılaştırması yalnızca tek süreçte anlamlı
+    toplamlari_izle = args.surec == 0
+    if toplamlari_izle:
+        ozet.hucreler(dosya)
+
+    isler = []
+    with ThreadPoolExecutor(args.is_parcacigi) as tp, ProcessPoolExecutor(
+        max(args.surec, 1), mp_context=multiprocessing.get_context("spawn")
+    ) as pp:
+        for i in range(args.is_parcacigi):
+            isler.append(tp.submit(isci, i, args.kayit, dizin, toplamlari_izle))
+        for i in range(args.surec):
+            isler.append(pp.submit(isci, args.is_parcacigi + i, args.kayit, dizin, False))
+        sonuclar = [f.result() for f in isler]
+
+    beklenen = {i for canli, _ in sonuclar for i in canli}
+    silinen = {i for _, sil in sonuclar for i in sil}
+    mevcut = set(depo.kayit_idleri(dosya=dosya))
+    yuklenen = {r["id"] for r in depo.yukle(dosya)}
+    liste_ogeleri = depo.ana_veri_oku(liste, [])
+    hatalar = []
+    if beklenen - mevcut:
+        hatalar.append(f"{len(beklenen - mevcut)} vardiya kayboldu")
+    if mevcut & silinen:
+        hatalar.append(f"{len(mevcut & silinen)} silinen vardiya geri geldi")
+    if mevcut != yuklenen:
+        hatalar.append("dizin ile tam yükleme farklı")
+    if len(liste_ogeleri) != len(isler) * args.kayit or len(set(liste_ogeleri)) != len(liste_ogeleri):
+        hatalar.append(f"ana veri listesinde {len(isler) * args.kayit - len(liste_ogeleri)} güncelleme kayboldu")
+    if toplamlari_izle and not depo.SQL:
+        artimli = ozet.grup("Makine", dosya)
+        ozet.gecersiz_kil(dosya)
+        if not artimli.equals(ozet.grup("Makine", dosya)):
+            hatalar.append("artımlı toplamlar baştan hesaplananlardan farklı")
+
+    print(f"{args.arka_uc}: {len(isler)} işçi × {args.kayit} vardiya, {len(mevcut)} canlı, {len(silinen)} silinen")
+    for hata in hatalar:
+        print("HATA:", hata)
+    return 1 if hatalar else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Başlama/Bitiş Saati'nden süre tabanlı göstergeler.
+
+Saatler olgu tablosunda "HH:MM" kategorileri olarak durur; dakikaya çevirme
+satır başına değil kategori başına (en fazla 1440 değer) yapılır. Bitiş
+başlamadan küçükse iş gece yarısını geçmiştir (22:00–06:00 = 8 saat).
+Başlama ve bitişi aynı, boş ya da okunamayan satırların süresi bilinmez;
+bu satırlar süre göstergelerine girmez.
+
+Hesaplanan göstergeler:
+  * parça/saat: Σ Üretim / Σ çalışma süresi (Makine, Operatör, İş Kodu bazında)
+  * makine kullanımı: vardiya başına makinenin çalıştığı süre / vardiya süresi
+  * boşta kalma: aynı vardiyada bir makinede art arda iki iş arasındaki boşluklar
+
+İşler vardiyanın başlangıcına göre sıralanır (Gece vardiyasında 01:00, 22:00'den
+sonradır). Sonuçlar olgu tablosunun her sürümü için bir kez hesaplanıp süreç
+genelinde saklanır; dönen tablolar paylaşıldığından yerinde değiştirilmemelidir.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import depo
+import tablo
+
+GUN_DK = 24 * 60
+VARDIYA_SURESI_DK = 12 * 60
+VARDIYA_BASLANGICI = {"Gündüz": 8 * 60, "Gece": 20 * 60}
+VARDIYA_ANAHTARI = ["Tarih", "Vardiya", "Makine"]
+
+_kilit = threading.Lock()
+_durumlar = {}
+
+
+def dakika(saatler):
+    """"HH:MM" serisini (kategori ya da metin) gün içindeki dakikaya çevirir; boş/geçersiz NaN."""
+    if not isinstance(saatler.dtype, pd.CategoricalDtype):
+        saatler = saatler.astype("category")
+    parcalar = pd.Series(saatler.cat.categories.astype(str)).str.extract(r"^(\d{1,2}):(\d{2})$")
+    saat = pd.to_numeric(parcalar[0], errors="coerce")
+    dk = pd.to_numeric(parcalar[1], errors="coerce")
+    degerler = (saat * 60 + dk).where((saat < 24) & (dk < 60)).to_numpy(dtype="float64")
+    kodlar = saatler.cat.codes.to_numpy()
+    sonuc = np.full(len(saatler), np.nan)
+    gecerli = kodlar >= 0
+    sonuc[gecerli] = degerler[kodlar[gecerli]]
+    return sonuc
+
+
+def _vardiya_baslangici(vardiya):
+    # Bilinmeyen vardiya adları gece yarısından başlar
+    kategoriler = vardiya.cat.categories
+    degerler = np.array([VARDIYA_BASLANGICI.get(k, 0) for k in kategoriler] + [0], dtype="float64")
+    return degerler[vardiya.cat.codes.to_numpy()]
+
+
+def isler(df):
+    """Süresi bilinen satırlar: vardiya başına göre başlangıç/bitiş dakikası ve süre (dk)."""
+    bas = dakika(df["Başlama Saati"])
+    bit = dakika(df["Bitiş Saati"])
+    sure = (bit - bas) % GUN_DK
+    sure[sure == 0] = np.nan
+    goreli = (bas - _vardiya_baslangici(df["Vardiya"])) % GUN_DK
+    gecerli = ~np.isnan(sure)
+    t = df.loc[gecerli, ["Tarih", "Vardiya", "Makine", "Operatör", "İş Kodu", "Üretim"]].reset_index(drop=True)
+    t["bas"] = goreli[gecerli]
+    t["bit"] = goreli[gecerli] + sure[gecerli]
+    t["sure"] = sure[gecerli]
+    return t
+
+
+def _vardiyalar(isler_df):
+    # Makine-vardiya başına birleşik çalışma süresi ve işler arası boşluklar (çakışan işler bir kez sayılır)
+    t = isler_df.sort_values([*VARDIYA_ANAHTARI, "bas"], ignore_index=True)
+    kod = t.groupby(VARDIYA_ANAHTARI, sort=False, observed=True).ngroup()
+    onceki_bitis = t["bit"].groupby(kod).cummax().groupby(kod).shift()
+    bosluk = (t["bas"] - onceki_bitis).clip(lower=0).fillna(0)
+    g = t.assign(bosluk=bosluk, bosluk_var=bosluk > 0).groupby(VARDIYA_ANAHTARI, sort=False, observed=True)
+    vardiya = g.agg(bas=("bas", "min"), bit=("bit", "max"), bosluk=("bosluk", "sum"),
+                    bosluk_sayisi=("bosluk_var", "sum")).reset_index()
+    calisma = vardiya["bit"] - vardiya["bas"] - vardiya["bosluk"]
+    vardiya["calisma"] = calisma.clip(upper=VARDIYA_SURESI_DK)
+    return vardiya
+
+
+def _kur(df):
+    t = isler(df)
+    return {"kaynak": df, "isler": t, "vardiya": _vardiyalar(t) if len(t) else None, "sonuc": {}}
+
+
+def _durum(dosya):
+    df = tablo.olgu_tablosu(dosya)
+    with _kilit:
+        durum = _durumlar.get(dosya)
+        if durum is None or durum["kaynak"] is not df:
+            durum = _durumlar[dosya] = _kur(df)
+        return durum
+
+
+def _bellekte(dosya, ad, hesapla):
+    durum = _durum(dosya)
+    with _kilit:
+        sonuc = durum["sonuc"].get(ad)
+        if sonuc is None:
+            sonuc = durum["sonuc"][ad] = hesapla(durum)
+        return sonuc
+
+
+def parca_saat(boyut, dosya=depo.RAPOR_DOSYA):
+    """`boyut` (Makine, Operatör, İş Kodu) bazında Üretim, çalışma süresi ve saat başına parça."""
+    def hesapla(durum):
+        g = durum["isler"].groupby(boyut, observed=True)[["Üretim", "sure"]].sum().reset_index()
+        g["Süre (saat)"] = g.pop("sure") / 60
+        g["Parça/Saat"] = np.divide(g["Üretim"], g["Süre (saat)"], out=np.zeros(len(g)),
+                                    where=g["Süre (saat)"].to_numpy() > 0)
+        return g.sort_values(boyut, ignore_index=True)
+    return _bellekte(dosya, ("parca_saat", boyut), hesapla)
+
+
+def kullanim(dosya=depo.RAPOR_DOSYA):
+    """Makine × Vardiya kullanım oranı: çalışılan süre / (kayıtlı vardiya sayısı × vardiya süresi).
+
+    Payda, o vardiya türünde süre girilmiş tüm vardiyalardır; makinenin hiç
+    çalışmadığı vardiyalar da kullanımı düşürür.
+    """
+    def hesapla(durum):
+        v = durum["vardiya"]
+        sutunlar = ["Makine", "Vardiya", "Vardiya Sayısı", "Çalışma (saat)", "Kullanım (%)"]
+        if v is None:
+            return pd.DataFrame(columns=sutunlar)
+        vardiya_sayisi = v.groupby("Vardiya", observed=True)["Tarih"].nunique()
+        g = v.groupby(["Makine", "Vardiya"], observed=True)["calisma"].sum().reset_index()
+        g["Vardiya Sayısı"] = g["Vardiya"].map(vardiya_sayisi).astype("int64")
+        g["Çalışma (saat)"] = g.pop("calisma") / 60
+        g["Kullanım (%)"] = 100 * g["Çalışma (saat)"] * 60 / (g["Vardiya Sayısı"] * VARDIYA_SURESI_DK)
+        return g[sutunlar].sort_values(["Makine", "Vardiya"], ignore_index=True)
+    return _bellekte(dosya, "kullanim", hesapla)
+
+
+def bosta_kalma(dosya=depo.RAPOR_DOSYA):
+    """Makine bazında işler arası boşluklar: sayı, toplam (saat) ve ortalama (dk)."""
+    def hesapla(durum):
+        v = durum["vardiya"]
+        sutunlar = ["Makine", "Boşluk Sayısı", "Toplam Boşluk (saat)", "Ortalama Boşluk (dk)"]
+        if v is None:
+            return pd.DataFrame(columns=sutunlar)
+        g = v.groupby("Makine", observed=True).agg(sayi=("bosluk_sayisi", "sum"), toplam=("bosluk", "sum")).reset_index()
+        g["Boşluk Sayısı"] = g.pop("sayi").astype("int64")
+        g["Toplam Boşluk (saat)"] = g["toplam"] / 60
+        g["Ortalama Boşluk (dk)"] = np.divide(g.pop("toplam"), g["Boşluk Sayısı"], out=np.zeros(len(g)),
+                                              where=g["Boşluk Sayısı"].to_numpy() > 0)
+        return g[sutunlar].sort_values("Makine", ignore_index=True)
+    return _bellekte(dosya, "bosta_kalma", hesapla)
+
+
+def gecersiz_kil(dosya=depo.RAPOR_DOSYA):
+    with _kilit:
+        _durumlar.pop(dosya, None)
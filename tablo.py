@@ -0,0 +1,167 @@
+"""Raporlar ve Grafikler sekmelerinin ortak kullandığı düzleştirilmiş olgu tablosu.
+
+Her vardiya satırı tek bir DataFrame satırına açılır. Tablo süreç genelinde bir
+kez kurulur ve deponun değişim damgasıyla anahtarlanarak önbellekte tutulur;
+yalnızca depo yazıldığında yeniden kurulur. Dönen tablo tüm oturumlarca
+paylaşıldığından çağıranlar onu yerinde değiştirmemelidir.
+
+Soğuk başlangıçta tablo depodan değil sütunlu anlık görüntüden (bkz. anlik)
+okunur. Görüntüden sonra depoya yalnızca yeni vardiyalar eklendiyse sadece
+bunlar okunup düzleştirilerek sona eklenir; kuyruk `ANLIK_YENILEME` vardiyayı aşınca,
+depo kayıtları değişmeden yeniden yazılınca (sıkıştırma, arşivleme) ya da tablo baştan
+kurulunca görüntü yeniden yazılır.
+
+Tablo baştan kurulurken JSON deposunun arşiv bölümleri (bkz. depo_json.arsivle)
+yeterince çok ve büyükse her bölüm ayrı bir süreçte okunup düzleştirilir;
+parçalar kategorileri birleştirilerek tek tabloya eklenir.
+"""
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+import anlik
+import depo
+
+# Saatler "HH:MM" metni; en fazla 1440 farklı değer aldıkları için kategori olarak tutulur
+KATEGORI_SUTUNLARI = ["Vardiya", "Makine", "İş Kodu", "Operatör", "Başlama Saati", "Bitiş Saati", "Kod"]
+SAYI_SUTUNLARI = ["Üretim", "Hurda", "Hedef"]
+SUTUNLAR = [
+    "Tarih", "Vardiya", "Makine", "İş Kodu", "Operatör", "Başlama Saati", "Bitiş Saati",
+    "Üretim", "Hurda", "Kod", "Açıklama", "Hedef"
+]
+# Saatler yalnızca süre/KPI hesapları içindir; Raporlar görünümüne ve dışa aktarımına girmez
+SAAT_SUTUNLARI = ["Başlama Saati", "Bitiş Saati"]
+RAPOR_SUTUNLARI = [s for s in SUTUNLAR if s not in SAAT_SUTUNLARI]
+
+ANLIK_YENILEME = 200
+# Süreç havuzu en az bu kadar arşiv bölümü ve toplam boyut varsa kullanılır;
+# küçük geçmişte süreç başlatma maliyeti kazançtan büyüktür
+PARALEL_BOLUM = 4
+PARALEL_BAYT = 16 * 2**20
+
+_kilit = threading.Lock()
+_onbellek = {}
+
+
+def duzlestir(raporlar):
+    # Sütun sütun liste kur; satır başına dict oluşturmaktan belirgin biçimde ucuz
+    sutunlar = {s: [] for s in SUTUNLAR}
+    for rapor in raporlar:
+        satirlar = rapor.get("satirlar", [])
+        n = len(satirlar)
+        sutunlar["Tarih"].extend([rapor.get("tarih", "")] * n)
+        sutunlar["Vardiya"].extend([rapor.get("vardiya", "")] * n)
+        for s in SUTUNLAR[2:]:
+            bos = 0 if s in SAYI_SUTUNLARI else ""
+            sutunlar[s].extend([satir.get(s, bos) for satir in satirlar])
+    return tip_ata(pd.DataFrame(sutunlar, columns=SUTUNLAR))
+
+
+def tip_ata(df):
+    for s in KATEGORI_SUTUNLARI:
+        df[s] = df[s].fillna("").astype(str).astype("category")
+    for s in SAYI_SUTUNLARI:
+        df[s] = pd.to_numeric(df[s], errors="coerce").fillna(0).astype("int32")
+    df["Tarih_dt"] = pd.to_datetime(df["Tarih"], format="%d-%m-%Y", errors="coerce")
+    return df
+
+
+def olgu_tablosu(dosya=depo.RAPOR_DOSYA):
+    anahtar = depo.damga(dosya)
+    with _kilit:
+        kayit = _onbellek.get(dosya)
+        if kayit is not None and kayit[0] == anahtar:
+            return kayit[1]
+    df = _kur(anahtar, dosya)
+    with _kilit:
+        _onbellek[dosya] = (anahtar, df)
+    return df
+
+
+def _birlestir(parcalar):
+    # Kategoriler birleştirilir; düz concat farklı kategorili sütunları object'e çevirirdi
+    parcalar = [p for p in parcalar if len(p)] or parcalar[:1]
+    sonuc = pd.concat(parcalar, ignore_index=True)
+    for s in KATEGORI_SUTUNLARI:
+        sonuc[s] = union_categoricals([p[s] for p in parcalar], ignore_order=True)
+    return sonuc
+
+
+def _ekle(df, ek):
+    return _birlestir([df, ek])
+
+
+def _bolum_tablosu(yol, idler):
+    # Süreç havuzunda çalışır: (bölümün tablosu, okunan vardiya sayısı)
+    raporlar = depo.bolum_oku(yol, idler)
+    return duzlestir(raporlar), len(raporlar)
+
+
+def _paralel_kur(dosya):
+    # Arşivli JSON deposunu bölüm başına bir süreçte kurar; koşullar tutmazsa ya da bölümler
+    # okuma sırasında değiştiyse None döner ve tablo sırayla kurulur
+    if depo.SQL or (os.cpu_count() or 1) < 2:
+        return None
+    secili = depo.bolumler(dosya=dosya)
+    arsiv = [b for b in secili if b["ad"] is not None]
+    if len(arsiv) < PARALEL_BOLUM:
+        return None
+    try:
+        if sum(os.path.getsize(b["yol"]) for b in arsiv) < PARALEL_BAYT:
+            return None
+    except OSError:
+        return None
+    # fork değil: Streamlit iş parçacıklarının tuttuğu kilitler çocuk sürece kopyalanmasın
+    baglam = multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+    try:
+        with concurrent.futures.ProcessPoolExecutor(min(os.cpu_count(), len(secili)), mp_context=baglam) as havuz:
+            sonuclar = list(havuz.map(_bolum_tablosu, [b["yol"] for b in secili], [b["idler"] for b in secili]))
+    except (OSError, RuntimeError, concurrent.futures.process.BrokenProcessPool):
+        # Süreç açılamadı (kaynak sınırı, ana modül korumasız vb.); tablo sırayla kurulur
+        return None
+    if any(adet != len(b["idler"]) for b, (_, adet) in zip(secili, sonuclar)):
+        return None
+    son = next((b["idler"][-1] for b in reversed(secili) if b["idler"]), None)
+    return _birlestir([df for df, _ in sonuclar]), sum(adet for _, adet in sonuclar), son
+
+
+def _kur(anahtar, dosya):
+    goruntu = anlik.oku(dosya) if anahtar is not None else None
+    if goruntu is not None:
+        df = goruntu["tablo"]
+        # Görüntü depoya kayıt kimliğiyle bağlıdır: depo sırasıyla ilk `kayit` vardiya değişmediyse
+        # yalnızca sonrakiler eklenmiştir. Damga tek başına yetmez; silinip yeniden oluşturulan
+        # SQLite deposunun sürüm sayacı baştan başlar.
+        idler = depo.kayit_idleri(dosya=dosya)
+        n = goruntu["kayit"]
+        if len(idler) >= n and (idler[n - 1] == goruntu["son_id"] if n else True):
+            if goruntu["damga"] == anahtar and len(idler) == n:
+                return df
+            yeniler = depo.getir(idler[n:], dosya)
+            if len(yeniler) == len(idler) - n:
+                if yeniler:
+                    df = _ekle(df, duzlestir(yeniler))
+                # Yeni vardiya yoksa depo kayıtlar değişmeden yeniden yazılmıştır (sıkıştırma,
+                # arşivleme); görüntü yeni damgayla yazılır ki sonraki açılışlar doğrudan kullansın
+                if idler and (not yeniler or len(yeniler) >= ANLIK_YENILEME):
+                    anlik.yaz(df, anahtar, len(idler), idler[-1], dosya)
+                return df
+    # Damga yüklemeden önce alınır: arada gelen bir yazma bir sonraki çağrıda yeniden kurulumu tetikler
+    kurulan = _paralel_kur(dosya)
+    if kurulan is None:
+        raporlar = depo.yukle(dosya)
+        kurulan = duzlestir(raporlar), len(raporlar), raporlar[-1]["id"] if raporlar else None
+    df, kayit, son_id = kurulan
+    # Görüntü yalnızca yükleme sırasında depo değişmediyse yazılır
+    if anahtar is not None and depo.damga(dosya) == anahtar:
+        anlik.yaz(df, anahtar, kayit, son_id, dosya)
+    return df
+
+
+def gecersiz_kil(dosya=depo.RAPOR_DOSYA):
+    with _kilit:
+        _onbellek.pop(dosya, None)
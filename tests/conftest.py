@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ana_veri  # noqa: E402
+import depo_sqlite  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def calisma_dizini(tmp_path, monkeypatch):
+    """Her test boş bir dizinde çalışır; göreli dosyalar (ör. operatorler.json, tds.db) oraya yazılır."""
+    monkeypatch.chdir(tmp_path)
+    ana_veri.gecersiz_kil()
+    yield tmp_path
+    ana_veri.gecersiz_kil()
+    # Göreli yolla açılmış SQLite bağlantıları bir sonraki testin dizinine taşınmasın
+    for con in getattr(depo_sqlite._yerel, "baglantilar", {}).values():
+        con.close()
+    depo_sqlite._yerel.baglantilar = {}
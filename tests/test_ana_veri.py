@@ -0,0 +1,43 @@
+import ana_veri
+import depo
+
+DOSYA = "operatorler.json"
+VARSAYILAN = ["Ali", "Veli"]
+
+
+def _okumalari_say(monkeypatch):
+    sayac = []
+    asil = depo.ana_veri_oku
+    monkeypatch.setattr(depo, "ana_veri_oku", lambda *a, **k: sayac.append(1) or asil(*a, **k))
+    return sayac
+
+
+def test_damga_degismedikce_depo_okunmaz(monkeypatch):
+    sayac = _okumalari_say(monkeypatch)
+    ilk = ana_veri.oku(DOSYA, VARSAYILAN)
+    assert ilk == VARSAYILAN
+    for _ in range(3):
+        assert ana_veri.oku(DOSYA, VARSAYILAN) is ilk
+    assert len(sayac) == 1
+    secenekler = ana_veri.secenekler(DOSYA, VARSAYILAN)
+    assert secenekler == ["", "Ali", "Veli"]
+    assert ana_veri.secenekler(DOSYA, VARSAYILAN) is secenekler
+
+
+def test_baska_surecin_yazmasi_gorulur():
+    ana_veri.oku(DOSYA, VARSAYILAN)
+    # Önbelleği atlayan yazma (ör. başka bir süreç): damga değişir
+    depo.ana_veri_yaz(DOSYA, ["Ayşe", "Fatma", "Zeynep"])
+    assert ana_veri.oku(DOSYA, VARSAYILAN) == ["Ayşe", "Fatma", "Zeynep"]
+    assert ana_veri.secenekler(DOSYA, VARSAYILAN) == ["", "Ayşe", "Fatma", "Zeynep"]
+
+
+def test_guncelleme_onbellege_yazilir(monkeypatch):
+    ana_veri.oku(DOSYA, VARSAYILAN)
+    veri, degisti = ana_veri.guncelle(DOSYA, VARSAYILAN, lambda l: l.append("Ayşe") or True)
+    assert degisti and veri == ["Ali", "Veli", "Ayşe"]
+
+    sayac = _okumalari_say(monkeypatch)
+    assert ana_veri.oku(DOSYA, VARSAYILAN) is veri
+    assert not sayac
+    assert ana_veri.guncelle(DOSYA, VARSAYILAN, lambda l: False) == (veri, False)
@@ -0,0 +1,110 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import anlik
+import depo
+import izleme
+import motor
+import tablo
+
+pytestmark = pytest.mark.skipif(not anlik.kullanilabilir(), reason="pyarrow kurulu değil")
+
+
+def _rapor(i, tarih="01-02-2026"):
+    return {"tarih": tarih, "vardiya": "Gündüz" if i % 2 else "Gece", "zaman": "",
+            "satirlar": [{"Makine": f"T{i % 4 + 1:02}", "Operatör": f"Op {i % 3}", "İş Kodu": f"{i:03}",
+                          "Üretim": i, "Hurda": i % 5, "Kod": "HT01" if i % 5 else "", "Hedef": 100}]}
+
+
+@pytest.fixture
+def dosya(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    for i in range(10):
+        depo.ekle(_rapor(i), dosya)
+    yield dosya
+    tablo.gecersiz_kil(dosya)
+
+
+def _soguk(dosya):
+    # Süreç yeniden başlamış gibi: bellek önbelleği boş, yalnızca disk kalır
+    tablo.gecersiz_kil(dosya)
+    return tablo.olgu_tablosu(dosya)
+
+
+def _ayni(a, b):
+    pd.testing.assert_frame_equal(a.reset_index(drop=True), b.reset_index(drop=True), check_categorical=False)
+
+
+def _bastan(dosya):
+    return tablo.duzlestir(depo.yukle(dosya))
+
+
+def test_goruntuden_soguk_baslangic(dosya):
+    ilk = tablo.olgu_tablosu(dosya)
+    assert os.path.exists(anlik.yol(dosya))
+    okuma = izleme.sayaclar().get("anlik.okuma", 0)
+    ikinci = _soguk(dosya)
+    assert izleme.sayaclar()["anlik.okuma"] == okuma + 1
+    _ayni(ikinci, ilk)
+    assert str(ikinci["Makine"].dtype) == "category"
+
+
+def test_yalnizca_yeni_vardiyalar_eklenir(dosya):
+    tablo.olgu_tablosu(dosya)
+    for i in range(10, 13):
+        depo.ekle(_rapor(i, "02-02-2026"), dosya)
+    kuyruk = _soguk(dosya)
+    _ayni(kuyruk, _bastan(dosya))
+    assert len(kuyruk) == 13 and str(kuyruk["İş Kodu"].dtype) == "category"
+
+
+def test_eski_vardiya_silinince_bastan_kurulur(dosya):
+    tablo.olgu_tablosu(dosya)
+    depo.sil(depo.yukle(dosya)[3]["id"], dosya)
+    depo.ekle(_rapor(20), dosya)
+    _ayni(_soguk(dosya), _bastan(dosya))
+
+
+def test_tumunu_sil_goruntuyu_kaldirir(dosya):
+    tablo.olgu_tablosu(dosya)
+    motor.tumunu_sil(dosya)
+    assert not os.path.exists(anlik.yol(dosya))
+    assert _soguk(dosya).empty
+
+
+def test_bozuk_goruntu_yok_sayilir(dosya):
+    tablo.olgu_tablosu(dosya)
+    with open(anlik.yol(dosya), "wb") as f:
+        f.write(b"bozuk")
+    _ayni(_soguk(dosya), _bastan(dosya))
+
+
+def test_sikistirma_ve_arsivlemeden_sonra_goruntu_yeniden_yazilir(dosya, monkeypatch):
+    tablo.olgu_tablosu(dosya)
+    depo.sil(depo.yukle(dosya)[-1]["id"], dosya)
+    depo.ekle(_rapor(20), dosya)
+    beklenen = _bastan(dosya)
+    for islem in (lambda: depo.sikistir(dosya), lambda: motor.arsivle(30, dosya)):
+        _soguk(dosya)
+        islem()
+        # Kayıtlar değişmedi: tablo baştan kurulmaz, görüntü yeni damgayla yeniden yazılır
+        with monkeypatch.context() as m:
+            m.setattr(depo, "yukle", lambda *a, **k: pytest.fail("tablo baştan kuruldu"))
+            _ayni(_soguk(dosya), beklenen)
+        assert anlik.oku(dosya)["damga"] == depo.damga(dosya)
+
+
+def test_goruntu_kayit_kimligine_baglidir(tmp_path, dosya):
+    # Aynı sayıda yazmayla kurulan başka bir depo (SQLite'ta sürüm sayacı da aynıdır)
+    baska = str(tmp_path / "baska.jsonl")
+    for i in range(10):
+        depo.ekle(_rapor(i + 100), baska)
+    tablo.olgu_tablosu(dosya)
+    shutil.copy(anlik.yol(dosya), anlik.yol(baska))
+    try:
+        _ayni(_soguk(baska), _bastan(baska))
+    finally:
+        tablo.gecersiz_kil(baska)
@@ -0,0 +1,123 @@
+import json
+import os
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+import depo
+import depo_json
+import motor
+import tablo
+
+BUGUN = date(2026, 6, 30)
+
+
+def _rapor(tarih, i):
+    return {"tarih": tarih, "vardiya": "Gündüz", "zaman": "",
+            "satirlar": [{"Makine": f"T{i % 3 + 1:02}", "Üretim": i, "Hedef": 10}]}
+
+
+@pytest.fixture
+def dosya(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    # Ocak-Mayıs, ayda iki vardiya; Nisan öncesi 90 günlük sınırın gerisinde kalır
+    for i, ay in enumerate([1, 1, 2, 2, 3, 3, 4, 4, 5, 5]):
+        depo_json.ekle(_rapor(f"{10 + i:02}-{ay:02}-2026", i), dosya)
+    depo_json.ekle(_rapor("tarihsiz", 99), dosya)
+    yield dosya
+    tablo.gecersiz_kil(dosya)
+
+
+def _satirlar(yol):
+    with open(yol, encoding="utf-8") as f:
+        return [json.loads(s) for s in f]
+
+
+def _idler(raporlar):
+    return [r["id"] for r in raporlar]
+
+
+def test_arsivle_eski_aylari_bolumlere_tasir(dosya):
+    once = depo_json.yukle(dosya)
+    assert depo_json.arsivle(90, BUGUN, dosya) == 6
+    assert depo_json.arsivle(90, BUGUN, dosya) == 0
+    assert [b["ad"] for b in depo_json.bolumler(dosya=dosya)] == ["2026-01", "2026-02", "2026-03", None]
+    assert [r["tarih"] for r in _satirlar(dosya)] == ["16-04-2026", "17-04-2026", "18-05-2026", "19-05-2026", "tarihsiz"]
+    # Arşiv okuyucuya görünmez: aynı kayıtlar, aynı sıra
+    assert depo_json.yukle(dosya) == once
+    assert depo_json.getir(_idler(once), dosya) == once
+    assert depo_json.kayit_idleri("10-01-2026", dosya) == [once[0]["id"]]
+
+
+def test_arsivdeki_vardiya_silinir_ve_sonraki_arsivlemede_bolume_uygulanir(dosya):
+    depo_json.arsivle(90, BUGUN, dosya)
+    hedef = depo_json.yukle(dosya)[2]
+    assert hedef["tarih"] == "12-02-2026"
+    assert depo_json.sil(hedef["id"], dosya)
+    assert not depo_json.sil(hedef["id"], dosya)
+    assert hedef["id"] not in _idler(depo_json.yukle(dosya))
+    assert depo_json.getir([hedef["id"]], dosya) == []
+
+    # Sıkıştırma arşiv varken silme işaretini korur
+    depo_json.sikistir(dosya)
+    assert {"sil": hedef["id"]} in _satirlar(dosya)
+    assert hedef["id"] not in _idler(depo_json.yukle(dosya))
+
+    # Yeniden arşivleme işareti bölüme uygular ve günlükten düşer
+    assert depo_json.arsivle(90, BUGUN, dosya) == 0
+    subat = os.path.join(depo_json.arsiv_dizini(dosya), "2026-02.jsonl")
+    assert _idler(_satirlar(subat)) == [r["id"] for r in depo_json.yukle_aralik(
+        datetime(2026, 2, 1), datetime(2026, 2, 28), dosya)]
+    assert hedef["id"] not in _idler(_satirlar(subat))
+    assert not any("sil" in k for k in _satirlar(dosya))
+    assert len(depo_json.yukle(dosya)) == 10
+
+
+def test_yukle_aralik_yalnizca_ortusen_bolumleri_okur(dosya, monkeypatch):
+    depo_json.arsivle(90, BUGUN, dosya)
+    depo_json.yukle(dosya)
+    okunan = []
+    asil = depo_json._oynat
+    monkeypatch.setattr(depo_json, "_oynat", lambda yol: okunan.append(os.path.basename(yol)) or asil(yol))
+    raporlar = depo_json.yukle_aralik(date(2026, 2, 12), date(2026, 3, 14), dosya)
+    assert [r["tarih"] for r in raporlar] == ["12-02-2026", "13-02-2026", "14-03-2026"]
+    assert okunan == ["2026-02.jsonl", "2026-03.jsonl", "raporlar.jsonl"]
+    assert [b["ad"] for b in depo_json.bolumler(date(2026, 4, 1), None, dosya)] == [None]
+
+
+def test_kaydet_ve_tumunu_sil_arsivi_kaldirir(dosya):
+    depo_json.arsivle(90, BUGUN, dosya)
+    depo_json.kaydet(depo_json.yukle(dosya)[:2], dosya)
+    assert not os.path.exists(depo_json.arsiv_dizini(dosya))
+    assert len(depo_json.yukle(dosya)) == 2
+    depo_json.arsivle(90, BUGUN, dosya)
+    depo_json.tumunu_sil(dosya)
+    assert not os.path.exists(depo_json.arsiv_dizini(dosya)) and depo_json.yukle(dosya) == []
+
+
+@pytest.mark.skipif(depo.SQL, reason="arşiv bölümleri yalnızca JSON arka ucunda")
+def test_paralel_kurulum(dosya, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)  # tek çekirdekli makinede de havuz denensin
+    depo_json.arsivle(90, BUGUN, dosya)
+    # Üç bölüm PARALEL_BOLUM (4) altında: süreç havuzu açılmaz
+    assert tablo._paralel_kur(dosya) is None
+    monkeypatch.setattr(tablo, "PARALEL_BOLUM", 2)
+    assert tablo._paralel_kur(dosya) is None  # PARALEL_BAYT altında
+
+    monkeypatch.setattr(tablo, "PARALEL_BAYT", 0)
+    df, kayit, son_id = tablo._paralel_kur(dosya)
+    sirali = depo_json.yukle(dosya)
+    assert (kayit, son_id) == (len(sirali), sirali[-1]["id"])
+    pd.testing.assert_frame_equal(df, tablo.duzlestir(sirali), check_categorical=False)
+    assert str(df["Makine"].dtype) == "category"
+
+
+def test_motor_arsivle_toplamlari_korur(dosya):
+    if depo.SQL:
+        assert motor.arsivle(90, dosya) == 0 and motor.arsiv_bolumleri(dosya) is None
+        return
+    once = motor.grup("Makine", dosya)
+    assert motor.arsivle((date.today() - BUGUN).days + 90, dosya) == 6
+    assert motor.arsiv_bolumleri(dosya) == [("2026-01", 2), ("2026-02", 2), ("2026-03", 2)]
+    pd.testing.assert_frame_equal(motor.grup("Makine", dosya), once)
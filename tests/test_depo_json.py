@@ -0,0 +1,150 @@
+import json
+import os
+
+import depo_json
+
+
+def _vardiya(tarih, vardiya, uretim, rapor_id=None):
+    rapor = {"tarih": tarih, "vardiya": vardiya, "zaman": f"{tarih} 08:00",
+             "satirlar": [{"Makine": "T01", "Üretim": uretim, "Hurda": 1}]}
+    if rapor_id is not None:
+        rapor["id"] = rapor_id
+    return rapor
+
+
+def _satirlar(dosya):
+    with open(dosya, encoding="utf-8") as f:
+        return [json.loads(s) for s in f if s.strip()]
+
+
+def test_ekle_ve_sil_gunluge_yazar(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    a = depo_json.ekle(_vardiya("01-02-2026", "Gündüz", 10), dosya)
+    b = depo_json.ekle(_vardiya("01-02-2026", "Gece", 20), dosya)
+    depo_json.sil(a, dosya)
+
+    assert [r["id"] for r in depo_json.yukle(dosya)] == [b]
+    # Silme yeniden yazma değil, işarettir
+    assert _satirlar(dosya)[-1] == {"sil": a}
+
+
+def test_sikistirma_olu_satirlari_atar(tmp_path, monkeypatch):
+    monkeypatch.setattr(depo_json, "SIKISTIRMA_ESIGI", 3)
+    dosya = str(tmp_path / "raporlar.jsonl")
+    idler = [depo_json.ekle(_vardiya(f"0{g}-02-2026", "Gündüz", g), dosya) for g in range(1, 6)]
+    for rapor_id in idler[:3]:
+        depo_json.sil(rapor_id, dosya)
+
+    canli = depo_json.yukle(dosya)
+
+    assert [r["id"] for r in canli] == idler[3:]
+    assert [s["id"] for s in _satirlar(dosya)] == idler[3:]
+
+
+def test_yarim_kalan_satir_atlanir(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    a = depo_json.ekle(_vardiya("01-02-2026", "Gündüz", 10), dosya)
+    with open(dosya, "a", encoding="utf-8") as f:
+        f.write('{"id": "yarim", "tarih": "02-0')
+    b = depo_json.ekle(_vardiya("02-02-2026", "Gündüz", 20), dosya)
+
+    assert [r["id"] for r in depo_json.yukle(dosya)] == [a, b]
+
+
+def test_nesne_olmayan_satir_atlanir(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    a = depo_json.ekle(_vardiya("01-02-2026", "Gündüz", 10), dosya)
+    with open(dosya, "a", encoding="utf-8") as f:
+        f.write('5\n"sil"\n[1, 2]\nnull\n')
+    b = depo_json.ekle(_vardiya("02-02-2026", "Gündüz", 20), dosya)
+
+    assert [r["id"] for r in depo_json.yukle(dosya)] == [a, b]
+    assert depo_json.kayit_idleri(dosya=dosya) == [a, b]
+    assert [r["id"] for r in depo_json.getir([a, b], dosya)] == [a, b]
+    depo_json.sikistir(dosya)
+    assert [s["id"] for s in _satirlar(dosya)] == [a, b]
+
+
+def test_kaydet_ve_tumunu_sil(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    depo_json.ekle(_vardiya("01-02-2026", "Gündüz", 10), dosya)
+    depo_json.kaydet([_vardiya("03-02-2026", "Gece", 30, "x")], dosya)
+    assert [r["id"] for r in depo_json.yukle(dosya)] == ["x"]
+
+    depo_json.tumunu_sil(dosya)
+    assert depo_json.yukle(dosya) == []
+
+
+def test_eski_dosya_gunluge_tasinir(tmp_path):
+    eski = tmp_path / "raporlar.json"
+    eski.write_text(json.dumps([_vardiya("01-02-2026", "Gündüz", 10), _vardiya("02-02-2026", "Gece", 20, "b")]),
+                    encoding="utf-8")
+    dosya = str(tmp_path / "raporlar.jsonl")
+
+    raporlar = depo_json.yukle(dosya)
+
+    assert [r["tarih"] for r in raporlar] == ["01-02-2026", "02-02-2026"]
+    assert raporlar[0]["id"] and raporlar[1]["id"] == "b"
+    assert depo_json.yukle(dosya) == raporlar
+
+
+def test_goc_izlenen_dosyaya_dokunmaz(tmp_path):
+    eski = tmp_path / "raporlar.json"
+    eski.write_text(json.dumps([_vardiya("01-02-2026", "Gündüz", 10)]), encoding="utf-8")
+    icerik = eski.read_bytes()
+    dosya = str(tmp_path / "raporlar.jsonl")
+
+    assert len(depo_json.yukle(dosya)) == 1
+    assert eski.read_bytes() == icerik
+    assert not os.path.exists(str(eski) + ".bak")
+
+    # Tümü silinince eski dosya yeniden taşınmaz
+    depo_json.tumunu_sil(dosya)
+    assert depo_json.yukle(dosya) == []
+    assert eski.read_bytes() == icerik
+
+
+def test_dizin_gunlukle_tutarli(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    idler = [depo_json.ekle(_vardiya(f"0{1 + g % 3}-02-2026", "Gündüz", g), dosya) for g in range(9)]
+    depo_json.sil(idler[4], dosya)
+    beklenen = depo_json.yukle(dosya)
+
+    assert depo_json.kayit_idleri(dosya=dosya) == [r["id"] for r in beklenen]
+    assert depo_json.kayit_idleri("02-02-2026", dosya) == [idler[1], idler[7]]
+    assert sorted(depo_json.gunler(dosya)) == ["01-02-2026", "02-02-2026", "03-02-2026"]
+    # Sayfa: yalnızca istenen kayıtlar, istenen sırayla
+    sayfa = depo_json.kayit_idleri(dosya=dosya)[::-1][:3]
+    assert depo_json.getir(sayfa, dosya) == [r for r in beklenen[::-1][:3]]
+
+
+def test_dizin_ekleme_ve_yeniden_yazmayi_izler(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    a = depo_json.ekle(_vardiya("01-02-2026", "Gündüz", 1), dosya)
+    assert depo_json.kayit_idleri(dosya=dosya) == [a]
+
+    b = depo_json.ekle(_vardiya("02-02-2026", "Gündüz", 2), dosya)
+    assert depo_json.kayit_idleri(dosya=dosya) == [a, b]
+
+    depo_json.sil(a, dosya)
+    depo_json.sikistir(dosya)
+    assert depo_json.kayit_idleri(dosya=dosya) == [b]
+    assert [r["id"] for r in depo_json.getir([a, b], dosya)] == [b]
+
+
+def test_idsiz_kayit_tutarli_kimlik_alir(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    with open(dosya, "w", encoding="utf-8") as f:
+        f.write(json.dumps(_vardiya("01-02-2026", "Gündüz", 10), ensure_ascii=False) + "\n")
+    b = depo_json.ekle(_vardiya("02-02-2026", "Gündüz", 20), dosya)
+
+    kimlik = depo_json.yukle(dosya)[0]["id"]
+    assert kimlik
+    assert depo_json.gunler(dosya) == {"01-02-2026": [kimlik], "02-02-2026": [b]}
+    assert [r["id"] for r in depo_json.getir([kimlik], dosya)] == [kimlik]
+
+    # Sıkıştırma kimliği satıra kalıcı yazar; sonraki okumalar aynı kimliği görür
+    depo_json.sikistir(dosya)
+    assert _satirlar(dosya)[0]["id"] == kimlik
+    assert depo_json.sil(kimlik, dosya)
+    assert [r["id"] for r in depo_json.yukle(dosya)] == [b]
@@ -0,0 +1,88 @@
+"""JSON ve SQLite arka uçları aynı girdiden aynı sonucu vermeli."""
+import pandas as pd
+import pytest
+
+import depo_json
+import depo_sqlite
+import tablo
+
+RAPORLAR = [
+    {"id": "a", "tarih": "01-02-2026", "vardiya": "Gündüz", "zaman": "01-02-2026 19:55", "satirlar": [
+        {"Makine": "T01", "İş Kodu": "001", "Operatör": "Ali", "Başlama Saati": "08:00", "Bitiş Saati": "12:00",
+         "Üretim": 100, "Hurda": 3, "Kod": "HT01", "Açıklama": "çapak", "Hedef": 120},
+        {"Makine": "T02", "Operatör": "Veli", "Üretim": "3.7", "Hurda": "", "Hedef": None},
+    ]},
+    {"id": "b", "tarih": "01-02-2026", "vardiya": "Gece", "zaman": "02-02-2026 07:55", "satirlar": [
+        {"Makine": "T01", "İş Kodu": "002", "Operatör": "Ali", "Başlama Saati": "22:00", "Bitiş Saati": "02:00",
+         "Üretim": 50, "Hurda": "x", "Hedef": 60},
+    ]},
+    {"id": "c", "tarih": "15-01-2026", "vardiya": "Gündüz", "zaman": "15-01-2026 19:55", "satirlar": [
+        {"Makine": "T03", "Operatör": "Ali", "Üretim": 7.9, "Hurda": 1, "Hedef": 10},
+    ]},
+]
+
+
+@pytest.fixture
+def depolar(tmp_path):
+    j, s = str(tmp_path / "raporlar.jsonl"), str(tmp_path / "tds.db")
+    for modul, dosya in ((depo_json, j), (depo_sqlite, s)):
+        for rapor in RAPORLAR:
+            modul.ekle(dict(rapor), dosya)
+    return (depo_json, j), (depo_sqlite, s)
+
+
+def _tablo(modul, dosya):
+    return tablo.duzlestir(modul.yukle(dosya)).astype(object)
+
+
+def test_okuma_ayni(depolar):
+    (jm, j), (sm, s) = depolar
+    pd.testing.assert_frame_equal(_tablo(jm, j), _tablo(sm, s))
+    assert jm.kayit_sayisi(j) == sm.kayit_sayisi(s) == 3
+    assert {t: sorted(i) for t, i in jm.gunler(j).items()} == {t: sorted(i) for t, i in sm.gunler(s).items()}
+    assert [r["id"] for r in jm.getir(["c", "a"], j)] == [r["id"] for r in sm.getir(["c", "a"], s)]
+
+
+def test_sql_toplamlari_olgu_tablosuyla_ayni(depolar):
+    (jm, j), (sm, s) = depolar
+    df = tablo.duzlestir(jm.yukle(j))
+    assert df["Üretim"].tolist() == [100, 3, 50, 7]
+    assert sm.toplamlar(dosya=s) == {
+        "toplam_uretim": int(df["Üretim"].sum()),
+        "toplam_hurda": int(df["Hurda"].sum()),
+        "gunduz_uretim": int(df.loc[df["Vardiya"] == "Gündüz", "Üretim"].sum()),
+        "gece_uretim": int(df.loc[df["Vardiya"] == "Gece", "Üretim"].sum()),
+    }
+    g = df.groupby("Makine", observed=True)[["Üretim", "Hurda", "Hedef"]].sum().reset_index()
+    assert sm.grup("Makine", s).to_dict("records") == g.astype({"Makine": object}).to_dict("records")
+    sql = tablo.tip_ata(sm.filtrele(dosya=s))
+    assert sorted(sql["Üretim"].tolist()) == sorted(df["Üretim"].tolist())
+
+
+def test_silme_ayni(depolar):
+    (jm, j), (sm, s) = depolar
+    for modul, dosya in depolar:
+        modul.sil("a", dosya)
+    pd.testing.assert_frame_equal(_tablo(jm, j), _tablo(sm, s))
+
+
+def test_ana_veri_ayni(tmp_path):
+    j, s = str(tmp_path / "operatorler.json"), str(tmp_path / "tds.db")
+    varsayilan = ["Ali", "Veli"]
+    assert depo_json.ana_veri_oku(j, varsayilan) == depo_sqlite.ana_veri_oku("operatorler.json", varsayilan, s)
+    depo_json.ana_veri_yaz(j, ["Ayşe"])
+    depo_sqlite.ana_veri_yaz("operatorler.json", ["Ayşe"], s)
+    assert depo_json.ana_veri_oku(j, varsayilan) == depo_sqlite.ana_veri_oku("operatorler.json", varsayilan, s)
+
+
+def test_bosaltilan_ana_veri_listesi_bos_kalir(tmp_path):
+    j, s = str(tmp_path / "operatorler.json"), str(tmp_path / "tds.db")
+    varsayilan = ["Ali", "Veli"]
+    assert depo_json.ana_veri_oku(j, varsayilan) == depo_sqlite.ana_veri_oku("operatorler.json", varsayilan, s)
+    depo_json.ana_veri_yaz(j, [])
+    depo_sqlite.ana_veri_yaz("operatorler.json", [], s)
+    assert depo_json.ana_veri_oku(j, varsayilan) == []
+    assert depo_sqlite.ana_veri_oku("operatorler.json", varsayilan, s) == []
+    # Diğer listeler ve kullanıcılar etkilenmez: hâlâ varsayılanla oluşur
+    assert depo_sqlite.ana_veri_oku("hatakodlari.json", ["HT01"], s) == ["HT01"]
+    assert depo_sqlite.ana_veri_oku("kullanicilar.json", {"admin": "1234"}, s) == {"admin": "1234"}
@@ -0,0 +1,73 @@
+import io
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+import depo
+import disa_aktar
+import sorgu
+import tablo
+
+
+@pytest.fixture
+def dosya(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    for i, tarih in enumerate(["09-02-2026", "01-01-2026", "17-03-2026", "tarihsiz", "01-01-2026"]):
+        depo.ekle({"tarih": tarih, "vardiya": "Gece" if i % 2 else "Gündüz", "zaman": "", "satirlar": [
+            {"Makine": f"T0{m}", "Operatör": "Ali", "İş Kodu": "001", "Üretim": 10 * i + m,
+             "Hurda": "x" if m == 2 else m, "Hedef": 100, "Başlama Saati": "08:00"}
+            for m in (1, 2, 3)
+        ]}, dosya)
+    yield dosya
+    tablo.gecersiz_kil(dosya)
+
+
+def _satirlar(df):
+    return [tuple(str(d) for d in satir) for satir in df[disa_aktar.RAPOR_SUTUNLARI].itertuples(index=False)]
+
+
+@pytest.mark.parametrize("aralik,secim", [
+    ((None, None), {}),
+    ((datetime(2026, 1, 1), datetime(2026, 2, 28)), {}),
+    ((datetime(2026, 2, 1), None), {"makine": "T02"}),
+    ((None, None), {"vardiya": "Gece"}),
+    # Raporlar sekmesi date_input'tan gelen tarihlerle ve tüm filtrelerle çağırır
+    ((date(2026, 1, 1), date(2026, 3, 17)), {"vardiya": "Gündüz", "operator": "Ali", "is_kodu": "001"}),
+])
+def test_parcalar_raporlar_filtresiyle_ayni(dosya, aralik, secim):
+    parcalar = list(disa_aktar.depodan_parcalar(*aralik, dosya=dosya, parca=2, **secim))
+    beklenen = sorgu.filtrele(*aralik, dosya=dosya, **secim)
+    assert _satirlar(pd.concat(parcalar)) == _satirlar(beklenen)
+
+
+def test_gun_ve_gecmis_sutunlari(dosya):
+    parcalar = list(disa_aktar.depodan_parcalar(gun="01-01-2026", gecmis=True, dosya=dosya))
+    df = pd.concat(parcalar)
+    assert list(df.columns) == disa_aktar.GECMIS_SUTUNLARI
+    assert len(df) == 6 and set(df["Başlama Saati"]) == {"08:00"}
+
+
+@pytest.mark.parametrize("bicim", ["csv", "xlsx", "parquet"])
+def test_bicimler_geri_okunur(dosya, bicim):
+    if bicim not in disa_aktar.bicimler():
+        pytest.skip(f"{bicim} için kütüphane kurulu değil")
+    veri = disa_aktar.bayt_olarak(disa_aktar.depodan_parcalar(dosya=dosya, parca=2), bicim)
+    okuyucu = {"csv": lambda f: pd.read_csv(f, encoding="utf-8-sig", dtype=str, keep_default_na=False),
+               "xlsx": lambda f: pd.read_excel(f, dtype=str), "parquet": pd.read_parquet}[bicim]
+    geri = okuyucu(io.BytesIO(veri))
+    assert list(geri.columns) == disa_aktar.RAPOR_SUTUNLARI
+    assert len(geri) == 15
+    assert [int(x) for x in geri["Hurda"]][:3] == [1, 0, 3]
+
+
+def test_bos_cikti_yalnizca_baslik():
+    veri = disa_aktar.bayt_olarak(iter([]), "csv")
+    assert veri.decode("utf-8-sig").strip() == ",".join(disa_aktar.RAPOR_SUTUNLARI)
+
+
+def test_saat_sutunlari_yalnizca_gecmis_ciktisinda(dosya):
+    assert not set(tablo.SAAT_SUTUNLARI) & set(disa_aktar.RAPOR_SUTUNLARI)
+    assert set(tablo.SAAT_SUTUNLARI) <= set(disa_aktar.GECMIS_SUTUNLARI)
+    baslik = disa_aktar.bayt_olarak(disa_aktar.depodan_parcalar(dosya=dosya), "csv").decode("utf-8-sig").splitlines()[0]
+    assert "Başlama Saati" not in baslik
@@ -0,0 +1,63 @@
+"""Paralel yazıcılar (iş parçacıkları ve süreçler) hiçbir güncellemeyi kaybetmemeli (bkz. stres.py)."""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+import depo_json
+import depo_sqlite
+
+ARKA_UCLAR = {"json": (depo_json, "raporlar.jsonl"), "sqlite": (depo_sqlite, "tds.db")}
+KAYIT = 30
+
+
+def _yaz(arka_uc, dizin, isci):
+    modul, ad = ARKA_UCLAR[arka_uc]
+    dosya = os.path.join(dizin, ad)
+    liste = os.path.join(dizin, "liste.json")
+    canli, silinen = [], []
+    for k in range(KAYIT):
+        rapor_id = modul.ekle({"tarih": f"{k % 28 + 1:02}-01-2026", "vardiya": "Gündüz", "zaman": "",
+                               "satirlar": [{"Makine": "T01", "Operatör": str(isci), "Üretim": k}]}, dosya)
+        canli.append(rapor_id)
+        if k % 4 == 3:
+            hedef = canli.pop(0)
+            assert modul.sil(hedef, dosya)
+            silinen.append(hedef)
+        if k % 10 == 9:
+            modul.sikistir(dosya)
+        oge = f"{isci}-{k}"
+        if arka_uc == "sqlite":
+            modul.ana_veri_guncelle(liste, [], lambda l: l.append(oge) or True, dosya)
+        else:
+            modul.ana_veri_guncelle(liste, [], lambda l: l.append(oge) or True)
+    return canli, silinen
+
+
+def _dogrula(arka_uc, dizin, sonuclar):
+    modul, ad = ARKA_UCLAR[arka_uc]
+    dosya = os.path.join(dizin, ad)
+    idler = [r["id"] for r in modul.yukle(dosya)]
+    assert len(idler) == len(set(idler))
+    assert set(idler) == {i for canli, _ in sonuclar for i in canli}
+    assert not set(idler) & {i for _, silinen in sonuclar for i in silinen}
+    liste = os.path.join(dizin, "liste.json")
+    if arka_uc == "sqlite":
+        ogeler = modul.ana_veri_oku(liste, [], dosya)
+    else:
+        ogeler = modul.ana_veri_oku(liste, [])
+    assert sorted(ogeler) == sorted(f"{i}-{k}" for i in range(len(sonuclar)) for k in range(KAYIT))
+
+
+@pytest.mark.parametrize("arka_uc", ARKA_UCLAR)
+def test_is_parcaciklari_guncelleme_kaybetmez(arka_uc, tmp_path):
+    with ThreadPoolExecutor(3) as havuz:
+        sonuclar = list(havuz.map(_yaz, [arka_uc] * 3, [str(tmp_path)] * 3, range(3)))
+    _dogrula(arka_uc, str(tmp_path), sonuclar)
+
+
+@pytest.mark.parametrize("arka_uc", ARKA_UCLAR)
+def test_surecler_guncelleme_kaybetmez(arka_uc, tmp_path):
+    with ProcessPoolExecutor(2) as havuz:
+        sonuclar = list(havuz.map(_yaz, [arka_uc] * 2, [str(tmp_path)] * 2, range(2)))
+    _dogrula(arka_uc, str(tmp_path), sonuclar)
@@ -0,0 +1,70 @@
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import grafik_veri
+import verim as verim_modulu
+
+
+@pytest.fixture
+def gunluk():
+    rnd = random.Random(11)
+    gunler = [date(2024, 1, 1) + timedelta(days=i) for i in range(900) if rnd.random() < 0.7]
+    return pd.DataFrame({
+        "Tarih": [g.strftime("%d-%m-%Y") for g in gunler] + ["tarihsiz"],
+        "Üretim": [rnd.randint(0, 500) for _ in gunler] + [999],
+        "Hurda": [rnd.randint(0, 20) for _ in gunler] + [9],
+    })
+
+
+def _elle_kovala(df, kova_basi):
+    # Naif karşılaştırma: her günün kova başlangıcı Python tarihleriyle hesaplanır
+    toplam = {}
+    for metin, uretim, hurda in df.itertuples(index=False):
+        try:
+            g = pd.Timestamp(pd.to_datetime(metin, format="%d-%m-%Y")).date()
+        except ValueError:
+            continue
+        anahtar = kova_basi(g)
+        u, h = toplam.get(anahtar, (0, 0))
+        toplam[anahtar] = (u + uretim, h + hurda)
+    return [(pd.Timestamp(k), *toplam[k]) for k in sorted(toplam)]
+
+
+@pytest.mark.parametrize("kova,kova_basi", [
+    ("Gün", lambda g: g),
+    ("Hafta", lambda g: g - timedelta(days=g.weekday())),
+    ("Ay", lambda g: g.replace(day=1)),
+])
+def test_kovalar_naif_toplamla_ayni(gunluk, kova, kova_basi):
+    sonuc = grafik_veri.zaman_serisi(gunluk, ["Üretim", "Hurda"], kova=kova)
+    assert list(sonuc.itertuples(index=False, name=None)) == _elle_kovala(gunluk, kova_basi)
+    assert sonuc["Üretim"].sum() == gunluk["Üretim"].sum() - 999
+
+
+def test_kova_araliga_gore_secilir(gunluk):
+    assert grafik_veri.kova_sec(date(2026, 1, 1), date(2026, 3, 31)) == "Gün"
+    assert grafik_veri.kova_sec(date(2024, 1, 1), date(2026, 12, 31)) == "Hafta"
+    assert grafik_veri.kova_sec(date(2000, 1, 1), date(2026, 12, 31)) == "Ay"
+    aralik = grafik_veri.zaman_serisi(gunluk, ["Üretim"], date(2024, 3, 1), date(2024, 3, 31))
+    assert len(aralik) <= 31 and aralik["Tarih"].between("2024-03-01", "2024-03-31").all()
+    assert len(grafik_veri.zaman_serisi(gunluk, ["Üretim"])) <= grafik_veri.MAKS_NOKTA
+    assert grafik_veri.zaman_serisi(gunluk, ["Üretim"], date(2030, 1, 1)).empty
+
+
+def test_ilk_n_ve_diger_toplamlari():
+    df = pd.DataFrame({"İş Kodu": [f"{i:03}" for i in range(1, 301)],
+                       "Üretim": [(i * 37) % 1000 for i in range(300)],
+                       "Hurda": [i % 7 for i in range(300)],
+                       "Hedef": [1000] * 300})
+    sonuc = grafik_veri.ilk_n(df, "İş Kodu", n=20, olculer=["Üretim", "Hurda"])
+    assert len(sonuc) == 21 and sonuc["İş Kodu"].iloc[-1] == "Diğer (280)"
+    assert sonuc["İş Kodu"].iloc[:20].tolist() == df.nlargest(20, "Üretim", keep="first")["İş Kodu"].tolist()
+    assert sonuc[["Üretim", "Hurda"]].sum().tolist() == df[["Üretim", "Hurda"]].sum().tolist()
+    assert len(grafik_veri.ilk_n(df.head(5), "İş Kodu", n=20)) == 5
+
+    verim = grafik_veri.ilk_n_verim(df, "İş Kodu", n=20)
+    diger = verim.iloc[-1]
+    assert diger[verim_modulu.VERIM_SUTUN] == pytest.approx(100 * diger["Üretim"] / diger["Hedef"])
@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import time
+
+import pandas as pd
+import pytest
+
+import depo
+import hazir_rapor
+import motor
+import ozet
+import tablo
+
+
+def _rapor(tarih, vardiya, satirlar):
+    return {"tarih": tarih, "vardiya": vardiya, "zaman": "", "satirlar": satirlar}
+
+
+@pytest.fixture
+def dosya(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    motor.vardiya_ekle(_rapor("02-02-2026", "Gündüz", [
+        {"Makine": "T01", "Operatör": "Ali", "Üretim": 90, "Hurda": 6, "Kod": "HT01", "Hedef": 100},
+        {"Makine": "T02", "Operatör": "Veli", "Üretim": 40, "Hurda": 4, "Kod": "", "Hedef": 50},
+    ]), dosya)
+    motor.vardiya_ekle(_rapor("10-02-2026", "Gece", [
+        {"Makine": "T01", "Operatör": "Veli", "Üretim": 70, "Hurda": 10, "Kod": "HT02", "Hedef": 100},
+    ]), dosya)
+    yield dosya
+    hazir_rapor.durdur(dosya)
+    hazir_rapor.sil(dosya)
+    ozet.gecersiz_kil(dosya)
+    tablo.gecersiz_kil(dosya)
+
+
+def _bekle(kosul, sure=5):
+    son = time.monotonic() + sure
+    while not kosul():
+        assert time.monotonic() < son, "işçi zamanında yazmadı"
+        time.sleep(0.02)
+
+
+def test_guncelle_dosyaya_yazar_ve_on_toplamlarla_ayni(dosya):
+    assert hazir_rapor.oku("grup/Makine", dosya) is None
+    assert hazir_rapor.guncelle(dosya)
+    assert not hazir_rapor.guncelle(dosya)
+    with open(hazir_rapor.yol(dosya), encoding="utf-8") as f:
+        icerik = json.load(f)
+    assert tuple(icerik["damga"]) == tuple(depo.damga(dosya))
+
+    # Başka bir süreç gibi: bellek boş, yalnızca dosya okunur
+    hazir_rapor._bellek.clear()
+    for boyut in hazir_rapor.GRUP_BOYUTLARI:
+        pd.testing.assert_frame_equal(hazir_rapor.oku(f"grup/{boyut}", dosya),
+                                      ozet.grup(boyut, dosya)[[boyut, *ozet.OLCULER]], check_dtype=False)
+    kod = hazir_rapor.oku("Kod", dosya)
+    assert kod[["Kod", "Hurda"]].values.tolist() == [["HT02", 10], ["HT01", 6], [hazir_rapor.KODSUZ, 4]]
+    assert kod["Hurda Payı (%)"].sum() == pytest.approx(100)
+    hafta = hazir_rapor.oku("Hafta", dosya)
+    assert hafta["Tarih"].tolist() == [pd.Timestamp("2026-02-02"), pd.Timestamp("2026-02-09")]
+    assert motor.toplamlar(*motor.tarih_araligi(dosya), dosya=dosya)["toplam_uretim"] == 200
+    assert motor.hazir_rapor_zamani(dosya) is not None
+
+
+def test_bayat_sonuc_gosterilmez(dosya):
+    hazir_rapor.guncelle(dosya)
+    motor.vardiya_ekle(_rapor("11-02-2026", "Gündüz", [{"Makine": "T03", "Üretim": 5}]), dosya)
+    assert hazir_rapor.oku("grup/Makine", dosya) is None
+    assert hazir_rapor.zaman(dosya) is None
+    # Motor ön-toplamlara düşer ve yeni vardiyayı görür
+    assert motor.grup("Makine", dosya)["Makine"].tolist() == ["T01", "T02", "T03"]
+
+    motor.tumunu_sil(dosya)
+    assert not os.path.exists(hazir_rapor.yol(dosya))
+
+
+def test_isci_kayittan_sonra_yeniden_hesaplar(dosya):
+    t = hazir_rapor.baslat(dosya, aralik=60)
+    assert hazir_rapor.baslat(dosya, aralik=60) is t
+    _bekle(lambda: hazir_rapor.oku("grup/Makine", dosya) is not None)
+
+    motor.vardiya_ekle(_rapor("12-02-2026", "Gece", [{"Makine": "T04", "Üretim": 8}]), dosya)
+    # Uzun yoklama aralığına rağmen tetik işçiyi hemen uyandırır
+    _bekle(lambda: hazir_rapor.oku("grup/Makine", dosya) is not None)
+    assert "T04" in hazir_rapor.oku("grup/Makine", dosya)["Makine"].tolist()
+
+    hazir_rapor.durdur(dosya)
+    assert not t.is_alive()
+
+
+def test_sonuc_kayit_kimligine_baglidir(tmp_path, dosya):
+    # Aynı sayıda yazmayla kurulan başka bir depo (SQLite'ta sürüm sayacı da aynıdır)
+    baska = str(tmp_path / "baska.jsonl")
+    for tarih in ("03-03-2026", "04-03-2026"):
+        motor.vardiya_ekle(_rapor(tarih, "Gece", [{"Makine": "T09", "Üretim": 1}]), baska)
+    hazir_rapor.guncelle(dosya)
+    shutil.copy(hazir_rapor.yol(dosya), hazir_rapor.yol(baska))
+    try:
+        assert hazir_rapor.oku("grup/Makine", baska) is None
+        assert hazir_rapor.guncelle(baska)
+        assert hazir_rapor.oku("grup/Makine", baska)["Makine"].tolist() == ["T09"]
+    finally:
+        hazir_rapor.sil(baska)
+        ozet.gecersiz_kil(baska)
+        tablo.gecersiz_kil(baska)
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+import hurda
+import motor
+import tablo
+
+
+def _vardiya(gun, satirlar):
+    return {"tarih": gun.strftime("%d-%m-%Y"), "vardiya": "Gündüz", "zaman": "", "satirlar": satirlar}
+
+
+@pytest.fixture
+def dosya(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    yield dosya
+    hurda.gecersiz_kil(dosya)
+    tablo.gecersiz_kil(dosya)
+
+
+def test_pareto_toplamlari_ve_diger(dosya):
+    satirlar = [{"Makine": "T01", "Kod": f"HT{k:02}", "İş Kodu": "001", "Üretim": 100, "Hurda": k,
+                 "Açıklama": "çapak" if k % 2 else ""} for k in range(1, 11)]
+    satirlar += [{"Makine": "T02", "Kod": "", "Üretim": 50, "Hurda": 7},
+                 {"Makine": "T02", "Kod": "HT10", "Üretim": 50, "Hurda": 2, "Açıklama": "kırık"},
+                 {"Makine": "T02", "Kod": "HT10", "Üretim": 50, "Hurda": 0, "Açıklama": "yok sayılır"}]
+    motor.vardiya_ekle(_vardiya(date(2026, 2, 1), satirlar), dosya)
+
+    p = motor.hurda_pareto(["Kod"], n=3, dosya=dosya)
+    assert p["Neden"].tolist() == ["HT10", "HT09", "HT08", "Diğer (8)"]
+    assert p["Hurda"].tolist() == [12, 9, 8, sum(range(1, 8)) + 7]
+    assert p["Hurda"].sum() == sum(range(1, 11)) + 9
+    assert p["Kümülatif Pay (%)"].iloc[-1] == pytest.approx(100)
+    assert p["Sık Açıklama"].tolist() == ["kırık", "çapak", "", ""]
+
+    tam = motor.hurda_pareto(["Kod", "Makine"], n=20, dosya=dosya)
+    assert len(tam) == 12 and "(Kodsuz) · T02" in tam["Neden"].tolist()
+    assert motor.hurda_pareto(["Kod", "Makine"], n=20, dosya=dosya) is tam
+
+
+def test_trend_pencere_toplamlarindan(dosya):
+    bas = date(2026, 3, 1)
+    # Günlük oranlar %50 ve ~%1; pencere oranı toplamlardan gelir, ortalamadan değil
+    motor.vardiya_ekle(_vardiya(bas, [{"Makine": "T01", "Üretim": 1, "Hurda": 1}]), dosya)
+    motor.vardiya_ekle(_vardiya(bas + timedelta(days=1), [{"Makine": "T01", "Üretim": 99, "Hurda": 1}]), dosya)
+    # Bir günlük boşluk: takvimde 0 sayılır
+    motor.vardiya_ekle(_vardiya(bas + timedelta(days=3), [{"Makine": "T02", "Üretim": 10, "Hurda": 0}]), dosya)
+
+    t = motor.hurda_trendi(kova="Gün", pencere=2, dosya=dosya).set_index(["Tarih", "Makine"])["Hurda Oranı (%)"]
+    gun = lambda i: np.datetime64(bas + timedelta(days=i))
+    assert t[(gun(1), "T01")] == pytest.approx(100 * 2 / 102)
+    assert t[(gun(2), "T01")] == pytest.approx(1.0)
+    assert (gun(3), "T01") not in t.index  # pencerede işlenen parça yok: oran bilinmez
+    assert t[(gun(3), "Tümü")] == 0
+    assert sorted(set(t.index.get_level_values("Tarih"))) == [gun(i) for i in range(4)]
+    assert motor.hurda_trendi(date(2030, 1, 1), dosya=dosya).empty
+
+
+def test_sapmalar_kendi_tabanina_gore(dosya):
+    bas = date(2026, 1, 1)
+    for i in range(40):
+        gun = bas + timedelta(days=i)
+        son = i >= 35
+        motor.vardiya_ekle(_vardiya(gun, [
+            {"Makine": "T01", "Üretim": 100, "Hurda": (20 if son else 2 + i % 3)},
+            {"Makine": "T02", "Üretim": 100, "Hurda": 3 + i % 2},
+        ] + ([{"Makine": "T03", "Üretim": 10, "Hurda": 1}] if i > 37 else [])), dosya)
+
+    s = motor.hurda_sapmalari(pencere=5, dosya=dosya).set_index("Makine")
+    assert s.loc["T01", "Durum"] == "Yüksek" and s.loc["T01", "Sapma (σ)"] > 2
+    assert s.loc["T02", "Durum"] == "Normal"
+    assert s.loc["T03", "Durum"] == "Yetersiz veri"
+    assert s.index[0] == "T01"
+    assert s.loc["T01", "Taban Gün"] == 35 and s.loc["T01", "Son Gün"] == 5
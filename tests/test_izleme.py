@@ -0,0 +1,66 @@
+import json
+import threading
+
+import pytest
+
+import ana_veri
+import izleme
+
+
+@pytest.fixture(autouse=True)
+def temiz():
+    izleme.sifirla()
+    yield
+    izleme.sifirla()
+    izleme.gunluk(None)
+
+
+def test_yuzdelikler_ve_son_calisma():
+    izleme.calisma_baslat()
+    for _ in range(5):
+        with izleme.aralik("Raporlar/filtre"):
+            pass
+    with pytest.raises(ValueError):
+        with izleme.aralik("Grafikler"):
+            raise ValueError
+    df = izleme.yuzdelikler()
+    assert df["Aşama"].tolist() == ["Grafikler", "Raporlar/filtre"]
+    assert df.set_index("Aşama").loc["Raporlar/filtre", "Ölçüm"] == 5
+    assert len(izleme.son_calisma()) == 6
+    assert izleme.calisma_suresi_ms() >= 0
+
+
+def test_son_calisma_is_parcacigina_ozel():
+    izleme.calisma_baslat()
+    with izleme.aralik("ana"):
+        pass
+
+    def diger():
+        izleme.calisma_baslat()
+        with izleme.aralik("diger"):
+            pass
+
+    t = threading.Thread(target=diger)
+    t.start()
+    t.join()
+    assert izleme.son_calisma()["Aşama"].tolist() == ["ana"]
+    assert izleme.yuzdelikler()["Aşama"].tolist() == ["ana", "diger"]
+
+
+def test_gunluk_jsonl(tmp_path):
+    dosya = str(tmp_path / "izleme.jsonl")
+    assert izleme.gunluk(dosya) == dosya
+    with izleme.aralik("Kayıtlar"):
+        pass
+    izleme.gunluk(None)
+    with izleme.aralik("Kayıtlar"):
+        pass
+    with open(dosya, encoding="utf-8") as f:
+        satirlar = [json.loads(s) for s in f]
+    assert [s["asama"] for s in satirlar] == ["Kayıtlar"]
+
+
+def test_ana_veri_onbellegi_okuma_sayacinda_gorulur():
+    for _ in range(4):
+        ana_veri.oku("operatorler.json", ["Ali"])
+    assert izleme.sayaclar().get("ana_veri.okuma", 0) <= 1
@@ -0,0 +1,54 @@
+import pytest
+
+import ana_veri
+import depo
+import kimlik
+
+DOSYA = "kullanicilar.json"
+
+
+@pytest.fixture(autouse=True)
+def hizli_ozet(monkeypatch):
+    # Testlerde düşük maliyetli parametreler; biçim ve göç yolu aynıdır
+    monkeypatch.setitem(kimlik.SCRYPT, "n", 2**4)
+    monkeypatch.setattr(kimlik, "PBKDF2_TUR", 1_000)
+
+
+def test_duz_metin_sifreler_ilk_okumada_ozetlenir():
+    depo.ana_veri_yaz(DOSYA, {"admin": "1234", "op": "abc"})
+
+    veri = kimlik.kullanicilar(DOSYA)
+
+    assert all(kimlik.ozetli_mi(k) for k in veri.values())
+    ana_veri.gecersiz_kil()
+    assert depo.ana_veri_oku(DOSYA, {}) == veri
+    assert kimlik.giris("admin", "1234", DOSYA)
+    assert kimlik.giris("admin", "yanlis", DOSYA) is None
+    assert kimlik.giris("op", "1234", DOSYA) is None
+
+
+def test_eski_parametreli_ozet_giriste_yenilenir(monkeypatch):
+    depo.ana_veri_yaz(DOSYA, {"admin": kimlik.ozetle("1234")})
+    eski = kimlik.kullanicilar(DOSYA)["admin"]
+    monkeypatch.setitem(kimlik.SCRYPT, "n", 2**5)
+    monkeypatch.setattr(kimlik, "PBKDF2_TUR", 2_000)
+    assert kimlik.eski_mi(eski)
+
+    assert kimlik.giris("admin", "1234", DOSYA)
+
+    yeni = kimlik.kullanicilar(DOSYA)["admin"]
+    assert yeni != eski and not kimlik.eski_mi(yeni)
+    assert kimlik.dogrula("1234", yeni)
+
+
+def test_sifre_degisince_diger_oturumlar_kapanir():
+    depo.ana_veri_yaz(DOSYA, {"admin": "1234"})
+    birinci = kimlik.giris("admin", "1234", DOSYA)
+    ikinci = kimlik.giris("admin", "1234", DOSYA)
+
+    kimlik.sifre_degistir("admin", "yeni", DOSYA, haric=ikinci)
+
+    assert kimlik.oturum(birinci) is None
+    assert kimlik.oturum(ikinci) == "admin"
+    assert kimlik.giris("admin", "1234", DOSYA) is None
+    assert kimlik.giris("admin", "yeni", DOSYA)
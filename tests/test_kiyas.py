@@ -0,0 +1,21 @@
+import kiyas
+
+
+def test_uret_satir_sayisi_ve_tarih_yayilimi():
+    raporlar = kiyas.uret(1_000, yil=1, tohum=5)
+    assert sum(len(r["satirlar"]) for r in raporlar) == 1_000
+    assert len(raporlar) == 730
+    assert raporlar[-1]["tarih"] == "31-12-2025" and raporlar[-1]["vardiya"] == "Gece"
+    assert raporlar[0]["tarih"] == "01-01-2025" and raporlar[0]["vardiya"] == "Gündüz"
+    # Aynı tohum aynı satırları verir (id'ler hariç)
+    ayni = kiyas.uret(1_000, yil=1, tohum=5)
+    assert [r["satirlar"] for r in ayni] == [r["satirlar"] for r in raporlar]
+    assert kiyas.uret(0) == []
+
+
+def test_kucuk_olcum_tum_asamalari_kapsar(tmp_path):
+    sonuc = kiyas.olc(60, 1, 1, str(tmp_path))
+    assert sonuc["satir"] == 60 and sonuc["vardiya"] == 60
+    assert sonuc["asamalar"]
+    for asama in sonuc["asamalar"].values():
+        assert asama["sure_s"] >= 0 and "tepe_bellek_mb" in asama
@@ -0,0 +1,56 @@
+from datetime import date, datetime, time
+
+import pandas as pd
+
+import motor
+
+
+def test_vardiya_raporu_saatleri_cevirir_bos_satirlari_atar():
+    satirlar = motor.bos_giris_satirlari(3)
+    satirlar[0].update({"Operatör": "Ali", "Başlama Saati": time(8, 0), "Bitiş Saati": pd.Timestamp("2026-01-01 20:30")})
+    satirlar[2].update({"Üretim": 5, "Başlama Saati": float("nan"), "Bitiş Saati": "07:45"})
+    rapor = motor.vardiya_raporu(date(2026, 1, 31), "Gece", satirlar, zaman="31-01-2026 20:00")
+    assert rapor["tarih"] == "31-01-2026" and rapor["zaman"] == "31-01-2026 20:00"
+    assert [s["Makine"] for s in rapor["satirlar"]] == ["T01", "T03"]
+    assert [(s["Başlama Saati"], s["Bitiş Saati"]) for s in rapor["satirlar"]] == [("08:00", "20:30"), ("", "07:45")]
+    assert motor.vardiya_raporu("31-01-2026", "Gece", motor.bos_giris_satirlari()) is None
+
+
+def test_liste_ekle_cikar():
+    assert motor.liste_ekle(motor.OPERATOR_DOSYA, ["Ali"], "Veli") == (["Ali", "Veli"], True)
+    assert motor.liste_ekle(motor.OPERATOR_DOSYA, ["Ali"], "Veli") == (["Ali", "Veli"], False)
+    assert motor.liste_cikar(motor.OPERATOR_DOSYA, ["Ali"], "Ali") == (["Veli"], True)
+    assert motor.ana_veri_secenekleri(motor.OPERATOR_DOSYA, ["Ali"]) == ["", "Veli"]
+
+
+def test_kayit_sayfasi_en_yeni_ustte(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    for i in range(23):
+        motor.vardiya_ekle({"tarih": f"{i % 3 + 1:02}-01-2026", "vardiya": "Gündüz", "zaman": str(i),
+                            "satirlar": [{"Makine": "T01", "Üretim": i}]}, dosya)
+    sayfa = motor.kayit_sayfasi(sayfa=9, dosya=dosya)
+    assert (sayfa["sayfa"], sayfa["sayfa_sayisi"], sayfa["toplam"]) == (3, 3, 23)
+    assert [r["zaman"] for r in sayfa["raporlar"]] == ["2", "1", "0"]
+    gun = motor.kayit_sayfasi("02-01-2026", dosya=dosya)
+    assert gun["toplam"] == 8 and gun["raporlar"][0]["zaman"] == "22"
+    assert motor.kayit_gunleri(dosya) == ["01-01-2026", "02-01-2026", "03-01-2026"]
+    assert motor.verim("Makine", dosya)["Makine"].tolist() == ["T01"]
+
+
+def test_tarih_secimi_sinirlari_izler():
+    ilk = (date(2026, 1, 1), date(2026, 1, 31))
+    assert motor.tarih_secimi(None, None, ilk) == ilk
+    assert motor.tarih_secimi(ilk, None, ilk) == ilk
+    # Daha yeni tarihli vardiya: sınırdaki bitiş yeni sınıra taşınır
+    yeni = (date(2026, 1, 1), date(2026, 2, 5))
+    assert motor.tarih_secimi(ilk, ilk, yeni) == yeni
+    # datetime olarak tutulan seçim de (ör. ilk varsayılan) karşılaştırılır
+    assert motor.tarih_secimi((datetime(2026, 1, 1), datetime(2026, 1, 31)), ilk, yeni) == yeni
+    # Elle daraltılan uç korunur, sınırdaki uç genişler
+    daraltilmis = (date(2026, 1, 10), date(2026, 1, 31))
+    genis = (date(2025, 12, 1), date(2026, 2, 5))
+    assert motor.tarih_secimi(daraltilmis, ilk, genis) == (date(2026, 1, 10), date(2026, 2, 5))
+    assert motor.tarih_secimi((date(2026, 1, 1), date(2026, 1, 20)), ilk, genis) == (date(2025, 12, 1), date(2026, 1, 20))
+    # Sınırlar değişmediyse ya da seçim yarım kaldıysa dokunulmaz
+    assert motor.tarih_secimi(daraltilmis, ilk, ilk) == daraltilmis
+    assert motor.tarih_secimi((date(2026, 1, 10),), ilk, yeni) == (date(2026, 1, 10),)
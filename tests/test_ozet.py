@@ -0,0 +1,72 @@
+"""Kayıt/silme ile artımlı güncellenen ön-toplamlar baştan kurulanlarla aynı olmalı."""
+import pandas as pd
+import pytest
+
+import depo
+import motor
+import ozet
+import tablo
+
+
+def _rapor(tarih, vardiya, satirlar):
+    return {"id": depo.yeni_id(), "tarih": tarih, "vardiya": vardiya, "zaman": f"{tarih} 08:00",
+            "satirlar": satirlar}
+
+
+def _ekle(rapor, dosya):
+    # Uygulamadaki KAYDET yolu
+    motor.vardiya_ekle(rapor, dosya)
+
+
+def _sil(rapor, dosya):
+    motor.vardiya_sil(rapor, dosya)
+
+
+def _toplamlar(dosya):
+    tum = {
+        boyut: ozet.grup(boyut, dosya).astype({boyut: object}).to_dict("records")
+        for boyut in ozet.TEKIL_BOYUTLAR
+    }
+    # Hücrelerin sırası artımlı güncellemede ekleme sırasıdır; içerik karşılaştırılır
+    tum["hucre"] = ozet.hucreler(dosya).sort_values(ozet.BOYUTLAR, ignore_index=True).to_dict("records")
+    tum["toplam"] = ozet.toplamlar(dosya=dosya)
+    tum["süzgeçli"] = ozet.toplamlar(pd.Timestamp(2026, 2, 1), pd.Timestamp(2026, 2, 1), makine="T01", dosya=dosya)
+    return tum
+
+
+@pytest.fixture
+def dosya(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    ilk = _rapor("31-01-2026", "Gece", [{"Makine": "T01", "Operatör": "Ali", "Üretim": 40}])
+    _ekle(ilk, dosya)
+    # Toplamlar kurulur; sonraki yazmalar artımlı işlenir
+    ozet.toplamlar(dosya=dosya)
+    yield dosya
+    ozet.gecersiz_kil(dosya)
+    tablo.gecersiz_kil(dosya)
+
+
+def test_artimli_ve_yeniden_kurulan_ayni(dosya):
+    _ekle(_rapor("01-02-2026", "Gündüz", [
+        {"Makine": "T01", "Operatör": "Ali", "İş Kodu": "001", "Üretim": "3.7", "Hurda": "2", "Kod": "HT01"},
+        {"Makine": "T02", "Operatör": "Veli", "Üretim": 12.9, "Hurda": "x", "Hedef": "15"},
+    ]), dosya)
+    _ekle(_rapor("01-02-2026", "Gece", [{"Makine": "T01", "Operatör": "Veli", "Üretim": 5, "Hedef": 8}]), dosya)
+    _ekle(_rapor("02-02-2026", "Gündüz", [{"Makine": "T03", "Operatör": "Ali", "Üretim": "", "Hurda": 4}]), dosya)
+    _sil(depo.yukle(dosya)[0], dosya)
+    artimli = _toplamlar(dosya)
+
+    ozet.gecersiz_kil(dosya)
+    tablo.gecersiz_kil(dosya)
+    assert _toplamlar(dosya) == artimli
+
+    df = tablo.olgu_tablosu(dosya)
+    assert artimli["toplam"]["toplam_uretim"] == int(df["Üretim"].sum()) == 3 + 12 + 5
+    assert artimli["toplam"]["toplam_hurda"] == int(df["Hurda"].sum()) == 2 + 4
+    assert artimli["süzgeçli"]["toplam_uretim"] == 3 + 5
+
+
+def test_disaridan_yazma_toplamlari_yeniden_kurar(dosya):
+    # Damgayı bilmeyen bir yazma (ör. başka terminal) artımlı güncellemeye karışmaz
+    depo.ekle(_rapor("03-02-2026", "Gündüz", [{"Makine": "T02", "Üretim": 7}]), dosya)
+    assert ozet.toplamlar(dosya=dosya)["toplam_uretim"] == 40 + 7
@@ -0,0 +1,62 @@
+import itertools
+import random
+
+import pandas as pd
+import pytest
+
+import depo
+import sorgu
+import tablo
+
+
+@pytest.fixture
+def dosya(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    rnd = random.Random(3)
+    gunler = [f"{g:02}-{a:02}-2026" for a in (1, 2, 3) for g in (1, 9, 17, 28)]
+    # Karışık sırada eklenir; sorgu tarihe göre sıralı dizin kullanmalı
+    for tarih in rnd.sample(gunler, len(gunler)) + ["tarihsiz"]:
+        for vardiya in ("Gündüz", "Gece"):
+            depo.ekle({"tarih": tarih, "vardiya": vardiya, "zaman": "", "satirlar": [
+                {"Makine": rnd.choice(["T01", "T02", "T03"]), "Operatör": rnd.choice(["Ali", "Veli"]),
+                 "İş Kodu": rnd.choice(["001", "002"]), "Üretim": rnd.randint(0, 99), "Hedef": 100}
+                for _ in range(3)
+            ]}, dosya)
+    yield dosya
+    tablo.gecersiz_kil(dosya)
+
+
+def _eski_filtre(df, tarih_bas, tarih_bit, vardiya, makine, operator, is_kodu):
+    # Önceki tam tablo taraması
+    maske = pd.Series(True, index=df.index)
+    if tarih_bas is not None:
+        maske &= df["Tarih_dt"] >= pd.Timestamp(tarih_bas)
+    if tarih_bit is not None:
+        maske &= df["Tarih_dt"] <= pd.Timestamp(tarih_bit)
+    for sutun, deger in zip(sorgu.FILTRE_SUTUNLARI, (vardiya, makine, operator, is_kodu)):
+        if deger is not None:
+            maske &= df[sutun] == deger
+    return df[maske].sort_values("Tarih_dt", kind="stable", na_position="last")
+
+
+def _satirlar(df):
+    return df.drop(columns="Tarih_dt").astype(object).to_dict("records")
+
+
+def test_tam_taramayla_ayni(dosya):
+    df = tablo.olgu_tablosu(dosya)
+    araliklar = [(None, None), ("2026-01-09", "2026-02-09"), ("2026-02-10", None), (None, "2026-01-01"),
+                 ("2026-03-29", "2026-04-30"), ("2026-02-09", "2026-01-09")]
+    for (bas, bit), vardiya, makine in itertools.product(araliklar, (None, "Gece"), (None, "T02", "T99")):
+        beklenen = _eski_filtre(df, bas, bit, vardiya, makine, None, None)
+        assert _satirlar(sorgu.filtrele(bas, bit, vardiya, makine, dosya=dosya)) == _satirlar(beklenen)
+    beklenen = _eski_filtre(df, "2026-01-01", "2026-03-28", None, None, "Ali", "002")
+    assert _satirlar(sorgu.filtrele("2026-01-01", "2026-03-28", operator="Ali", is_kodu="002", dosya=dosya)) \
+        == _satirlar(beklenen)
+
+
+def test_tarih_araligi_ve_secenekler(dosya):
+    assert sorgu.tarih_araligi(dosya) == (pd.Timestamp(2026, 1, 1), pd.Timestamp(2026, 3, 28))
+    assert sorgu.secenekler("Vardiya", dosya) == ["Gece", "Gündüz"]
+    # Tarih süzgeci yokken tarihi okunamayan vardiyalar da gelir
+    assert len(sorgu.filtrele(dosya=dosya)) == len(tablo.olgu_tablosu(dosya))
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+import motor
+import sure
+import tablo
+
+
+def _tablo(satirlar):
+    df = pd.DataFrame(satirlar, columns=["Tarih", "Vardiya", "Makine", "Operatör", "İş Kodu",
+                                         "Başlama Saati", "Bitiş Saati", "Üretim"])
+    for s in ["Vardiya", "Makine", "Operatör", "İş Kodu", "Başlama Saati", "Bitiş Saati"]:
+        df[s] = df[s].astype("category")
+    return df
+
+
+def test_dakika_gecersiz_saatleri_atar():
+    saatler = pd.Series(["08:00", "23:59", "24:00", "7:5", "", "ab:cd"])
+    np.testing.assert_array_equal(sure.dakika(saatler), [480, 1439, np.nan, np.nan, np.nan, np.nan])
+
+
+def test_gece_yarisini_gecen_is():
+    t = sure.isler(_tablo([
+        ["01-02-2026", "Gece", "T01", "Ali", "001", "22:00", "06:00", 80],
+        ["01-02-2026", "Gece", "T02", "Ali", "001", "01:00", "03:30", 20],
+        ["01-02-2026", "Gündüz", "T01", "Veli", "002", "08:00", "12:00", 40],
+    ]))
+    assert t["sure"].tolist() == [8 * 60, 150, 4 * 60]
+    # Gece vardiyasında 01:00, 20:00 başlangıcından 5 saat sonradır
+    assert t["bas"].tolist() == [120, 300, 0]
+    assert t["bit"].tolist() == [600, 450, 240]
+
+
+def test_suresi_bilinmeyen_satirlar_dusulur():
+    t = sure.isler(_tablo([
+        ["01-02-2026", "Gündüz", "T01", "Ali", "001", "08:00", "08:00", 10],
+        ["01-02-2026", "Gündüz", "T01", "Ali", "001", "", "12:00", 10],
+        ["01-02-2026", "Gündüz", "T01", "Ali", "001", "09:00", "10:30", 10],
+    ]))
+    assert t["sure"].tolist() == [90]
+
+
+def test_gostergeler_depodan(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    for tarih in ("01-02-2026", "02-02-2026"):
+        motor.vardiya_ekle({"tarih": tarih, "vardiya": "Gündüz", "zaman": "", "satirlar": [
+            {"Makine": "T01", "Operatör": "Ali", "İş Kodu": "001", "Başlama Saati": "08:00",
+             "Bitiş Saati": "12:00", "Üretim": 400},
+            {"Makine": "T01", "Operatör": "Veli", "İş Kodu": "002", "Başlama Saati": "13:00",
+             "Bitiş Saati": "20:00", "Üretim": 700},
+            {"Makine": "T02", "Operatör": "Ali", "İş Kodu": "001", "Üretim": 50},
+        ]}, dosya)
+    try:
+        ps = motor.parca_saat("Operatör", dosya).set_index("Operatör")
+        assert ps.loc["Ali", "Üretim"] == 800 and ps.loc["Ali", "Süre (saat)"] == 8
+        assert ps.loc["Veli", "Parça/Saat"] == 100
+
+        kullanim = motor.makine_kullanimi(dosya)
+        assert kullanim[["Makine", "Vardiya", "Vardiya Sayısı"]].values.tolist() == [["T01", "Gündüz", 2]]
+        assert kullanim["Kullanım (%)"].iloc[0] == 100 * 11 / 12
+
+        bosluk = motor.bosta_kalma(dosya).iloc[0]
+        assert (bosluk["Boşluk Sayısı"], bosluk["Toplam Boşluk (saat)"], bosluk["Ortalama Boşluk (dk)"]) == (2, 2, 60)
+        # Aynı tablo sürümü için sonuçlar saklanır
+        assert motor.bosta_kalma(dosya) is motor.bosta_kalma(dosya)
+    finally:
+        sure.gecersiz_kil(dosya)
+        tablo.gecersiz_kil(dosya)
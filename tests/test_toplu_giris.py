@@ -0,0 +1,118 @@
+import io
+from datetime import date, datetime, time
+
+import pandas as pd
+import pytest
+
+import depo
+import izleme
+import motor
+import ozet
+import toplu_giris
+
+BASLIK = "Tarih;Vardiya;Makine;Is Kodu;Operator;Baslama Saati;Bitis Saati;Uretim;Hurda;Kod;Aciklama;Hedef\n"
+
+
+def _csv(tmp_path, satirlar, ad="vardiyalar.csv"):
+    yol = tmp_path / ad
+    yol.write_text(BASLIK + "".join(s + "\n" for s in satirlar), encoding="utf-8")
+    return str(yol)
+
+
+@pytest.fixture
+def dosya(tmp_path):
+    dosya = str(tmp_path / "raporlar.jsonl")
+    yield dosya
+    ozet.gecersiz_kil(dosya)
+
+
+def test_vardiyalar_tek_yazmayla_eklenir(tmp_path, dosya):
+    kaynak = _csv(tmp_path, [
+        "01.02.2026;gunduz;t1;7;Ali Sucu;8.00;20:00;100;2;ht01;;120",
+        "01.02.2026;Gündüz;T02;001;Canan Gül;08:00;20:00;90;0;;;100",
+        "2026-02-01;GECE;T3;002;Ali Sucu;20:00;08:00;50;;;;60",
+    ])
+    ozet.toplamlar(dosya=dosya)
+    yazma = izleme.sayaclar().get("depo.yazma", 0)
+    sonuc = toplu_giris.ice_aktar(kaynak, dosya=dosya)
+    assert sonuc["hatalar"].empty and sonuc["eklenen"] == 2 and sonuc["satir"] == 3
+    assert izleme.sayaclar()["depo.yazma"] == yazma + 1
+
+    raporlar = {(r["tarih"], r["vardiya"]): r for r in depo.yukle(dosya)}
+    gunduz = raporlar[("01-02-2026", "Gündüz")]["satirlar"]
+    assert [(s["Makine"], s["İş Kodu"], s["Başlama Saati"], s["Kod"]) for s in gunduz] == [
+        ("T01", "007", "08:00", "HT01"), ("T02", "001", "08:00", "")]
+    toplam = ozet.toplamlar(dosya=dosya)
+    assert (toplam["toplam_uretim"], toplam["gece_uretim"]) == (240, 50)
+
+
+def test_hatali_satir_varsa_hicbir_sey_yazilmaz(tmp_path, dosya):
+    kaynak = _csv(tmp_path, [
+        "01-02-2026;Gündüz;T01;001;Ali Sucu;08:00;20:00;100;0;;;120",
+        "32-02-2026;Öğle;T99;001;Kimse;25:00;20:00;-1;x;HT99;;120",
+    ])
+    sonuc = toplu_giris.ice_aktar(kaynak, dosya=dosya)
+    assert sonuc["eklenen"] == 0 and motor.kayit_sayisi(dosya) == 0
+    assert set(sonuc["hatalar"]["Sütun"]) == {
+        "Tarih", "Vardiya", "Makine", "Operatör", "Kod", "Başlama Saati", "Üretim", "Hurda"}
+    assert set(sonuc["hatalar"]["Satır"]) == {"3"}
+
+
+def test_mevcut_vardiyalar_atlanir(tmp_path, dosya):
+    kaynak = _csv(tmp_path, ["01-02-2026;Gündüz;T01;001;Ali Sucu;08:00;20:00;100;0;;;120"])
+    assert toplu_giris.ice_aktar(kaynak, dosya=dosya)["eklenen"] == 1
+    tekrar = toplu_giris.ice_aktar(kaynak, dosya=dosya)
+    assert tekrar["eklenen"] == 0 and tekrar["atlanan"] == [("01-02-2026", "Gündüz")]
+    assert toplu_giris.ice_aktar(kaynak, mevcutlari_atla=False, dosya=dosya)["eklenen"] == 1
+    assert motor.kayit_sayisi(dosya) == 2
+
+
+def test_zorunlu_sutun_eksik():
+    sonuc = toplu_giris.dogrula(pd.DataFrame({"Tarih": ["01-02-2026"], "Makine": ["T01"]}))
+    assert sonuc["hatalar"].to_dict("records") == [{"Satır": "-", "Sütun": "Vardiya", "Hata": "Zorunlu sütun yok"}]
+
+
+def test_excel_sayfalari_okunur(tmp_path, dosya):
+    yol = tmp_path / "vardiyalar.xlsx"
+    with pd.ExcelWriter(yol) as yazici:
+        for sayfa in ("Şubat", "Mart"):
+            pd.DataFrame({"Tarih": ["01-02-2026" if sayfa == "Şubat" else "01-03-2026"], "Vardiya": ["Gece"],
+                          "Makine": ["T05"], "İş Kodu": ["001"], "Üretim": [5]}).to_excel(yazici, sheet_name=sayfa, index=False)
+    sonuc = toplu_giris.ice_aktar(str(yol), dosya=dosya)
+    assert sonuc["eklenen"] == 2
+    with pytest.raises(ValueError):
+        toplu_giris.oku(io.BytesIO(b""), "vardiyalar.pdf")
+
+
+def test_liste_degerleri_harf_duyarsiz_eslenir(tmp_path, dosya):
+    motor.liste_ekle(motor.HATAKOD_DOSYA, motor.VARSAYILAN_HATAKODLARI, "Kalıp-Çizik")
+    motor.liste_ekle(motor.ISKOD_DOSYA, motor.VARSAYILAN_ISKODLARI, "A-12")
+    kaynak = _csv(tmp_path, [
+        "01-02-2026;Gündüz;T01;a-12;ALİ SUCU;08:00;20:00;100;2;kalıp-çizik;;120",
+        "01-02-2026;Gündüz;T02;001;canan gül;08:00;20:00;90;1;ht03;;100",
+    ])
+    sonuc = toplu_giris.ice_aktar(kaynak, dosya=dosya)
+    assert sonuc["hatalar"].empty, sonuc["hatalar"]
+    satirlar = depo.yukle(dosya)[0]["satirlar"]
+    # Kayda listedeki yazım girer
+    assert [(s["İş Kodu"], s["Operatör"], s["Kod"]) for s in satirlar] == [
+        ("A-12", "Ali Sucu", "Kalıp-Çizik"), ("001", "Canan Gül", "HT03")]
+
+
+def test_excel_saat_hucreleri(dosya):
+    saatler = [time(8, 30), datetime(2026, 2, 1, 20, 0), 0.5, 0.3541666666666667, 7, 8.0, "6.15"]
+    df = pd.DataFrame({"Tarih": ["01-02-2026"] * len(saatler), "Vardiya": ["Gündüz"] * len(saatler),
+                       "Makine": ["T01"] * len(saatler), "İş Kodu": ["001"] * len(saatler),
+                       "Başlama Saati": pd.Series(saatler, dtype=object)})
+    sonuc = toplu_giris.dogrula(df, dosya=dosya)
+    assert sonuc["hatalar"].empty, sonuc["hatalar"]
+    satirlar = sonuc["raporlar"][0]["satirlar"]
+    assert [s["Başlama Saati"] for s in satirlar] == ["08:30", "20:00", "12:00", "08:30", "07:00", "08:00", "06:15"]
+
+
+@pytest.mark.parametrize("deger", [1.5, -0.25, 24, True, date(2026, 2, 1), "25:00"])
+def test_gecersiz_saat_satir_hatasi(deger, dosya):
+    df = pd.DataFrame({"Tarih": ["01-02-2026"], "Vardiya": ["Gündüz"], "Makine": ["T01"], "İş Kodu": ["001"],
+                       "Bitiş Saati": pd.Series([deger], dtype=object)})
+    hatalar = toplu_giris.dogrula(df, dosya=dosya)["hatalar"]
+    assert hatalar["Sütun"].tolist() == ["Bitiş Saati"]
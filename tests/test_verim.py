@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+import verim
+
+
+def _eski_verim(df, boyut):
+    # Önceki grup başına Python hesabı; yeni hesap bununla aynı sayıları vermeli
+    return df.groupby(boyut, observed=True).apply(
+        lambda x: 100 * x["Üretim"].sum() / x["Hedef"].sum() if x["Hedef"].sum() else 0
+    ).reset_index(name=verim.VERIM_SUTUN)
+
+
+def _tablo(n=500, tohum=7):
+    rnd = np.random.default_rng(tohum)
+    df = pd.DataFrame({
+        "Makine": rnd.choice([f"T{i:02}" for i in range(1, 9)], n),
+        "Operatör": rnd.choice(["Ali", "Veli", "Ayşe", "Fatma"], n),
+        "Üretim": rnd.integers(0, 200, n),
+        "Hedef": rnd.integers(0, 220, n),
+    })
+    # T08'in hedefi hiç girilmemiş: verim 0
+    df.loc[df["Makine"] == "T08", "Hedef"] = 0
+    return df.astype({"Makine": "category", "Operatör": "category"})
+
+
+def test_eski_hesapla_ayni():
+    df = _tablo()
+    for boyut in ("Makine", "Operatör"):
+        yeni = verim.verim(df, boyut)
+        eski = _eski_verim(df, boyut)
+        assert yeni[boyut].astype(str).tolist() == eski[boyut].astype(str).tolist()
+        np.testing.assert_allclose(yeni[verim.VERIM_SUTUN], eski[verim.VERIM_SUTUN])
+    assert verim.verim(df, "Makine").set_index("Makine").loc["T08", verim.VERIM_SUTUN] == 0
+
+
+def test_on_toplamlardan_ayni_sonuc():
+    df = _tablo()
+    on_toplam = df.groupby(["Makine", "Operatör"], observed=True)[["Üretim", "Hedef"]].sum().reset_index()
+    pd.testing.assert_frame_equal(verim.verim(on_toplam, "Makine"), verim.verim(df, "Makine"))
+
+
+def test_bos_tablo():
+    bos = verim.verim(_tablo().iloc[0:0], ["Makine", "Operatör"])
+    assert bos.empty
+    assert list(bos.columns) == ["Makine", "Operatör", "Üretim", "Hedef", verim.VERIM_SUTUN]
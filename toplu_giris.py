@@ -0,0 +1,281 @@
+"""Vardiya tablolarının (CSV / Excel / Parquet) toplu içe aktarılması.
+
+Eski Excel/CSV vardiya tabloları ve makine sayaç dökümleri satır başına
+Tarih, Vardiya ve Veri Girişi tablosunun sütunlarını (Makine, İş Kodu,
+Operatör, saatler, Üretim, Hurda, Kod, Açıklama, Hedef) taşır; eksik sütunlar
+boş kabul edilir. Satırlar operatör, iş kodu ve hata kodu listelerine göre
+doğrulanır (büyük/küçük harf duyarsız; listedeki yazım saklanır), saatler
+Veri Girişi'ndeki gibi "HH:MM" metnine çevrilir ve
+(Tarih, Vardiya) başına bir vardiya raporu kurulur. Tüm vardiyalar tek bir
+depo yazmasıyla (SQLite'ta tek işlem) eklenir. Dosyada tek bir hatalı satır
+bile varsa hiçbir şey yazılmaz.
+
+`python disa_aktar.py ... --gecmis` çıktısı da bu biçimdedir; geri yüklenebilir.
+
+    python toplu_giris.py vardiyalar.xlsx [--kuru] [--mevcutlari-ekle]
+"""
+import argparse
+import os
+import re
+import sys
+from datetime import date, datetime, time
+from numbers import Real
+
+import pandas as pd
+
+import depo
+import motor
+
+ZORUNLU_SUTUNLAR = ["Tarih", "Vardiya", "Makine"]
+SUTUNLAR = ["Tarih", "Vardiya", "Zaman", *motor.GIRIS_SUTUNLARI]
+SAYI_SUTUNLARI = ["Üretim", "Hurda", "Hedef"]
+VARDIYALAR = ["Gündüz", "Gece"]
+TARIH_BICIMLERI = ["%d-%m-%Y", "%d.%m.%Y", "%d/%m/%Y", "%Y-%m-%d"]
+
+# Türkçe karakter kullanılmadan yazılmış başlıklar
+SUTUN_ESLERI = {
+    "is kodu": "İş Kodu",
+    "operator": "Operatör",
+    "baslama saati": "Başlama Saati",
+    "bitis saati": "Bitiş Saati",
+    "uretim": "Üretim",
+    "aciklama": "Açıklama",
+}
+VARDIYA_ESLERI = {"gündüz": "Gündüz", "gunduz": "Gündüz", "gece": "Gece"}
+
+_SAAT = re.compile(r"^(\d{1,2})[:.](\d{2})(?::\d{2})?$")
+_MAKINE = re.compile(r"^T0*(\d+)$")
+
+
+def _anahtar(metin):
+    # "İ".casefold() "i" + birleşik nokta verir; I/ı ayrımı da yok sayılır ("KILIÇ" = "Kılıç")
+    return str(metin).strip().casefold().replace("\u0307", "").replace("ı", "i")
+
+
+_BASLIKLAR = {_anahtar(s): s for s in SUTUNLAR}
+_BASLIKLAR.update({_anahtar(k): v for k, v in SUTUN_ESLERI.items()})
+
+
+def oku(kaynak, ad=None):
+    """Dosyayı (yol ya da yüklenen dosya nesnesi) tek bir ham tabloya okur.
+
+    Biçim `ad`ın (verilmezse yolun) uzantısından anlaşılır. Excel'de tüm sayfalar
+    okunur. Tabloya satırın kaynağını gösteren "Satır" sütunu eklenir.
+    """
+    ad = ad or str(kaynak)
+    uzanti = os.path.splitext(ad)[1].lower()
+    if uzanti in (".xlsx", ".xlsm", ".xls"):
+        sayfalar = pd.read_excel(kaynak, sheet_name=None, dtype=object)
+        parcalar = []
+        for sayfa, df in sayfalar.items():
+            df = df.assign(Satır=[f"{sayfa}:{i + 2}" for i in range(len(df))])
+            parcalar.append(df)
+        df = pd.concat(parcalar, ignore_index=True) if parcalar else pd.DataFrame()
+    elif uzanti == ".parquet":
+        df = pd.read_parquet(kaynak)
+        df = df.astype(object).assign(Satır=[str(i + 2) for i in range(len(df))])
+    elif uzanti in (".csv", ".txt"):
+        # Ayraç (virgül / noktalı virgül) otomatik; "001" gibi kodlar metin kalsın
+        df = pd.read_csv(kaynak, sep=None, engine="python", dtype=str, keep_default_na=False,
+                         encoding="utf-8-sig")
+        df = df.assign(Satır=[str(i + 2) for i in range(len(df))])
+    else:
+        raise ValueError(f"Desteklenmeyen dosya türü: {uzanti or ad}")
+    return df.rename(columns=lambda s: _BASLIKLAR.get(_anahtar(s), s))
+
+
+def _bos(v):
+    return v is None or (isinstance(v, float) and v != v) or v is pd.NaT or (isinstance(v, str) and not v.strip())
+
+
+def _metin(v):
+    if _bos(v):
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        v = int(v)
+    return str(v).strip()
+
+
+def _tarih(v):
+    if isinstance(v, (datetime, date)):
+        return v.strftime("%d-%m-%Y")
+    metin = _metin(v)
+    for bicim in TARIH_BICIMLERI:
+        try:
+            return datetime.strptime(metin.split(" ")[0], bicim).strftime("%d-%m-%Y")
+        except ValueError:
+            continue
+    return None
+
+
+def _saat(v):
+    # Excel hücreleri time/datetime, gün kesri (0.5 = 12:00) ya da tam saat (8 = 08:00)
+    # olarak gelebilir; bunların dışındaki her değer satır hatasıdır
+    if _bos(v):
+        return ""
+    if isinstance(v, (datetime, time)):
+        return v.strftime("%H:%M")
+    if isinstance(v, Real) and not isinstance(v, bool):
+        if float(v).is_integer():
+            return f"{int(v):02}:00" if 0 <= v <= 23 else None
+        dakika = round(float(v) * 86400) // 60
+        return f"{dakika // 60:02}:{dakika % 60:02}" if 0 < v < 1 and dakika < 1440 else None
+    if not isinstance(v, str):
+        return None
+    eslesme = _SAAT.match(v.strip())
+    if not eslesme or int(eslesme[1]) > 23 or int(eslesme[2]) > 59:
+        return None
+    return f"{int(eslesme[1]):02}:{eslesme[2]}"
+
+
+def _sayi(v):
+    if _bos(v):
+        return 0
+    try:
+        sayi = float(str(v).replace(",", ".")) if isinstance(v, str) else float(v)
+    except (TypeError, ValueError):
+        return None
+    if not sayi.is_integer() or sayi < 0:
+        return None
+    return int(sayi)
+
+
+def _makine(v):
+    eslesme = _MAKINE.match(_metin(v).upper())
+    return f"T{int(eslesme[1]):02}" if eslesme else None
+
+
+def _is_kodu(v):
+    metin = _metin(v)
+    return f"{int(metin):03}" if metin.isdigit() else metin
+
+
+def mevcut_vardiyalar(tarihler, dosya=depo.RAPOR_DOSYA):
+    """Depoda zaten kayıtlı (tarih, vardiya) çiftleri; yalnızca verilen tarihlerin kayıtları okunur."""
+    gunler = depo.gunler(dosya)
+    idler = [i for t in set(tarihler) for i in gunler.get(t, [])]
+    return {(r.get("tarih"), r.get("vardiya")) for r in depo.getir(idler, dosya)}
+
+
+def dogrula(df, mevcutlari_atla=True, dosya=depo.RAPOR_DOSYA):
+    """Ham tabloyu doğrulayıp vardiya raporlarına çevirir.
+
+    {"raporlar", "hatalar", "atlanan", "satir"} döner. `hatalar` (Satır, Sütun,
+    Hata) tablosudur. `mevcutlari_atla` doğruysa depoda aynı tarih ve vardiyası
+    olan vardiyalar eklenmez, `atlanan` listesine yazılır.
+    """
+    hatalar = []
+    eksik = [s for s in ZORUNLU_SUTUNLAR if s not in df.columns]
+    if eksik:
+        hatalar.append({"Satır": "-", "Sütun": ", ".join(eksik), "Hata": "Zorunlu sütun yok"})
+        return {"raporlar": [], "hatalar": pd.DataFrame(hatalar), "atlanan": [], "satir": len(df)}
+
+    # Liste değerleri büyük/küçük harf duyarsız eşlenir; kayda listedeki yazım girer
+    listeler = {
+        sutun: {_anahtar(oge): oge for oge in motor.ana_veri_oku(ad, varsayilan)}
+        for sutun, ad, varsayilan in (
+            ("Operatör", motor.OPERATOR_DOSYA, motor.VARSAYILAN_OPERATORLER),
+            ("İş Kodu", motor.ISKOD_DOSYA, motor.VARSAYILAN_ISKODLARI),
+            ("Kod", motor.HATAKOD_DOSYA, motor.VARSAYILAN_HATAKODLARI),
+        )
+    }
+
+    gruplar = {}
+    for kayit in df.to_dict("records"):
+        satir_no = kayit.get("Satır", "")
+
+        def hata(sutun, mesaj):
+            hatalar.append({"Satır": satir_no, "Sütun": sutun, "Hata": mesaj})
+
+        tarih = _tarih(kayit.get("Tarih"))
+        if tarih is None:
+            hata("Tarih", f"Tarih okunamadı: {_metin(kayit.get('Tarih'))!r}")
+        vardiya = _metin(kayit.get("Vardiya"))
+        vardiya = VARDIYA_ESLERI.get(_anahtar(vardiya), vardiya)
+        if vardiya not in VARDIYALAR:
+            hata("Vardiya", f"Vardiya Gündüz ya da Gece olmalı: {vardiya!r}")
+        makine = _makine(kayit.get("Makine"))
+        if makine not in motor.MAKINELER:
+            hata("Makine", f"Bilinmeyen makine: {_metin(kayit.get('Makine'))!r}")
+
+        satir = {
+            "Makine": makine,
+            "İş Kodu": _is_kodu(kayit.get("İş Kodu")),
+            "Operatör": _metin(kayit.get("Operatör")),
+            "Kod": _metin(kayit.get("Kod")),
+            "Açıklama": _metin(kayit.get("Açıklama")),
+        }
+        for sutun, liste in listeler.items():
+            if not satir[sutun]:
+                continue
+            if _anahtar(satir[sutun]) in liste:
+                satir[sutun] = liste[_anahtar(satir[sutun])]
+            else:
+                hata(sutun, f"Listede yok: {satir[sutun]!r}")
+        for sutun in ("Başlama Saati", "Bitiş Saati"):
+            satir[sutun] = _saat(kayit.get(sutun))
+            if satir[sutun] is None:
+                hata(sutun, f"Saat HH:MM olmalı: {_metin(kayit.get(sutun))!r}")
+        for sutun in SAYI_SUTUNLARI:
+            satir[sutun] = _sayi(kayit.get(sutun))
+            if satir[sutun] is None:
+                hata(sutun, f"Negatif olmayan tam sayı olmalı: {_metin(kayit.get(sutun))!r}")
+
+        grup = gruplar.setdefault((tarih, vardiya), {"zaman": _metin(kayit.get("Zaman")), "satirlar": []})
+        grup["satirlar"].append({s: satir[s] for s in motor.GIRIS_SUTUNLARI})
+
+    hatalar = pd.DataFrame(hatalar, columns=["Satır", "Sütun", "Hata"])
+    if not hatalar.empty:
+        return {"raporlar": [], "hatalar": hatalar, "atlanan": [], "satir": len(df)}
+
+    mevcut = mevcut_vardiyalar([t for t, _ in gruplar], dosya) if mevcutlari_atla else set()
+    zaman = datetime.now().strftime("%d-%m-%Y %H:%M")
+    raporlar, atlanan = [], []
+    for (tarih, vardiya), grup in gruplar.items():
+        if (tarih, vardiya) in mevcut:
+            atlanan.append((tarih, vardiya))
+            continue
+        rapor = motor.vardiya_raporu(tarih, vardiya, grup["satirlar"], grup["zaman"] or zaman)
+        if rapor is not None:
+            raporlar.append(rapor)
+    return {"raporlar": raporlar, "hatalar": hatalar, "atlanan": atlanan, "satir": len(df)}
+
+
+def ice_aktar(kaynak, ad=None, mevcutlari_atla=True, kuru=False, dosya=depo.RAPOR_DOSYA):
+    """Dosyayı okuyup doğrular; hata yoksa (ve `kuru` değilse) vardiyaları tek yazmayla ekler.
+
+    `dogrula` sonucuna eklenen vardiya sayısını ("eklenen") ekleyip döndürür.
+    """
+    sonuc = dogrula(oku(kaynak, ad), mevcutlari_atla, dosya)
+    sonuc["eklenen"] = 0
+    if sonuc["hatalar"].empty and sonuc["raporlar"] and not kuru:
+        sonuc["eklenen"] = len(motor.vardiyalar_ekle(sonuc["raporlar"], dosya))
+    return sonuc
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Vardiya tablolarını toplu içe aktar")
+    ap.add_argument("kaynak", help="CSV, Excel ya da Parquet dosyası")
+    ap.add_argument("--kuru", action="store_true", help="yalnızca doğrula, yazma")
+    ap.add_argument("--mevcutlari-ekle", action="store_true",
+                    help="depoda aynı tarih ve vardiyası olan vardiyaları da ekle")
+    args = ap.parse_args(argv)
+
+    try:
+        sonuc = ice_aktar(args.kaynak, mevcutlari_atla=not args.mevcutlari_ekle, kuru=args.kuru)
+    except (OSError, ValueError) as e:
+        ap.error(str(e))
+    if not sonuc["hatalar"].empty:
+        print(sonuc["hatalar"].head(50).to_string(index=False))
+        print(f"{len(sonuc['hatalar'])} hata; hiçbir vardiya eklenmedi.", file=sys.stderr)
+        return 1
+    for tarih, vardiya in sonuc["atlanan"]:
+        print(f"Atlandı (zaten kayıtlı): {tarih} {vardiya}")
+    eylem = "doğrulandı" if args.kuru else "eklendi"
+    sayi = len(sonuc["raporlar"]) if args.kuru else sonuc["eklenen"]
+    print(f"{sonuc['satir']} satırdan {sayi} vardiya {eylem}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Verim (%) hesaplama: 100 × Σ Üretim / Σ Hedef.
+
+Gruplar için önce toplamlar vektörel olarak alınır, sonra tek bir bölme yapılır;
+grup başına Python çağrısı yoktur. Hedef toplamı 0 olan gruplar 0 verim alır.
+Girdi ham olgu tablosu ya da ön-toplamlar (ozet) olabilir; toplamların toplamı
+aynı sonucu verir.
+"""
+import numpy as np
+import pandas as pd
+
+VERIM_SUTUN = "Verim (%)"
+
+
+def verim_orani(uretim, hedef):
+    uretim = np.asarray(uretim, dtype="float64")
+    hedef = np.asarray(hedef, dtype="float64")
+    return np.divide(100 * uretim, hedef, out=np.zeros_like(hedef), where=hedef != 0)
+
+
+def verim(df, boyutlar):
+    """`boyutlar` (tek sütun adı ya da liste; ör. "Makine", ["Operatör", "Vardiya"]) bazında verim.
+
+    Dönen tabloda boyut sütunları, Üretim, Hedef ve "Verim (%)" bulunur; satırlar boyutlara göre sıralıdır.
+    """
+    if isinstance(boyutlar, str):
+        boyutlar = [boyutlar]
+    if df.empty:
+        return pd.DataFrame(columns=[*boyutlar, "Üretim", "Hedef", VERIM_SUTUN])
+    g = df.groupby(boyutlar, observed=True)[["Üretim", "Hedef"]].sum().reset_index()
+    g[VERIM_SUTUN] = verim_orani(g["Üretim"], g["Hedef"])
+    return g
+
+
+HURDA_SUTUN = "Hurda Oranı (%)"
+# Hata kodu girilmeden kaydedilen hurda
+KODSUZ = "(Kodsuz)"
+
+
+def hurda_orani(uretim, hurda):
+    """Hurdanın işlenen parçalara (Üretim + Hurda) oranı, yüzde; toplamı 0 olanlar 0."""
+    uretim = np.asarray(uretim, dtype="float64")
+    hurda = np.asarray(hurda, dtype="float64")
+    islenen = uretim + hurda
+    return np.divide(100 * hurda, islenen, out=np.zeros_like(islenen), where=islenen != 0)